@@ -1,8 +1,13 @@
-import json
 import hashlib
+import os
+import sys
 from pathlib import Path
 from urllib.parse import urlparse
-from ceda_datapoint import DataPointClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import jsonio
+from geocroissant.checksum import default_engine
 
 def get_asset_type(asset):
     """Determine asset type from asset properties or file extension"""
@@ -39,8 +44,14 @@ def get_asset_type(asset):
     # Default fallback
     return 'application/octet-stream'
 
-def stac_to_geocroissant(stac_item, file_hash=None, filename=None):
-    """Convert a CEDA STAC item to valid GeoCroissant format, optionally adding hash and filename"""
+def select_checksum(file_hash, algorithm):
+    """Pick one checksum from a {"md5": ..., "sha256": ...} dict or a single legacy hash string"""
+    if isinstance(file_hash, dict):
+        return file_hash.get(algorithm) or "placeholder_hash"
+    return file_hash or "placeholder_hash"
+
+def stac_to_geocroissant(stac_item, file_hash=None, filename=None, download_url=None):
+    """Convert a CEDA STAC item to valid GeoCroissant format, optionally adding hash, filename and data file URL"""
     if hasattr(stac_item, 'stac_attributes'):
         # Get basic STAC metadata
         stac_attrs = stac_item.stac_attributes
@@ -160,8 +171,8 @@ def stac_to_geocroissant(stac_item, file_hash=None, filename=None):
                 "description": f"{asset_key} asset for {item_id}",
                 "contentUrl": download_url if asset_key.startswith('data') else f"https://api.stac.ceda.ac.uk/collections/cmip6/items/{item_id}",
                 "encodingFormat": "application/netcdf" if asset_key.startswith('data') else "application/json",
-                "md5": file_hash if file_hash and asset_key.startswith('data') else "placeholder_hash",
-                "sha256": file_hash if file_hash and asset_key.startswith('data') else "placeholder_hash"
+                "md5": select_checksum(file_hash, "md5") if asset_key.startswith('data') else "placeholder_hash",
+                "sha256": select_checksum(file_hash, "sha256") if asset_key.startswith('data') else "placeholder_hash"
             }
             for asset_key, asset in assets.items()
         ] + [
@@ -351,68 +362,81 @@ def stac_to_geocroissant(stac_item, file_hash=None, filename=None):
     }
     return croissant_metadata
 
-# === Step 1: Connect to CEDA and search for CMIP6 tas product (SSP585, KIOST) ===
-client = DataPointClient(org="CEDA")
-search = client.search(
-    collections=["cmip6"],
-    query=[
-        "cmip6:experiment_id=ssp585",
-        "cmip6:activity_id=ScenarioMIP",
-        "cmip6:institution_id=KIOST",
-        "cmip6:variable_id=tas",
-    ],
-    max_items=1
-)
-_, stac_item = next(iter(search.items.items()))
+def search_cmip6_item(client=None):
+    """Step 1: search CEDA for the CMIP6 tas product (SSP585, KIOST) and return its STAC item"""
+    if client is None:
+        from ceda_datapoint import DataPointClient  # imported on first use
 
-# === Step 2: Get actual data URLs from CEDA ===
-assets = stac_item.get_assets()
-print("Available assets:")
-for asset_key, asset in assets.items():
-    print(f"  {asset_key}: {type(asset)}")
-    print(f"    Asset ID: {asset.meta.get('asset_id', 'Unknown')}")
+        client = DataPointClient(org="CEDA")
+    search = client.search(
+        collections=["cmip6"],
+        query=[
+            "cmip6:experiment_id=ssp585",
+            "cmip6:activity_id=ScenarioMIP",
+            "cmip6:institution_id=KIOST",
+            "cmip6:variable_id=tas",
+        ],
+        max_items=1
+    )
+    _, stac_item = next(iter(search.items.items()))
+    return stac_item
 
-# Get the actual data file URLs from CEDA
-try:
-    data_files = stac_item.get_data_files()
-    print(f"\nData files found: {len(data_files)}")
-    for i, data_url in enumerate(data_files):
-        print(f"  [{i}]: {data_url}")
-    
-    # Use the first data file URL
-    if data_files:
-        download_url = data_files[0]
-        filename = download_url.split("/")[-1]
-        print(f"\nUsing data file: {filename}")
-        print(f"Download URL: {download_url}")
-    else:
-        raise RuntimeError("No data files found")
-        
-except Exception as e:
-    print(f"Error getting data files: {e}")
-    raise RuntimeError("Could not get data file URLs from CEDA")
+def get_data_file(stac_item):
+    """Step 2: get the actual data file URLs from CEDA and return the first one's URL and file name"""
+    assets = stac_item.get_assets()
+    print("Available assets:")
+    for asset_key, asset in assets.items():
+        print(f"  {asset_key}: {type(asset)}")
+        print(f"    Asset ID: {asset.meta.get('asset_id', 'Unknown')}")
 
-# Skip download and use placeholder hash
-print("Skipping download - using placeholder hash")
-file_hash = "placeholder_hash"
-print(f"Using placeholder hash: {file_hash}")
+    try:
+        data_files = stac_item.get_data_files()
+        print(f"\nData files found: {len(data_files)}")
+        for i, data_url in enumerate(data_files):
+            print(f"  [{i}]: {data_url}")
 
-# === Step 3: (Optional) Open dataset for variable and coordinate names ===
-try:
-    ds = stac_item.open_dataset()
-    data_vars = list(ds.data_vars)
-    coord_vars = list(ds.coords)
-    print("Variables found:", data_vars + coord_vars)
-except Exception as e:
-    print(f"Warning: Could not open dataset for variable extraction: {e}")
-    data_vars, coord_vars = [], []
+        # Use the first data file URL
+        if data_files:
+            download_url = data_files[0]
+            filename = download_url.split("/")[-1]
+            print(f"\nUsing data file: {filename}")
+            print(f"Download URL: {download_url}")
+        else:
+            raise RuntimeError("No data files found")
+
+    except Exception as e:
+        print(f"Error getting data files: {e}")
+        raise RuntimeError("Could not get data file URLs from CEDA")
+    return download_url, filename
+
+def hash_local_copy(filename):
+    """Hash a local copy of the data file if there is one; the download itself is skipped"""
+    if os.path.isfile(filename):
+        file_hash = default_engine().hash_file(filename)
+        print(f"Computed checksums for local copy: md5={file_hash['md5']} sha256={file_hash['sha256']}")
+    else:
+        print("Skipping download - no local copy, using placeholder hash")
+        file_hash = "placeholder_hash"
+        print(f"Using placeholder hash: {file_hash}")
+    return file_hash
 
-# === Step 4: Build and save GeoCroissant JSON-LD ===
-OUTPUT_PATH = "cmip6_tas_geocroissant.json"
-geocroissant_data = stac_to_geocroissant(stac_item, file_hash=file_hash, filename=filename)
+def get_variable_names(stac_item):
+    """Step 3: (optional) open the dataset for variable and coordinate names"""
+    try:
+        ds = stac_item.open_dataset()
+        data_vars = list(ds.data_vars)
+        coord_vars = list(ds.coords)
+        print("Variables found:", data_vars + coord_vars)
+    except Exception as e:
+        print(f"Warning: Could not open dataset for variable extraction: {e}")
+        data_vars, coord_vars = [], []
+    return data_vars, coord_vars
+
+def add_variable_metadata(geocroissant_data, data_vars, coord_vars):
+    """Add the variable/coordinate list to the recordSet if available"""
+    if not (data_vars or coord_vars):
+        return geocroissant_data
 
-# Add variable/coordinate list to recordSet if available
-if data_vars or coord_vars:
     variable_fields = []
     
     # Add data variables with proper metadata
@@ -456,8 +480,22 @@ if data_vars or coord_vars:
         "description": "Variables and coordinates found in NetCDF file",
         "field": variable_fields
     })
+    return geocroissant_data
+
+def main(output_path="cmip6_tas_geocroissant.json"):
+    """Search CEDA, build the GeoCroissant JSON-LD and save it (step 4)"""
+    stac_item = search_cmip6_item()
+    download_url, filename = get_data_file(stac_item)
+    file_hash = hash_local_copy(filename)
+    data_vars, coord_vars = get_variable_names(stac_item)
+
+    geocroissant_data = stac_to_geocroissant(
+        stac_item, file_hash=file_hash, filename=filename, download_url=download_url
+    )
+    add_variable_metadata(geocroissant_data, data_vars, coord_vars)
+    jsonio.dump(geocroissant_data, output_path)
 
-with open(OUTPUT_PATH, "w") as f:
-    json.dump(geocroissant_data, f, indent=2)
+    print(f"\nGeoCroissant metadata written to: {output_path}")
 
-print(f"\nGeoCroissant metadata written to: {OUTPUT_PATH}")
+if __name__ == "__main__":
+    main()
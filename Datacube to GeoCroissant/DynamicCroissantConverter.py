@@ -1,21 +1,18 @@
-import json
-import xarray as xr
-import calendar
-import hashlib
-from datetime import datetime
-from typing import Optional, Dict, Any, Tuple
-
 """
 Dynamic GeoCroissant Converter for NASA POWER Data
 Allows users to specify year and month to generate metadata for specific time periods
 """
 
-import json
-import xarray as xr
+import os
+import sys
 import calendar
 import hashlib
 from typing import Optional, Dict, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import jsonio
+
 
 class DynamicCroissantConverter:
     """Dynamic converter for NASA POWER data to GeoCroissant format"""
@@ -33,6 +30,8 @@ class DynamicCroissantConverter:
         
     def load_dataset(self) -> bool:
         """Load the full dataset from S3"""
+        import xarray as xr  # imported on first use; loading this module does not need it
+
         try:
             print(f"Loading NASA POWER dataset from {self.zarr_url}...")
             self.ds_full = xr.open_zarr(self.zarr_url, storage_options={"anon": True})
@@ -322,8 +321,7 @@ class DynamicCroissantConverter:
             fields.append(var_field)
         
         # Save metadata
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(croissant, f, indent=2, ensure_ascii=False)
+        jsonio.dump(croissant, output_file, ensure_ascii=False)
         
         print(f"GeoCroissant metadata saved to {output_file}")
         print(f"Total fields: {len(fields)}")
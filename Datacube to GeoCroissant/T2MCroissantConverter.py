@@ -1,9 +1,13 @@
-import json
-import xarray as xr
+import os
+import sys
 import calendar
 import hashlib
 from typing import Optional, Dict, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import jsonio
+
 class T2MCroissantConverter:
     """NASA POWER T2M data for the year 2020 to GeoCroissant format"""
 
@@ -22,6 +26,8 @@ class T2MCroissantConverter:
 
     def load_dataset(self) -> bool:
         """Load the full dataset from S3 and subset T2M for 2020"""
+        import xarray as xr  # imported on first use; loading this module does not need it
+
         try:
             print(f"Loading NASA POWER dataset from {self.zarr_url}...")
             self.ds_full = xr.open_zarr(self.zarr_url, storage_options={"anon": True})
@@ -237,8 +243,7 @@ class T2MCroissantConverter:
         fields.append(main_field)
 
         # Save metadata
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(croissant, f, indent=2, ensure_ascii=False)
+        jsonio.dump(croissant, output_file, ensure_ascii=False)
 
         print(f"GeoCroissant metadata saved to {output_file}")
         print(f"Total fields: {len(fields)}")
@@ -263,6 +268,7 @@ class T2MCroissantConverter:
         print("Conversion completed successfully!")
         return metadata
 
-# Example usage in notebook:
-converter = T2MCroissantConverter()
-metadata = converter.convert()
+# Example usage:
+if __name__ == "__main__":
+    converter = T2MCroissantConverter()
+    metadata = converter.convert()
@@ -1,6 +1,26 @@
-import json
+import argparse
+import hashlib
+import os
+import sys
 from datetime import datetime
+import posixpath
 import re
+from collections import Counter
+from contextlib import nullcontext
+from urllib.parse import urlsplit, urlunsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import compression, jsonio
+from geocroissant.checksum import default_engine, fill_checksums
+from geocroissant.extent import ExtentAccumulator, bbox_union, parse_instant, time_range
+from geocroissant.geoparquet import MEDIA_TYPE as GEOPARQUET_MEDIA_TYPE, RecordParquetWriter
+from geocroissant.jsonld_stream import JSONStreamWriter, SpooledArray
+from geocroissant.profiling import profiled, stage
+from geocroissant.reader import StreamingCollection
+
+# FileObjects hashed together when streaming
+CHECKSUM_BATCH_SIZE = 256
 
 def sanitize_name(name):
     return re.sub(r"[^a-zA-Z0-9_\-]", "-", name)
@@ -17,44 +37,14 @@ def ensure_semver(version):
 
 def get_bbox_union(bboxes):
     # Union of all bounding boxes
-    minx = min(b[0] for b in bboxes)
-    miny = min(b[1] for b in bboxes)
-    maxx = max(b[2] for b in bboxes)
-    maxy = max(b[3] for b in bboxes)
-    return [minx, miny, maxx, maxy]
+    return bbox_union(bboxes)
 
 def get_time_range(times):
     # Get min/max ISO8601 times
-    times = [t for t in times if t]
-    if not times:
-        return None, None
-    times = sorted(times)
-    return times[0], times[-1]
-
-def stac_itemcollection_to_geocroissant(stac_dict):
-    features = stac_dict.get("features", [])
-    if not features:
-        raise ValueError("No features found in STAC ItemCollection.")
+    return time_range(times)
 
-    # Aggregate spatial and temporal extents
-    bboxes = []
-    start_times = []
-    end_times = []
-    for feat in features:
-        bbox = feat.get("bbox")
-        if bbox:
-            bboxes.append(bbox)
-        props = feat.get("properties", {})
-        # Try both 'datetime' and 'start_datetime'/'end_datetime'
-        if "start_datetime" in props and "end_datetime" in props:
-            start_times.append(props["start_datetime"])
-            end_times.append(props["end_datetime"])
-        elif "datetime" in props:
-            start_times.append(props["datetime"])
-            end_times.append(props["datetime"])
-
-    # Use the first feature for some metadata
-    first = features[0]
+def build_header(stac_dict, first):
+    # Dataset-level properties that precede the extents in the output document
     dataset_id = stac_dict.get("id", first.get("collection", "UnnamedDataset"))
     name = sanitize_name(stac_dict.get("title", dataset_id))
     version = ensure_semver(stac_dict.get("version", "1.0.0"))
@@ -139,99 +129,201 @@ def stac_itemcollection_to_geocroissant(stac_dict):
     if references:
         croissant["references"] = references
 
+    return croissant
+
+def build_extent_properties(extent):
     # Spatial and temporal extent
-    if bboxes:
-        croissant["geocr:BoundingBox"] = get_bbox_union(bboxes)
-    if start_times and end_times:
-        start, end = get_time_range(start_times + end_times)
-        croissant["geocr:temporalExtent"] = {"startDate": start, "endDate": end}
-        croissant["datePublished"] = start
+    props = {}
+    if extent.bbox is not None:
+        props["geocr:BoundingBox"] = extent.bbox
+    if extent.has_times:
+        props["geocr:temporalExtent"] = {"startDate": extent.start, "endDate": extent.end}
+        props["datePublished"] = extent.start
     else:
-        croissant["datePublished"] = datetime.utcnow().isoformat() + "Z"
-    
+        props["datePublished"] = datetime.utcnow().isoformat() + "Z"
+
     # Add geospatial metadata
-    croissant["geocr:spatialResolution"] = "Unknown"
-    croissant["geocr:coordinateReferenceSystem"] = "EPSG:4326"
+    props["geocr:spatialResolution"] = "Unknown"
+    props["geocr:coordinateReferenceSystem"] = "EPSG:4326"
+    return props
 
-    # Distribution: all assets from all features
-    croissant["distribution"] = []
-    for feat in features:
-        assets = feat.get("assets", {})
-        for key, asset in assets.items():
-            file_object = {
-                "@type": "cr:FileObject",
-                "@id": f"{feat['id']}/{key}",
-                "name": f"{feat['id']}/{key}",
-                "description": asset.get("description", asset.get("title", "")),
-                "contentUrl": asset.get("href"),
-                "encodingFormat": asset.get("type", "application/octet-stream"),
-                "md5": "placeholder_hash"
-            }
-            croissant["distribution"].append(file_object)
-
-    # Create recordSet with proper structure
-    croissant["recordSet"] = [
-        {
-            "@type": "cr:RecordSet",
-            "@id": f"{dataset_id}_items",
-            "name": f"{dataset_id}_items",
-            "description": f"STAC items from {dataset_id} collection",
-            "field": [
-                {
-                    "@type": "cr:Field",
-                    "@id": f"{dataset_id}_items/id",
-                    "name": "id",
-                    "description": "STAC item identifier",
-                    "dataType": "sc:Text"
-                },
-                {
-                    "@type": "cr:Field",
-                    "@id": f"{dataset_id}_items/datetime",
-                    "name": "datetime",
-                    "description": "Item datetime",
-                    "dataType": "sc:DateTime"
-                },
-                {
-                    "@type": "cr:Field",
-                    "@id": f"{dataset_id}_items/bbox",
-                    "name": "bbox",
-                    "description": "Bounding box coordinates",
-                    "dataType": "sc:Text"
-                },
-                {
-                    "@type": "cr:Field",
-                    "@id": f"{dataset_id}_items/assets",
-                    "name": "assets",
-                    "description": "Available assets",
-                    "dataType": "sc:Text"
-                }
-            ],
-            "data": []
+def feature_file_objects(feat):
+    # One FileObject per asset of the feature
+    for key, asset in feat.get("assets", {}).items():
+        yield {
+            "@type": "cr:FileObject",
+            "@id": f"{feat['id']}/{key}",
+            "name": f"{feat['id']}/{key}",
+            "description": asset.get("description", asset.get("title", "")),
+            "contentUrl": asset.get("href"),
+            "encodingFormat": asset.get("type", "application/octet-stream"),
+            "md5": "placeholder_hash"
         }
-    ]
 
-    # Populate recordSet data
-    for feat in features:
-        props = feat.get("properties", {})
-        record_data = {
-            f"{dataset_id}_items/id": feat.get("id"),
-            f"{dataset_id}_items/datetime": props.get("datetime"),
-            f"{dataset_id}_items/bbox": feat.get("bbox"),
-            f"{dataset_id}_items/assets": list(feat.get("assets", {}).keys())
-        }
-        croissant["recordSet"][0]["data"].append(record_data)
+def normalize_href(href):
+    # Canonical form of an asset href for deduplication: surrounding blanks
+    # removed, scheme and host lower-cased, default ports dropped and "." and
+    # ".." path segments resolved
+    href = href.strip()
+    parts = urlsplit(href)
+    if len(parts.scheme) <= 1:  # relative path (or a Windows drive letter)
+        return posixpath.normpath(href.replace("\\", "/"))
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rpartition(":")[2]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rpartition(":")[0]
+    # Unlike normpath, keep empty segments: "a//b" and "a/b" are different keys
+    segments = parts.path.split("/")
+    path = []
+    for i, segment in enumerate(segments):
+        if segment == "..":
+            if len(path) > 1:
+                path.pop()
+        elif segment != ".":
+            path.append(segment)
+            continue
+        if i == len(segments) - 1:
+            path.append("")
+    return urlunsplit((scheme, netloc, "/".join(path), parts.query, parts.fragment))
+
+class AssetDeduplicator:
+    # One FileObject per distinct (normalized) asset href across the items:
+    # the first item referencing an href gets the FileObject, later ones
+    # point their record's assetFiles at it. collapsed counts the asset
+    # references that did not need a FileObject of their own.
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.file_ids = {}
+        self.collapsed = 0
+
+    def add(self, feat):
+        # Return the item's new FileObjects and its {asset key: FileObject @id}
+        file_objects = []
+        asset_files = {}
+        for key, file_object in zip(feat.get("assets", {}), feature_file_objects(feat)):
+            href = file_object["contentUrl"]
+            if self.enabled and href:
+                href = normalize_href(href)
+                file_id = self.file_ids.get(href)
+                if file_id is not None:
+                    asset_files[key] = file_id
+                    self.collapsed += 1
+                    continue
+                self.file_ids[href] = file_object["@id"]
+            asset_files[key] = file_object["@id"]
+            file_objects.append(file_object)
+        return file_objects, asset_files
 
+def report_duplicates(collapsed):
+    if collapsed:
+        print(f"\nCollapsed {collapsed} duplicate asset references into shared FileObjects")
+
+def build_record_set(dataset_id, records_file=None):
+    # RecordSet with proper structure, without its data rows. With records_file
+    # (the @id of a GeoParquet sidecar) every field reads its column from it.
+    record_set = {
+        "@type": "cr:RecordSet",
+        "@id": f"{dataset_id}_items",
+        "name": f"{dataset_id}_items",
+        "description": f"STAC items from {dataset_id} collection",
+        "field": [
+            {
+                "@type": "cr:Field",
+                "@id": f"{dataset_id}_items/id",
+                "name": "id",
+                "description": "STAC item identifier",
+                "dataType": "sc:Text"
+            },
+            {
+                "@type": "cr:Field",
+                "@id": f"{dataset_id}_items/datetime",
+                "name": "datetime",
+                "description": "Item datetime",
+                "dataType": "sc:DateTime"
+            },
+            {
+                "@type": "cr:Field",
+                "@id": f"{dataset_id}_items/bbox",
+                "name": "bbox",
+                "description": "Bounding box coordinates",
+                "dataType": "sc:Text"
+            },
+            {
+                "@type": "cr:Field",
+                "@id": f"{dataset_id}_items/assets",
+                "name": "assets",
+                "description": "Available assets",
+                "dataType": "sc:Text"
+            },
+            {
+                "@type": "cr:Field",
+                "@id": f"{dataset_id}_items/assetFiles",
+                "name": "assetFiles",
+                "description": "@id of the FileObject of each asset, by asset key",
+                "dataType": "sc:Text"
+            }
+        ]
+    }
+    if records_file is not None:
+        record_set["field"].append({
+            "@type": "cr:Field",
+            "@id": f"{dataset_id}_items/geometry",
+            "name": "geometry",
+            "description": "Item footprint as WKB",
+            "dataType": "sc:Text"
+        })
+        for field in record_set["field"]:
+            field["source"] = {
+                "fileObject": {"@id": records_file},
+                "extract": {"column": field["name"]}
+            }
+    return record_set
+
+def records_file_object(dataset_id, records_path, records_url=None):
+    # FileObject of the (written) GeoParquet sidecar holding the recordSet rows
+    file_object = {
+        "@type": "cr:FileObject",
+        "@id": f"{dataset_id}_items.parquet",
+        "name": f"{dataset_id}_items.parquet",
+        "description": f"Rows of the {dataset_id}_items RecordSet (GeoParquet)",
+        "contentUrl": records_url or os.path.basename(records_path),
+        "encodingFormat": GEOPARQUET_MEDIA_TYPE
+    }
+    file_object.update(default_engine().hash_file(records_path))
+    return file_object
+
+def write_records(features, dataset_id, records_path, records_url=None, asset_files=None):
+    # Write the recordSet rows to GeoParquet and return the sidecar's FileObject
+    with stage("write_records"), RecordParquetWriter(records_path) as rows:
+        for i, feat in enumerate(features):
+            rows.append(feat, asset_files[i] if asset_files is not None else None)
+    return records_file_object(dataset_id, records_path, records_url)
+
+def feature_record(feat, dataset_id, asset_files=None):
+    props = feat.get("properties", {})
+    if asset_files is None:
+        asset_files = {key: f"{feat['id']}/{key}" for key in feat.get("assets", {})}
+    return {
+        f"{dataset_id}_items/id": feat.get("id"),
+        f"{dataset_id}_items/datetime": props.get("datetime"),
+        f"{dataset_id}_items/bbox": feat.get("bbox"),
+        f"{dataset_id}_items/assets": list(feat.get("assets", {}).keys()),
+        f"{dataset_id}_items/assetFiles": asset_files
+    }
+
+def build_trailer(stac_dict):
     # Optionally, add stac_extensions, stac_version, etc. at top level
+    trailer = {}
     if "stac_extensions" in stac_dict:
-        croissant["geocr:stac_extensions"] = stac_dict["stac_extensions"]
+        trailer["geocr:stac_extensions"] = stac_dict["stac_extensions"]
     if "stac_version" in stac_dict:
-        croissant["geocr:stac_version"] = stac_dict["stac_version"]
+        trailer["geocr:stac_version"] = stac_dict["stac_version"]
 
-    # Add citeAs if not present (recommended by Croissant)
-    if "citeAs" not in croissant:
-        croissant["citeAs"] = "Citation information not provided."
+    # Add citeAs (recommended by Croissant)
+    trailer["citeAs"] = "Citation information not provided."
+    return trailer
 
-    # Report unmapped fields
+def report_unmapped_fields(stac_dict):
     mapped_keys = {
         "type", "links", "features", "id", "title", "description", "license", "version", "stac_extensions", "stac_version", "numberReturned"
     }
@@ -243,19 +335,517 @@ def stac_itemcollection_to_geocroissant(stac_dict):
     else:
         print("None ")
 
+@profiled()
+def stac_itemcollection_to_geocroissant(stac_dict, base_dir=None, records_path=None, records_url=None,
+                                        dedup_assets=True):
+    features = stac_dict.get("features", [])
+    if not features:
+        raise ValueError("No features found in STAC ItemCollection.")
+
+    # Aggregate spatial and temporal extents
+    extent = ExtentAccumulator()
+    for feat in features:
+        extent.add(feat)
+
+    # Use the first feature for some metadata
+    croissant = build_header(stac_dict, features[0])
+    dataset_id = croissant["@id"]
+    croissant.update(build_extent_properties(extent))
+
+    # Distribution: all assets from all features, one FileObject per href
+    croissant["distribution"] = []
+    dedup = AssetDeduplicator(dedup_assets)
+    asset_files = []
+    for feat in features:
+        file_objects, files = dedup.add(feat)
+        croissant["distribution"].extend(file_objects)
+        asset_files.append(files)
+    fill_checksums(croissant["distribution"], base_dir=base_dir)
+
+    # Populate recordSet data, inline or in a GeoParquet sidecar
+    if records_path:
+        file_object = write_records(features, dataset_id, records_path, records_url, asset_files)
+        croissant["distribution"].append(file_object)
+        record_set = build_record_set(dataset_id, file_object["@id"])
+    else:
+        record_set = build_record_set(dataset_id)
+        record_set["data"] = [feature_record(feat, dataset_id, files) for feat, files in zip(features, asset_files)]
+    croissant["recordSet"] = [record_set]
+
+    croissant.update(build_trailer(stac_dict))
+
+    # Report unmapped fields
+    report_unmapped_fields(stac_dict)
+    report_duplicates(dedup.collapsed)
+
     return croissant
 
+def write_spooled_document(fp, header, extent, distribution, data, trailer, dataset_id, records_file=None):
+    # Write a document whose FileObjects and data rows were spooled to disk
+    # (depths: top-level object -> distribution list, and
+    # top-level object -> recordSet list -> RecordSet -> data list)
+    with stage("write_document"):
+        writer = JSONStreamWriter(fp)
+        writer.begin_object()
+        writer.write_members(header)
+        writer.write_members(build_extent_properties(extent))
+        writer.write_spooled("distribution", distribution)
+        writer.begin_array("recordSet")
+        writer.begin_object()
+        writer.write_members(build_record_set(dataset_id, records_file))
+        if records_file is None:
+            writer.write_spooled("data", data)
+        writer.end()
+        writer.end()
+        writer.write_members(trailer)
+        writer.close()
+
+@profiled()
+def write_stac_itemcollection_geocroissant(stac_dict, fp, features=None, base_dir=None,
+                                          records_path=None, records_url=None, dedup_assets=True):
+    # Streaming variant of stac_itemcollection_to_geocroissant: features are
+    # consumed once, FileObjects and data rows are spooled to temporary files
+    # while the extents are aggregated, and the document is written to fp with
+    # the same bytes as jsonio.dump(stac_itemcollection_to_geocroissant(...), fp).
+    # stac_dict may still be filling up while features are consumed (see
+    # geocroissant.reader.StreamingCollection), so the header is built last.
+    # With records_path the rows go to a GeoParquet sidecar instead of "data".
+    if features is None:
+        features = stac_dict.get("features", [])
+    features = iter(features)
+    first = next(features, None)
+    if first is None:
+        raise ValueError("No features found in STAC ItemCollection.")
+
+    dataset_id = stac_dict.get("id", first.get("collection", "UnnamedDataset"))
+    extent = ExtentAccumulator()
+    dedup = AssetDeduplicator(dedup_assets)
+
+    # Depths: top-level object -> distribution list, and
+    # top-level object -> recordSet list -> RecordSet -> data list
+    rows = RecordParquetWriter(records_path) if records_path else None
+    with SpooledArray(depth=2) as distribution, SpooledArray(depth=4) as data, rows or nullcontext():
+        with stage("spool_features"):
+            pending = []
+            feat = first
+            while feat is not None:
+                extent.add(feat)
+                file_objects, asset_files = dedup.add(feat)
+                pending.extend(file_objects)
+                if rows is None:
+                    data.append(feature_record(feat, dataset_id, asset_files))
+                else:
+                    rows.append(feat, asset_files)
+                if len(pending) >= CHECKSUM_BATCH_SIZE:
+                    fill_checksums(pending, base_dir=base_dir)
+                    distribution.extend(pending)
+                    pending = []
+                feat = next(features, None)
+            fill_checksums(pending, base_dir=base_dir)
+            distribution.extend(pending)
+
+        records_file = None
+        if rows is not None:
+            rows.close()
+            file_object = records_file_object(dataset_id, records_path, records_url)
+            distribution.append(file_object)
+            records_file = file_object["@id"]
+
+        header = build_header(stac_dict, first)
+        if header["@id"] != dataset_id:
+            raise ValueError(
+                "The ItemCollection declares its 'id' after 'features'; "
+                "convert it with stac_itemcollection_to_geocroissant instead."
+            )
+
+        write_spooled_document(fp, header, extent, distribution, data, build_trailer(stac_dict), dataset_id, records_file)
+
+    # Report unmapped fields
+    report_unmapped_fields(stac_dict)
+    report_duplicates(dedup.collapsed)
+
+    return {"items": rows.count if rows is not None else data.count, "fileObjects": distribution.count,
+            "duplicateAssets": dedup.collapsed}
+
+def shard_key_month(feat):
+    # "YYYY-MM" (UTC) of the item's start, or "undated"
+    props = feat.get("properties", {})
+    instant = parse_instant(props.get("start_datetime") or props.get("datetime") or "")
+    return f"{instant:%Y-%m}" if instant is not None else "undated"
+
+class ItemShard:
+    # FileObjects and data rows of one shard document, spooled until it is
+    # written. Shards keep the dataset's RecordSet and field ids, so their
+    # rows line up; only the document @id and name are the shard's own.
+    def __init__(self, key, dataset_id, first, dedup_assets=True):
+        self.key = key
+        self.dataset_id = dataset_id
+        self.shard_id = f"{dataset_id}_{key}"
+        self.first = first
+        self.extent = ExtentAccumulator()
+        self.distribution = SpooledArray(depth=2)
+        self.data = SpooledArray(depth=4)
+        self.pending = []
+        # Shard documents stand alone, so FileObjects are only shared within one
+        self.dedup = AssetDeduplicator(dedup_assets)
+
+    def add(self, feat, base_dir=None):
+        self.extent.add(feat)
+        file_objects, asset_files = self.dedup.add(feat)
+        self.pending.extend(file_objects)
+        self.data.append(feature_record(feat, self.dataset_id, asset_files))
+        if len(self.pending) >= CHECKSUM_BATCH_SIZE:
+            self.flush(base_dir)
+
+    def flush(self, base_dir=None):
+        fill_checksums(self.pending, base_dir=base_dir)
+        self.distribution.extend(self.pending)
+        self.pending = []
+
+    def write(self, path, stac_dict, dataset_id, base_dir=None):
+        # Write the shard document and return its FileObject and index entry
+        self.flush(base_dir)
+        shard_dict = {**stac_dict, "id": self.shard_id}
+        if "title" in stac_dict:
+            shard_dict["title"] = f"{stac_dict['title']} {self.key}"
+        # The index holds the shard's item count; the collection total does not apply
+        shard_dict.pop("numberReturned", None)
+        header = build_header(shard_dict, self.first)
+        header["isPartOf"] = {"@id": dataset_id}
+        with compression.open_file(path, "w") as f:
+            write_spooled_document(f, header, self.extent, self.distribution, self.data, build_trailer(stac_dict),
+                                   dataset_id)
+        self.close()
+
+        file_object = {
+            "@type": "cr:FileObject",
+            "@id": f"{dataset_id}/shards/{self.key}",
+            "name": os.path.basename(path),
+            "description": f"Items of {dataset_id} in shard {self.key}",
+            "contentUrl": os.path.basename(path),
+            "encodingFormat": "application/ld+json"
+        }
+        file_object.update(default_engine().hash_file(path))
+        entry = {
+            "key": self.key,
+            "fileObject": {"@id": file_object["@id"]},
+            "contentUrl": file_object["contentUrl"],
+            "items": self.data.count,
+            "fileObjects": self.distribution.count
+        }
+        if self.extent.bbox is not None:
+            entry["geocr:BoundingBox"] = self.extent.bbox
+        if self.extent.has_times:
+            entry["geocr:temporalExtent"] = {"startDate": self.extent.start, "endDate": self.extent.end}
+        return file_object, entry
+
+    def close(self):
+        self.distribution.close()
+        self.data.close()
+
+@profiled()
+def write_stac_itemcollection_shards(stac_dict, output_path, features=None, base_dir=None, shard_by="month",
+                                     dedup_assets=True):
+    # Sharded variant of write_stac_itemcollection_geocroissant. Items are
+    # split into shard documents, per calendar month of their start time
+    # (shard_by="month") or per shard_by consecutive items, written next to
+    # output_path as "{stem}-{key}{ext}" (ext keeps a .gz/.zst suffix). output_path itself gets a root
+    # document with the aggregated extents, the shards as FileObjects and a
+    # "geocr:shards" index holding each shard's bbox, time range and counts,
+    # so readers can open only the shards that intersect their query.
+    # Monthly shards stay open (two temporary files each) until the input
+    # ends; item-count shards are written as soon as they are full.
+    if features is None:
+        features = stac_dict.get("features", [])
+    features = iter(features)
+    first = next(features, None)
+    if first is None:
+        raise ValueError("No features found in STAC ItemCollection.")
+    if shard_by != "month" and not (isinstance(shard_by, int) and shard_by > 0):
+        raise ValueError(f"shard_by must be 'month' or a positive item count, not {shard_by!r}")
+
+    dataset_id = stac_dict.get("id", first.get("collection", "UnnamedDataset"))
+    stem, ext = compression.splitext(output_path)
+    extent = ExtentAccumulator()
+    shards = {}
+    written = []
+    collapsed = 0
+
+    def write_shard(shard):
+        nonlocal collapsed
+        collapsed += shard.dedup.collapsed
+        written.append(shard.write(f"{stem}-{shard.key}{ext or '.json'}", stac_dict, dataset_id, base_dir))
+
+    try:
+        with stage("write_shards"):
+            feat = first
+            index = 0
+            while feat is not None:
+                extent.add(feat)
+                key = shard_key_month(feat) if shard_by == "month" else f"{index // shard_by:05d}"
+                shard = shards.get(key)
+                if shard is None:
+                    shard = shards[key] = ItemShard(key, dataset_id, feat, dedup_assets)
+                shard.add(feat, base_dir)
+                index += 1
+                if shard_by != "month" and shard.data.count == shard_by:
+                    write_shard(shards.pop(key))
+                feat = next(features, None)
+            for key in sorted(shards):
+                write_shard(shards.pop(key))
+    finally:
+        for shard in shards.values():
+            shard.close()
+
+    header = build_header(stac_dict, first)
+    if header["@id"] != dataset_id:
+        raise ValueError(
+            "The ItemCollection declares its 'id' after 'features'; "
+            "convert it with stac_itemcollection_to_geocroissant instead."
+        )
+    written.sort(key=lambda shard: shard[1]["key"])
+    root = dict(header)
+    root.update(build_extent_properties(extent))
+    root["distribution"] = [file_object for file_object, _ in written]
+    root["geocr:shards"] = [entry for _, entry in written]
+    root.update(build_trailer(stac_dict))
+    jsonio.dump(root, output_path)
+
+    report_unmapped_fields(stac_dict)
+    report_duplicates(collapsed)
+
+    return {"items": index, "shards": len(written), "duplicateAssets": collapsed}
+
+class LiveDatasetUpdater:
+    # Idempotent upserts of STAC items into an existing GeoCroissant document.
+    # Records are keyed by item id and FileObjects by their @id
+    # ("{item id}/{asset key}"); the lookup tables are built on the first
+    # upsert, so every later batch costs time proportional to its size. The
+    # extents only ever grow: an item moved or shortened by an update leaves
+    # the previous extent in place, which still covers every item.
+    # FileObjects may be shared by several records (see AssetDeduplicator):
+    # they are reference-counted through the records' assetFiles and only
+    # removed once no record points at them, and an asset whose href already
+    # has a FileObject reuses it.
+    def __init__(self, croissant, dedup_assets=True):
+        self.croissant = croissant
+        self.dataset_id = croissant["@id"]
+        self.dedup_assets = dedup_assets
+        record_sets = croissant.get("recordSet") or [build_record_set(self.dataset_id)]
+        croissant["recordSet"] = record_sets
+        self.record_set = record_sets[0]
+        if "data" not in self.record_set and any("source" in f for f in self.record_set.get("field", [])):
+            raise ValueError(
+                "The records of this document are in a GeoParquet sidecar; "
+                "convert the full collection again instead of updating it."
+            )
+        self.data = self.record_set.setdefault("data", [])
+        self.distribution = croissant.setdefault("distribution", [])
+        self._records = None
+        self._file_objects = None
+        self._references = None
+        self._hrefs = None
+        self._id_key = f"{self.dataset_id}_items/id"
+        self._assets_key = f"{self.dataset_id}_items/assets"
+        self._asset_files_key = f"{self.dataset_id}_items/assetFiles"
+
+    def _asset_files(self, row):
+        # {asset key: FileObject @id} of a record, also for records written before assetFiles
+        asset_files = row.get(self._asset_files_key)
+        if asset_files is None:
+            asset_files = {key: f"{row.get(self._id_key)}/{key}" for key in row.get(self._assets_key) or []}
+        return asset_files
+
+    def _build_indexes(self):
+        self._records = {row.get(self._id_key): i for i, row in enumerate(self.data)}
+        self._file_objects = {fo.get("@id"): i for i, fo in enumerate(self.distribution)}
+        self._references = Counter(
+            file_id for row in self.data for file_id in self._asset_files(row).values()
+        )
+        self._hrefs = {}
+        if self.dedup_assets:
+            for fo in self.distribution:
+                if fo.get("@type") == "cr:FileObject" and fo.get("contentUrl"):
+                    self._hrefs.setdefault(normalize_href(fo["contentUrl"]), fo.get("@id"))
+
+    def _forget_href(self, file_object):
+        href = file_object.get("contentUrl")
+        if href and self._hrefs.get(normalize_href(href)) == file_object.get("@id"):
+            del self._hrefs[normalize_href(href)]
+
+    def _remove_file_object(self, file_object_id):
+        # Swap with the last FileObject so removal does not shift the list
+        i = self._file_objects.pop(file_object_id)
+        self._forget_href(self.distribution[i])
+        last = self.distribution.pop()
+        if i < len(self.distribution):
+            self.distribution[i] = last
+            self._file_objects[last.get("@id")] = i
+
+    def _link_assets(self, feat, new_file_objects):
+        # Point each asset at the FileObject of its href, queueing the ones to write
+        asset_files = {}
+        collapsed = 0
+        for key, file_object in zip(feat.get("assets", {}), feature_file_objects(feat)):
+            href = normalize_href(file_object["contentUrl"]) if file_object["contentUrl"] else None
+            file_id = self._hrefs.get(href) if href and self.dedup_assets else None
+            if file_id is not None and file_id != file_object["@id"]:
+                collapsed += 1
+            else:
+                i = self._file_objects.get(file_object["@id"])
+                if (i is not None and self._references[file_object["@id"]] > 0
+                        and self.distribution[i].get("contentUrl") != file_object["contentUrl"]):
+                    # Other records still share the file this @id names; keep it
+                    suffix = hashlib.sha256(file_object["contentUrl"].encode()).hexdigest()[:8]
+                    file_object["@id"] = file_object["name"] = f"{file_object['@id']}@{suffix}"
+                file_id = file_object["@id"]
+                new_file_objects.append(file_object)
+                if href and self.dedup_assets:
+                    self._hrefs[href] = file_id
+            asset_files[key] = file_id
+            self._references[file_id] += 1
+        return asset_files, collapsed
+
+    def upsert(self, features, base_dir=None):
+        if self._records is None:
+            self._build_indexes()
+        features = list(features)
+        counts = {"added": 0, "updated": 0, "fileObjects": 0, "duplicateAssets": 0}
+
+        with stage("upsert_records", items=len(features)):
+            new_file_objects = []
+            for feat in features:
+                i = self._records.get(feat.get("id"))
+                previous = self._asset_files(self.data[i]).values() if i is not None else ()
+                for file_id in previous:
+                    self._references[file_id] -= 1
+                asset_files, collapsed = self._link_assets(feat, new_file_objects)
+                counts["duplicateAssets"] += collapsed
+                record = feature_record(feat, self.dataset_id, asset_files)
+                if i is None:
+                    self._records[feat.get("id")] = len(self.data)
+                    self.data.append(record)
+                    counts["added"] += 1
+                else:
+                    # FileObjects no record points at any more are dropped
+                    for file_id in set(previous):
+                        if self._references[file_id] <= 0 and file_id in self._file_objects:
+                            del self._references[file_id]
+                            self._remove_file_object(file_id)
+                    self.data[i] = record
+                    counts["updated"] += 1
+
+            for file_object in new_file_objects:
+                i = self._file_objects.get(file_object["@id"])
+                previous = self.distribution[i] if i is not None else None
+                if previous is not None and previous.get("contentUrl") == file_object["contentUrl"]:
+                    # Same file: keep the checksums already computed for it
+                    for algorithm in ("md5", "sha256"):
+                        if algorithm in previous:
+                            file_object[algorithm] = previous[algorithm]
+            fill_checksums(new_file_objects, base_dir=base_dir)
+            for file_object in new_file_objects:
+                i = self._file_objects.get(file_object["@id"])
+                if i is None:
+                    self._file_objects[file_object["@id"]] = len(self.distribution)
+                    self.distribution.append(file_object)
+                else:
+                    if self.distribution[i].get("contentUrl") != file_object["contentUrl"]:
+                        self._forget_href(self.distribution[i])
+                    self.distribution[i] = file_object
+            counts["fileObjects"] = len(new_file_objects)
+
+        self._update_extents(features)
+        self.croissant["isLiveDataset"] = True
+        self.croissant["dateModified"] = datetime.utcnow().isoformat() + "Z"
+        if "numberReturned" in self.croissant:
+            self.croissant["numberReturned"] = len(self.data)
+        return counts
+
+    def _update_extents(self, features):
+        extent = ExtentAccumulator()
+        if self.croissant.get("geocr:BoundingBox"):
+            extent.add_bbox(self.croissant["geocr:BoundingBox"])
+        temporal = self.croissant.get("geocr:temporalExtent")
+        if temporal:
+            extent.has_times = True
+            extent.add_times([temporal.get("startDate"), temporal.get("endDate")])
+        for feat in features:
+            extent.add(feat)
+        if extent.bbox is not None:
+            self.croissant["geocr:BoundingBox"] = extent.bbox
+        if extent.has_times:
+            self.croissant["geocr:temporalExtent"] = {"startDate": extent.start, "endDate": extent.end}
+            self.croissant["datePublished"] = extent.start
+
+@profiled()
+def update_geocroissant_file(path, features, base_dir=None, dedup_assets=True):
+    # Upsert STAC items into the GeoCroissant document at path, replacing it atomically
+    croissant = jsonio.load(path)
+    counts = LiveDatasetUpdater(croissant, dedup_assets).upsert(features, base_dir=base_dir)
+    # The temporary file keeps the suffix so it is compressed like the original
+    stem, ext = compression.splitext(path)
+    tmp_path = f"{stem}.tmp{ext}"
+    jsonio.dump(croissant, tmp_path)
+    os.replace(tmp_path, path)
+    return counts
+
 # === Main Runner ===
 if __name__ == "__main__":
-    # Load STAC ItemCollection JSON
-    with open("stac.json") as f:
-        stac_data = json.load(f)
+    parser = argparse.ArgumentParser(description="Convert a STAC ItemCollection to GeoCroissant JSON-LD.")
+    parser.add_argument("input", nargs="?", default="stac.json", help="Path to input STAC ItemCollection JSON")
+    parser.add_argument("output", nargs="?", default="croissant.json", help="Path to output GeoCroissant JSON-LD")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse features one at a time with ijson instead of loading the whole file")
+    parser.add_argument("--update", action="store_true",
+                        help="Upsert the input's items into the existing output document instead of replacing it")
+    parser.add_argument("--shard-by", default=None, metavar="month|N",
+                        help="Split the output into per-month or per-N-items shard documents plus a root index")
+    parser.add_argument("--no-dedup-assets", dest="dedup_assets", action="store_false",
+                        help="Give every (item, asset) pair its own FileObject, even when items share an href")
+    parser.add_argument("--records-parquet", metavar="PATH", default=None,
+                        help="Write the recordSet rows to this GeoParquet file instead of inline JSON")
+    args = parser.parse_args()
+    records_url = None
+    if args.records_parquet:
+        # Reference the sidecar relative to the output document
+        records_url = os.path.relpath(args.records_parquet, os.path.dirname(os.path.abspath(args.output)))
+    # Relative asset hrefs are hashed against the input's directory, wherever this runs from
+    base_dir = os.path.dirname(os.path.abspath(args.input))
+
+    if args.update and os.path.exists(args.output):
+        features = StreamingCollection(args.input) if args.stream else jsonio.load(args.input).get("features", [])
+        counts = update_geocroissant_file(args.output, features, base_dir=base_dir, dedup_assets=args.dedup_assets)
+        print(f"\nGeoCroissant update complete: {counts['added']} added, {counts['updated']} updated "
+              f"in '{args.output}'")
+        sys.exit(0)
 
-    # Convert to GeoCroissant
-    croissant_json = stac_itemcollection_to_geocroissant(stac_data)
+    if args.shard_by:
+        shard_by = args.shard_by if args.shard_by == "month" else int(args.shard_by)
+        if args.stream:
+            collection = StreamingCollection(args.input)
+            result = write_stac_itemcollection_shards(collection.metadata, args.output, features=collection,
+                                                      base_dir=base_dir, shard_by=shard_by,
+                                                      dedup_assets=args.dedup_assets)
+        else:
+            result = write_stac_itemcollection_shards(jsonio.load(args.input), args.output, base_dir=base_dir,
+                                                      shard_by=shard_by, dedup_assets=args.dedup_assets)
+        print(f"\nGeoCroissant conversion complete: {result['items']} items in {result['shards']} shards "
+              f"indexed by '{args.output}'")
+        sys.exit(0)
 
-    # Save GeoCroissant JSON-LD
-    with open("croissant.json", "w") as f:
-        json.dump(croissant_json, f, indent=2)
+    # Convert to GeoCroissant, streaming the JSON-LD to disk
+    with compression.open_file(args.output, "w") as f:
+        if args.stream:
+            collection = StreamingCollection(args.input)
+            write_stac_itemcollection_geocroissant(collection.metadata, f, features=collection, base_dir=base_dir,
+                                                   records_path=args.records_parquet, records_url=records_url,
+                                                   dedup_assets=args.dedup_assets)
+        else:
+            # Load STAC ItemCollection JSON
+            stac_data = jsonio.load(args.input)
+            write_stac_itemcollection_geocroissant(stac_data, f, base_dir=base_dir,
+                                                   records_path=args.records_parquet, records_url=records_url,
+                                                   dedup_assets=args.dedup_assets)
 
-    print("\nGeoCroissant conversion complete. Output saved to 'croissant.json'")
+    print(f"\nGeoCroissant conversion complete. Output saved to '{args.output}'")
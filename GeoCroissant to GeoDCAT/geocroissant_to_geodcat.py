@@ -1,11 +1,22 @@
-import json
-from rdflib import Graph, Namespace, URIRef, Literal, BNode
-from rdflib.namespace import DCTERMS, DCAT, FOAF, XSD, RDF, SKOS
+import os
+import sys
 from datetime import datetime
 from urllib.parse import quote
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant.compression import open_file
+from geocroissant.profiling import profiled, stage
+from geocroissant.reader import load_json
+
+
+@profiled()
+def croissant_to_geodcat_jsonld(croissant_json, output_file="geodcat.jsonld", gitattributes_file=".gitattributes",
+                                turtle_file="geodcat.ttl"):
+    # rdflib is imported on first use so that loading this module stays cheap
+    from rdflib import Graph, Namespace, URIRef, Literal, BNode
+    from rdflib.namespace import DCTERMS, DCAT, FOAF, XSD, RDF, SKOS
 
-def croissant_to_geodcat_jsonld(croissant_json, output_file="geodcat.jsonld", gitattributes_file=".gitattributes"):
     g = Graph()
     
     # Load real file URLs from .gitattributes
@@ -435,15 +446,17 @@ def croissant_to_geodcat_jsonld(croissant_json, output_file="geodcat.jsonld", gi
     if croissant_json.get("url"):
         g.add((dataset_uri, DCAT.landingPage, URIRef(croissant_json["url"])))
 
-    g.serialize(destination=output_file, format="json-ld", indent=2)
+    # Either output may end in .gz or .zst; rdflib writes into the compressing stream
+    with stage("g.serialize", format="json-ld", triples=len(g)), open_file(output_file, "wb") as f:
+        g.serialize(destination=f, format="json-ld", indent=2)
     print(f"GeoDCAT JSON-LD metadata written to {output_file}")
 
-    g.serialize(destination="geodcat.ttl", format="turtle")
-    print("GeoDCAT Turtle metadata written to geodcat.ttl")
+    with stage("g.serialize", format="turtle", triples=len(g)), open_file(turtle_file, "wb") as f:
+        g.serialize(destination=f, format="turtle")
+    print(f"GeoDCAT Turtle metadata written to {turtle_file}")
 
 
 if __name__ == "__main__":
-    with open("croissant.json", "r") as f:
-        croissant = json.load(f)
+    croissant = load_json("croissant.json")
 
     croissant_to_geodcat_jsonld(croissant, output_file="geodcat.jsonld")
@@ -1,10 +1,22 @@
+import argparse
 import json
-import re
-from datetime import datetime
-from typing import Dict, List, Optional, Union
-from pystac import Item, Asset, MediaType
-from pystac.extensions.table import TableExtension
-from pystac.extensions.scientific import ScientificExtension
+import os
+import posixpath
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import jsonio
+from geocroissant.compression import open_file
+from geocroissant.extent import parse_instant
+from geocroissant.profiling import profiled, stage
+from geocroissant.reader import load_json
+from geocroissant.pairing import pair_listing
+from geocroissant.scenes import detect_scheme, format_datetimes, parse_scenes
 
 # License mapping from URL
 KNOWN_LICENSES = {
@@ -29,10 +41,33 @@ CONUS_GEOMETRY = {
     ]]
 }
 
+# STAC version of every Item and Collection written; pystac writes the same
+STAC_VERSION = "1.1.0"
+
+# Values of the pystac.MediaType members used for assets
+MEDIA_TYPE_PARQUET = "application/x-parquet"
+MEDIA_TYPE_JSON = "application/json"
+MEDIA_TYPE_HTML = "text/html"
+
+HLS_PLATFORMS = {"L30": "landsat-8", "S30": "sentinel-2"}
+S2_PLATFORMS = {"S2A": "sentinel-2a", "S2B": "sentinel-2b", "S2C": "sentinel-2c", "S2D": "sentinel-2d"}
+
+# Media type of record assets by file extension
+RECORD_MEDIA_TYPES = {
+    ".tif": "image/tiff; application=geotiff",
+    ".tiff": "image/tiff; application=geotiff",
+    ".h5": "application/x-hdf5",
+    ".hdf5": "application/x-hdf5",
+    ".nc": "application/netcdf",
+}
+
+# Items written by one worker at a time in catalog mode
+ITEM_BATCH = 64
+
 def extract_band_configuration(metadata: Dict) -> List[Dict]:
     """Extract band configuration from croissant metadata."""
     # Look for bandConfiguration in dataCollection
-    data_collection = metadata.get("dataCollection", {})
+    data_collection = metadata.get("dataCollection") or {}
     band_config = data_collection.get("bandConfiguration", {})
     
     if not band_config:
@@ -58,7 +93,7 @@ def extract_band_configuration(metadata: Dict) -> List[Dict]:
 def extract_temporal_coverage(metadata: Dict) -> tuple:
     """Extract temporal coverage from croissant metadata."""
     # Check dataCollection first
-    data_collection = metadata.get("dataCollection", {})
+    data_collection = metadata.get("dataCollection") or {}
     temporal_coverage = data_collection.get("temporalCoverage", "")
     
     if temporal_coverage:
@@ -78,7 +113,7 @@ def extract_temporal_coverage(metadata: Dict) -> tuple:
 
 def extract_spatial_coverage(metadata: Dict) -> tuple:
     """Extract spatial coverage from croissant metadata."""
-    data_collection = metadata.get("dataCollection", {})
+    data_collection = metadata.get("dataCollection") or {}
     spatial_coverage = data_collection.get("spatialCoverage", "")
     
     # For now, assume CONUS for this dataset
@@ -137,50 +172,229 @@ def determine_media_type(href: str, asset_id: str, encoding_format: str = None)
     asset_id_lower = asset_id.lower()
     
     if "parquet" in asset_id_lower or "parquet" in href_lower:
-        return MediaType.PARQUET
+        return MEDIA_TYPE_PARQUET
     elif "git" in href_lower:
         return "application/git"
     elif "tiff" in href_lower or "tif" in href_lower:
         return "image/tiff"
     elif "json" in href_lower:
-        return MediaType.JSON
+        return MEDIA_TYPE_JSON
     elif "csv" in href_lower:
         return "text/csv"
     elif "huggingface" in href_lower:
-        return MediaType.HTML
+        return MEDIA_TYPE_HTML
     elif encoding_format:
         return encoding_format
     
-    return MediaType.JSON
+    return MEDIA_TYPE_JSON
+
+# Properties of the single dataset Item that do not come from the metadata
+DEFAULT_HLS_BANDS = [
+    {"name": "Blue", "common_name": "blue", "hls_band": "B02", "wavelength": "490nm"},
+    {"name": "Green", "common_name": "green", "hls_band": "B03", "wavelength": "560nm"},
+    {"name": "Red", "common_name": "red", "hls_band": "B04", "wavelength": "665nm"},
+    {"name": "NIR", "common_name": "nir", "hls_band": "B8A", "wavelength": "865nm"},
+    {"name": "SW1", "common_name": "swir1", "hls_band": "B11", "wavelength": "1610nm"},
+    {"name": "SW2", "common_name": "swir2", "hls_band": "B12", "wavelength": "2190nm"}
+]
+
+ITEM_STAC_EXTENSIONS = [
+    "https://stac-extensions.github.io/table/v1.2.0/schema.json",
+    "https://stac-extensions.github.io/scientific/v1.0.0/schema.json",
+    "https://schemas.stacspec.org/v1.1.0/item-spec/json-schema/item.json"
+]
+
+DOI_URL_BASE = "https://doi.org/"
+
+RECORD_COLUMNS = [
+    {
+        "name": "image_path",
+        "type": "string",
+        "description": "Path to the image TIFF file"
+    },
+    {
+        "name": "annotation_path",
+        "type": "string",
+        "description": "Path to the annotation TIFF file (null when none is listed)"
+    },
+    {
+        "name": "split",
+        "type": "string",
+        "description": "Dataset split (train/validation)"
+    },
+    {
+        "name": "scene_id",
+        "type": "string",
+        "description": "HLS scene identifier"
+    },
+    {
+        "name": "date",
+        "type": "string",
+        "description": "Acquisition date (YYYYDDD, year and day of year)"
+    },
+    {
+        "name": "datetime",
+        "type": "string",
+        "description": "Acquisition time (ISO 8601, UTC)"
+    }
+]
+
+def _item_id(metadata: Dict) -> str:
+    return metadata.get("identifier", metadata.get("name", "unknown-id")).replace("/", "_")
+
+def _item_properties(metadata: Dict) -> tuple:
+    """Return (properties, datetime) of the dataset Item before any extension fields are added."""
+    start_datetime, end_datetime, midpoint_datetime = extract_temporal_coverage(metadata)
+    bands = extract_band_configuration(metadata)
+    properties = {
+        "title": metadata.get("name", ""),
+        "description": metadata.get("description", ""),
+        "license": normalize_license(metadata.get("license", "proprietary")),
+        "start_datetime": start_datetime.isoformat() + "Z",
+        "end_datetime": end_datetime.isoformat() + "Z",
+        "keywords": metadata.get("keywords", []),
+        "providers": extract_providers(metadata),
+        "msft:region": "US",
+        "msft:short_description": "HLS burn scars imagery and masks for US (2018-2021)",
+        "gsd": 30,  # Ground sample distance in meters (Landsat/Sentinel-2)
+        "platform": "Landsat-8, Sentinel-2",
+        "instruments": ["OLI", "TIRS", "MSI"],
+        "constellation": "HLS",
+        "dataset_size": "804 scenes",
+        "image_size": "512x512 pixels",
+        "hls:bands": bands if bands else [dict(band) for band in DEFAULT_HLS_BANDS],
+        "format": "TIFF"
+    }
+    return properties, midpoint_datetime
+
+def _distribution_assets(metadata: Dict) -> List[tuple]:
+    """Return (asset_id, href, media_type, title, roles, extra_fields) per distribution with a contentUrl."""
+    assets = []
+    for dist in metadata.get("distribution", []):
+        href = dist.get("contentUrl")
+        if not href:
+            continue
+
+        asset_id = dist.get("@id", dist.get("name", "asset")).replace(" ", "_").lower()
+        encoding_format = dist.get("encodingFormat")
+        desc = dist.get("description", asset_id)
+
+        # Determine media type and roles
+        media_type = determine_media_type(href, asset_id, encoding_format)
+
+        # Determine roles based on asset type
+        roles = ["data"]
+        if "git" in href.lower():
+            roles = ["metadata"]
+        elif "huggingface" in href.lower():
+            roles = ["metadata", "documentation"]
+        elif "tiff" in href.lower() or "tif" in href.lower():
+            roles = ["data", "visual"]
+
+        # Add additional properties if available
+        extra_fields = {}
+        if dist.get("fileSize"):
+            extra_fields["file:size"] = dist["fileSize"]
+        if dist.get("md5"):
+            extra_fields["file:checksum"] = f"md5:{dist['md5']}"
+        assets.append((asset_id, href, media_type, desc, roles, extra_fields))
+    return assets
+
+def _dataset_records(metadata: Dict) -> tuple:
+    """Return (columns, records, file_listings, total_files) embedded in the dataset Item."""
+    columns = []
+    sample_data = []
+
+    # Extract file listings from geocr:fileListing
+    file_listing = metadata.get("geocr:fileListing", {})
+    images_data = file_listing.get("images", {})
+
+    for record_set in metadata.get("recordSet", []):
+        record_id = record_set.get("@id", "")
+
+        # Add columns for the main record set
+        if "hls_burn_scars" in record_id and "splits" not in record_id:
+            columns = [dict(column) for column in RECORD_COLUMNS]
+
+            # Extract ALL data records from file listings, one parse per split
+            # Format: training/subsetted_512x512_HLS.S30.T10SDH.2020248.v1.4_merged.tif
+            # Annotations are the listed masks joined by scene id
+            annotation_of = pair_listing(file_listing).annotation_of()
+            for split_name, file_list in images_data.items():
+                scenes = parse_scenes(file_list, "hls")
+                datetimes = format_datetimes(scenes["datetime"])
+                for file_path, tile, date, acquired in zip(file_list, scenes["tile"], scenes["date"], datetimes):
+                    if tile is None:
+                        continue
+                    sample_data.append({
+                        "image_path": file_path,
+                        "annotation_path": annotation_of.get(file_path),
+                        "split": split_name,
+                        "scene_id": f"T{tile}.{date}",
+                        "date": date,
+                        "datetime": acquired
+                    })
+
+    # Add complete file listing information as embedded data
+    file_listings = {}
+    total_files = 0
+    for split_name, file_list in images_data.items():
+        file_listings[split_name] = {
+            "count": len(file_list),
+            "files": file_list  # Include ALL files, not just examples
+        }
+        total_files += len(file_list)
+    return columns, sample_data, file_listings, total_files
+
+def _has_doi(doi) -> bool:
+    return bool(doi and doi.strip())
+
+def _publication_citation(metadata: Dict) -> str:
+    data_collection = metadata.get("dataCollection", {})
+    return (f"{data_collection.get('name', '')}. {data_collection.get('description', '')} "
+            f"Available at: {metadata.get('url', '')}")
+
+def _stac_datetime_str(value: datetime) -> str:
+    # pystac.utils.datetime_to_str: naive datetimes are UTC, "+00:00" is written "Z"
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+@profiled()
+def croissant_to_stac_item(croissant_json, output_path=None, use_pystac=False):
+    """Convert Croissant metadata to STAC Item.
+
+    The Item is built as plain dicts by croissant_to_stac_item_dict; with
+    use_pystac=True it is built through pystac.Item and its extensions
+    instead, which produces the same document (see benchmarks/stac_item.py).
+    """
+    if not use_pystac:
+        item_dict = croissant_to_stac_item_dict(croissant_json)
+        if output_path:
+            with stage("write_stac_item"):
+                write_stac_json(item_dict, output_path)
+            print(f"STAC item saved to {output_path}")
+            return None
+        return item_dict
+
+    # pystac is imported on first use so that loading this module stays cheap
+    from pystac import Item, Asset
+    from pystac.extensions.table import TableExtension
+    from pystac.extensions.scientific import ScientificExtension
 
-def croissant_to_stac_item(croissant_json, output_path=None):
-    """Convert Croissant metadata to STAC Item."""
     if isinstance(croissant_json, str):
-        metadata = json.loads(croissant_json)
+        metadata = jsonio.loads(croissant_json)
     else:
         metadata = croissant_json
 
     # Extract basic metadata
-    item_id = metadata.get("identifier", metadata.get("name", "unknown-id")).replace("/", "_")
-    title = metadata.get("name", "")
-    description = metadata.get("description", "")
-    license_raw = metadata.get("license", "proprietary")
-    keywords = metadata.get("keywords", [])
+    item_id = _item_id(metadata)
     dataset_url = metadata.get("url", "")
-    alternate_names = metadata.get("alternateName", [])
-
-    # Normalize license
-    license_normalized = normalize_license(license_raw)
-
-    # Extract provider information
-    providers = extract_providers(metadata)
 
     # Extract temporal and spatial coverage
-    start_datetime, end_datetime, midpoint_datetime = extract_temporal_coverage(metadata)
+    properties, midpoint_datetime = _item_properties(metadata)
     bbox, geometry = extract_spatial_coverage(metadata)
-    
-    # Extract band configuration
-    bands = extract_band_configuration(metadata)
 
     # Create STAC Item
     item = Item(
@@ -188,107 +402,50 @@ def croissant_to_stac_item(croissant_json, output_path=None):
         geometry=geometry,
         bbox=bbox,
         datetime=midpoint_datetime,
-        properties={
-            "title": title,
-            "description": description,
-            "license": license_normalized,
-            "start_datetime": start_datetime.isoformat() + "Z",
-            "end_datetime": end_datetime.isoformat() + "Z",
-            "keywords": keywords,
-            "providers": providers,
-            "msft:region": "US",
-            "msft:short_description": "HLS burn scars imagery and masks for US (2018-2021)",
-            "gsd": 30,  # Ground sample distance in meters (Landsat/Sentinel-2)
-            "platform": "Landsat-8, Sentinel-2",
-            "instruments": ["OLI", "TIRS", "MSI"],
-            "constellation": "HLS",
-            "dataset_size": "804 scenes",
-            "image_size": "512x512 pixels",
-            "hls:bands": bands if bands else [
-                {"name": "Blue", "common_name": "blue", "hls_band": "B02", "wavelength": "490nm"},
-                {"name": "Green", "common_name": "green", "hls_band": "B03", "wavelength": "560nm"},
-                {"name": "Red", "common_name": "red", "hls_band": "B04", "wavelength": "665nm"},
-                {"name": "NIR", "common_name": "nir", "hls_band": "B8A", "wavelength": "865nm"},
-                {"name": "SW1", "common_name": "swir1", "hls_band": "B11", "wavelength": "1610nm"},
-                {"name": "SW2", "common_name": "swir2", "hls_band": "B12", "wavelength": "2190nm"}
-            ],
-            "format": "TIFF"
-        }
+        properties=properties
     )
 
     # Add extensions
-    item.stac_extensions.extend([
-        "https://stac-extensions.github.io/table/v1.2.0/schema.json",
-        "https://stac-extensions.github.io/scientific/v1.0.0/schema.json",
-        "https://schemas.stacspec.org/v1.1.0/item-spec/json-schema/item.json"
-    ])
+    item.stac_extensions.extend(ITEM_STAC_EXTENSIONS)
 
     # Add scientific extension
     scientific_ext = ScientificExtension.ext(item, add_if_missing=True)
     doi = metadata.get("doi", "")
-    if doi and doi.strip():
+    if _has_doi(doi):
         scientific_ext.doi = doi
     scientific_ext.citation = metadata.get("citeAs", "")
-    
+
     # Add data collection information
     data_collection = metadata.get("dataCollection", {})
-    if data_collection and dataset_url and doi and doi.strip():
+    if data_collection and dataset_url and _has_doi(doi):
         from pystac.extensions.scientific import Publication
         # Create citation from data collection info
-        citation = f"{data_collection.get('name', '')}. {data_collection.get('description', '')} Available at: {dataset_url}"
         publication = Publication(
             doi=doi,
-            citation=citation
+            citation=_publication_citation(metadata)
         )
         scientific_ext.publications = [publication]
-    
+
     # Add additional metadata from dataCollection
     if data_collection:
         # Add collection method and sites
         if data_collection.get("collectionMethod"):
             item.properties["collection_method"] = data_collection["collectionMethod"]
-        
+
         # Add collection sites
         collection_sites = data_collection.get("collectionSites", [])
         if collection_sites:
             item.properties["collection_sites"] = collection_sites
 
     # Add assets from Croissant distribution
-    for dist in metadata.get("distribution", []):
-        href = dist.get("contentUrl")
-        if not href:
-            continue
-            
-        asset_id = dist.get("@id", dist.get("name", "asset")).replace(" ", "_").lower()
-        encoding_format = dist.get("encodingFormat")
-        desc = dist.get("description", asset_id)
-        
-        # Determine media type and roles
-        media_type = determine_media_type(href, asset_id, encoding_format)
-        
-        # Determine roles based on asset type
-        roles = ["data"]
-        if "git" in href.lower():
-            roles = ["metadata"]
-        elif "huggingface" in href.lower():
-            roles = ["metadata", "documentation"]
-        elif "tiff" in href.lower() or "tif" in href.lower():
-            roles = ["data", "visual"]
-        
-        # Create asset
+    for asset_id, href, media_type, desc, roles, extra_fields in _distribution_assets(metadata):
         asset = Asset(
             href=href,
             media_type=media_type,
             title=desc,
             roles=roles
         )
-        
-        # Add additional properties if available
-        if dist.get("fileSize"):
-            asset.extra_fields["file:size"] = dist["fileSize"]
-        if dist.get("md5"):
-            asset.extra_fields["file:checksum"] = f"md5:{dist['md5']}"
-            
+        asset.extra_fields.update(extra_fields)
         item.add_asset(asset_id, asset)
 
     # Add documentation asset if dataset URL exists
@@ -298,110 +455,355 @@ def croissant_to_stac_item(croissant_json, output_path=None):
             Asset(
                 href=dataset_url,
                 title="Dataset Documentation",
-                media_type=MediaType.HTML,
+                media_type=MEDIA_TYPE_HTML,
                 roles=["metadata", "documentation"]
             )
         )
 
     # Process record sets to add table schema and extract actual data
     table_ext = TableExtension.ext(item, add_if_missing=True)
-    columns = []
-    sample_data = []
-    
-    # Extract file listings from geocr:fileListing
-    file_listing = metadata.get("geocr:fileListing", {})
-    images_data = file_listing.get("images", {})
-    
-    for record_set in metadata.get("recordSet", []):
-        record_id = record_set.get("@id", "")
-        record_name = record_set.get("name", "")
-        
-        # Add columns for the main record set
-        if "hls_burn_scars" in record_id and "splits" not in record_id:
-            columns = [
-                {
-                    "name": "image_path",
-                    "type": "string",
-                    "description": "Path to the image TIFF file"
-                },
-                {
-                    "name": "annotation_path", 
-                    "type": "string",
-                    "description": "Path to the annotation TIFF file"
-                },
-                {
-                    "name": "split",
-                    "type": "string", 
-                    "description": "Dataset split (train/validation)"
-                },
-                {
-                    "name": "scene_id",
-                    "type": "string",
-                    "description": "HLS scene identifier"
-                },
-                {
-                    "name": "date",
-                    "type": "string",
-                    "description": "Acquisition date (YYYYMMDD)"
-                }
-            ]
-            
-            # Extract ALL data records from file listings
-            for split_name, file_list in images_data.items():
-                for file_path in file_list:  # Include ALL files, not just samples
-                    # Extract scene info from filename
-                    # Format: training/subsetted_512x512_HLS.S30.T10SDH.2020248.v1.4_merged.tif
-                    filename = file_path.split('/')[-1]
-                    parts = filename.split('.')
-                    if len(parts) >= 4:
-                        # Extract the date from the filename (e.g., 2020248 from T10SDH.2020248.v1.4)
-                        date_part = parts[3]  # This is the date like "2020248"
-                        scene_id = f"{parts[2]}.{date_part}"
-                        date = date_part
-                        
-                        # Create corresponding annotation path
-                        annotation_path = file_path.replace('_merged.tif', '_mask.tif')
-                        
-                        sample_data.append({
-                            "image_path": file_path,
-                            "annotation_path": annotation_path,
-                            "split": split_name,
-                            "scene_id": scene_id,
-                            "date": date
-                        })
-    
+    columns, sample_data, file_listings, total_files = _dataset_records(metadata)
+
     if columns:
         table_ext.columns = columns
-    
+
     # Add complete dataset as embedded data in properties
     if sample_data:
         item.properties["dataset_records"] = sample_data
         item.properties["total_records"] = len(sample_data)
-    
-    # Add complete file listing information as embedded data
-    if images_data:
-        file_listings = {}
-        total_files = 0
-        for split_name, file_list in images_data.items():
-            file_listings[split_name] = {
-                "count": len(file_list),
-                "files": file_list  # Include ALL files, not just examples
-            }
-            total_files += len(file_list)
-        
+
+    if file_listings:
         item.properties["file_listings"] = file_listings
         item.properties["total_files"] = total_files
 
     # Output or return result
     if output_path:
-        item.save_object(dest_href=output_path)
+        with stage("item.save_object"):
+            item.save_object(dest_href=output_path)
         print(f"STAC item saved to {output_path}")
     else:
-        return item.to_dict()
+        with stage("item.to_dict"):
+            return item.to_dict()
+
+@profiled()
+def croissant_to_stac_item_dict(croissant_json) -> Dict:
+    """Build the dataset Item of croissant_to_stac_item as plain dicts, without pystac.
+
+    Keys, values and their order match pystac.Item.to_dict() of the pystac
+    path, so both serialize to the same bytes.
+    """
+    metadata = jsonio.loads(croissant_json) if isinstance(croissant_json, str) else croissant_json
+    dataset_url = metadata.get("url", "")
+    properties, midpoint_datetime = _item_properties(metadata)
+    bbox, geometry = extract_spatial_coverage(metadata)
+    links = []
+
+    # Scientific extension: DOI and publications each add a cite-as link
+    doi = metadata.get("doi", "")
+    if _has_doi(doi):
+        properties["sci:doi"] = doi
+        links.append({"rel": "cite-as", "href": DOI_URL_BASE + quote(doi)})
+    citation = metadata.get("citeAs", "")
+    if citation is not None:
+        properties["sci:citation"] = citation
+    data_collection = metadata.get("dataCollection", {})
+    if data_collection and dataset_url and _has_doi(doi):
+        properties["sci:publications"] = [{"doi": doi, "citation": _publication_citation(metadata)}]
+        links.append({"rel": "cite-as", "href": DOI_URL_BASE + quote(doi)})
+    if data_collection:
+        if data_collection.get("collectionMethod"):
+            properties["collection_method"] = data_collection["collectionMethod"]
+        collection_sites = data_collection.get("collectionSites", [])
+        if collection_sites:
+            properties["collection_sites"] = collection_sites
+
+    assets = {}
+    for asset_id, href, media_type, desc, roles, extra_fields in _distribution_assets(metadata):
+        asset = {"href": href}
+        if media_type is not None:
+            asset["type"] = str(media_type)
+        if desc is not None:
+            asset["title"] = desc
+        asset.update(extra_fields)
+        asset["roles"] = roles
+        assets[asset_id] = asset
+    if dataset_url:
+        assets["documentation"] = {
+            "href": dataset_url,
+            "type": MEDIA_TYPE_HTML,
+            "title": "Dataset Documentation",
+            "roles": ["metadata", "documentation"]
+        }
+
+    columns, sample_data, file_listings, total_files = _dataset_records(metadata)
+    if columns:
+        properties["table:columns"] = columns
+    if sample_data:
+        properties["dataset_records"] = sample_data
+        properties["total_records"] = len(sample_data)
+    if file_listings:
+        properties["file_listings"] = file_listings
+        properties["total_files"] = total_files
+    properties["datetime"] = _stac_datetime_str(midpoint_datetime)
+
+    item = {
+        "type": "Feature",
+        "stac_version": STAC_VERSION,
+        "stac_extensions": list(ITEM_STAC_EXTENSIONS),
+        "id": _item_id(metadata),
+        "geometry": geometry,
+        "bbox": bbox,
+        "properties": properties,
+        "links": links,
+        "assets": assets
+    }
+    if not geometry:
+        item.pop("bbox")
+    return item
+
+def stac_json_bytes(stac_dict: Dict) -> bytes:
+    """Serialize a STAC document exactly as pystac's default StacIO writes it."""
+    if jsonio.orjson is not None:
+        return jsonio.orjson.dumps(stac_dict, option=jsonio.orjson.OPT_INDENT_2)
+    return json.dumps(stac_dict, indent=2).encode("utf-8")
+
+def write_stac_json(stac_dict: Dict, output_path: str) -> None:
+    """Write a STAC document with stac_json_bytes (.gz and .zst paths are compressed)."""
+    with open_file(output_path, "wb") as f:
+        f.write(stac_json_bytes(stac_dict))
+
+# === Per-record static catalog ===
+
+def _scene_properties(scheme: str, scenes: Dict, i: int) -> Dict:
+    # Platform properties of the i-th scene of a dated naming scheme
+    if scheme == "hls":
+        sensor = scenes["sensor"][i]
+        return {"platform": HLS_PLATFORMS.get(sensor, sensor), "constellation": "hls",
+                "hls:sensor": sensor, "hls:tile": scenes["tile"][i], "gsd": 30}
+    properties = {"constellation": "sentinel-2", "s2:mgrs_tile": scenes["tile"][i], "gsd": 10}
+    mission = scenes["mission"][i]
+    if mission:
+        properties = {"platform": S2_PLATFORMS.get(mission, mission), **properties}
+    return properties
+
+def _stac_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _asset_href(asset_root: Optional[str], base_path: str, path: str) -> str:
+    # Some listings already hold paths from the dataset root, base path included
+    if base_path and path.startswith(base_path.rstrip("/") + "/"):
+        base_path = ""
+    return posixpath.join(*[part for part in (asset_root, base_path, path) if part])
+
+def _record_asset(href: str, title: str, roles: List[str]) -> Dict:
+    asset = {"href": href}
+    media_type = RECORD_MEDIA_TYPES.get(posixpath.splitext(href)[1].lower())
+    if media_type:
+        asset["type"] = media_type
+    asset.update({"title": title, "roles": roles})
+    return asset
+
+def _record_extent(metadata: Dict) -> tuple:
+    # (bbox, geometry, start, end) shared by every record: the document's
+    # geocr:BoundingBox and geocr:temporalExtent when it declares them
+    bbox, geometry = extract_spatial_coverage(metadata)
+    start_datetime, end_datetime, _ = extract_temporal_coverage(metadata)
+    declared_bbox = metadata.get("geocr:BoundingBox")
+    if isinstance(declared_bbox, list) and len(declared_bbox) == 4:
+        west, south, east, north = (float(v) for v in declared_bbox)
+        bbox = [west, south, east, north]
+        geometry = {
+            "type": "Polygon",
+            "coordinates": [[[west, south], [west, north], [east, north], [east, south], [west, south]]]
+        }
+    temporal = metadata.get("geocr:temporalExtent") or {}
+    start = parse_instant(temporal.get("startDate") or "")
+    end = parse_instant(temporal.get("endDate") or "")
+    if start is not None and end is not None:
+        start_datetime, end_datetime = start, end
+    return bbox, geometry, start_datetime, end_datetime
+
+def build_record_items(metadata: Dict, collection_id: str, asset_root: Optional[str] = None) -> List[Dict]:
+    """One STAC Item per image of geocr:fileListing, with its mask when the listing pairs one with it."""
+    listing = metadata.get("geocr:fileListing", {})
+    base_paths = listing.get("basePaths", {})
+    # Records have no footprint or time range of their own in the listing; they share the dataset's
+    bbox, geometry, start_datetime, end_datetime = _record_extent(metadata)
+    up_links = [
+        {"rel": rel, "href": "../collection.json", "type": "application/json"}
+        for rel in ("root", "parent", "collection")
+    ]
+
+    # Scenes carry their acquisition date in the file name (HLS, Sentinel-2);
+    # each split is parsed, dates included, in one call
+    images = listing.get("images", {})
+    scheme = detect_scheme([path for file_list in images.values() for path in file_list[:16]])
+    if scheme not in ("hls", "sentinel2"):
+        scheme = None
+
+    pairing = pair_listing(listing)
+    for line in pairing.report():
+        print(f"Unpaired files in {line}")
+    masks = pairing.annotation_of()
+
+    items = []
+    for split_name, file_list in images.items():
+        if scheme is not None:
+            scenes = parse_scenes(file_list, scheme)
+            datetimes = format_datetimes(scenes["datetime"])
+        else:
+            scenes = {"scene_id": [None] * len(file_list)}
+            datetimes = scenes["scene_id"]
+        for i, path in enumerate(file_list):
+            item_id = scenes["scene_id"][i]
+            properties = {"split": split_name, "datetime": datetimes[i]}
+            if properties["datetime"] is None:
+                properties["start_datetime"] = _stac_datetime(start_datetime)
+                properties["end_datetime"] = _stac_datetime(end_datetime)
+            if item_id is None:
+                # Generic names (image_1.h5) repeat across splits
+                item_id = f"{split_name}_{posixpath.splitext(path.rsplit('/', 1)[-1])[0]}"
+            else:
+                properties.update(_scene_properties(scheme, scenes, i))
+            assets = {"image": _record_asset(_asset_href(asset_root, base_paths.get("images", ""), path),
+                                             "Image", ["data"])}
+            mask_path = masks.get(path)
+            if mask_path is not None:
+                assets["mask"] = _record_asset(_asset_href(asset_root, base_paths.get("annotations", ""), mask_path),
+                                               "Annotation mask", ["data", "labels"])
+            items.append({
+                "type": "Feature",
+                "stac_version": STAC_VERSION,
+                "stac_extensions": [],
+                "id": item_id,
+                "geometry": geometry,
+                "bbox": bbox,
+                "properties": properties,
+                "links": up_links,
+                "assets": assets,
+                "collection": collection_id,
+            })
+    return items
+
+def build_collection(metadata: Dict, collection_id: str, items: List[Dict]) -> Dict:
+    """The Collection of a per-record catalog, linking every Item and spanning their datetimes."""
+    bbox, _, start_datetime, end_datetime = _record_extent(metadata)
+    datetimes = [item["properties"]["datetime"] for item in items if item["properties"]["datetime"]]
+    interval = [min(datetimes), max(datetimes)] if datetimes else [
+        _stac_datetime(start_datetime), _stac_datetime(end_datetime)
+    ]
+    collection = {
+        "type": "Collection",
+        "stac_version": STAC_VERSION,
+        "stac_extensions": [],
+        "id": collection_id,
+        "title": metadata.get("name", ""),
+        "description": metadata.get("description", "") or collection_id,
+        "license": normalize_license(metadata.get("license", "proprietary")),
+        "keywords": metadata.get("keywords", []),
+        "providers": extract_providers(metadata),
+        "extent": {"spatial": {"bbox": [bbox]}, "temporal": {"interval": [interval]}},
+        "summaries": {
+            "platform": sorted({item["properties"]["platform"] for item in items if "platform" in item["properties"]}),
+            "split": sorted({item["properties"]["split"] for item in items}),
+        },
+        "links": [{"rel": "root", "href": "./collection.json", "type": "application/json"}] + [
+            {"rel": "item", "href": f"./{item['id']}/{item['id']}.json", "type": "application/geo+json"}
+            for item in items
+        ],
+    }
+    if metadata.get("url"):
+        collection["assets"] = {
+            "documentation": {
+                "href": metadata["url"],
+                "title": "Dataset Documentation",
+                "type": "text/html",
+                "roles": ["metadata", "documentation"],
+            }
+        }
+    return collection
+
+def _write_items(output_dir: str, items: List[Dict]) -> int:
+    for item in items:
+        item_dir = os.path.join(output_dir, item["id"])
+        os.makedirs(item_dir, exist_ok=True)
+        jsonio.dump(item, os.path.join(item_dir, f"{item['id']}.json"))
+    return len(items)
+
+def _collection_id(metadata: Dict) -> str:
+    return (metadata.get("identifier") or metadata.get("name") or "unknown-id").replace("/", "_")
+
+@profiled()
+def croissant_to_stac_catalog(croissant_json, output_dir: str, workers: Optional[int] = None,
+                              asset_root: Optional[str] = None) -> Dict:
+    """Write a self-contained static catalog: a Collection plus one Item per record.
+
+    Layout is output_dir/collection.json and output_dir/{item id}/{item id}.json,
+    linked with relative hrefs. Each Item carries the image and mask of one
+    scene as assets (hrefs are asset_root/basePath/path) and the acquisition
+    datetime decoded from its HLS file name. Items are written in batches by a
+    pool of `workers` threads. Returns the number of items and masks written.
+    """
+    metadata = jsonio.loads(croissant_json) if isinstance(croissant_json, str) else croissant_json
+    collection_id = _collection_id(metadata)
+
+    with stage("build_record_items"):
+        items = build_record_items(metadata, collection_id, asset_root)
+    os.makedirs(output_dir, exist_ok=True)
+    with stage("write_items", items=len(items)), ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_write_items, output_dir, items[i:i + ITEM_BATCH])
+            for i in range(0, len(items), ITEM_BATCH)
+        ]
+        written = sum(future.result() for future in futures)
+    jsonio.dump(build_collection(metadata, collection_id, items), os.path.join(output_dir, "collection.json"))
+    masks = sum(1 for item in items if "mask" in item["assets"])
+    print(f"STAC catalog with {written} items ({masks} with masks) saved to {output_dir}")
+    return {"items": written, "masks": masks}
+
+@profiled()
+def croissant_to_stac_geoparquet(croissant_json, output_path: str, asset_root: Optional[str] = None,
+                                 row_group_size: Optional[int] = None) -> Dict:
+    """Write the per-record Items of croissant_to_stac_catalog as one stac-geoparquet file.
+
+    One row per Item, geometry as WKB, every property a column, written in
+    row groups of row_group_size; the Collection is kept in the file metadata.
+    pyarrow is required.
+    """
+    from geocroissant.geoparquet import ROW_GROUP_SIZE, StacParquetWriter, stac_parquet_schema
+
+    metadata = jsonio.loads(croissant_json) if isinstance(croissant_json, str) else croissant_json
+    collection_id = _collection_id(metadata)
+    with stage("build_record_items"):
+        items = build_record_items(metadata, collection_id, asset_root)
+    collection = build_collection(metadata, collection_id, items)
+    # A Parquet file has no item hrefs to link to
+    collection["links"] = [link for link in collection["links"] if link["rel"] != "item"]
+    with stage("write_stac_geoparquet", items=len(items)):
+        with StacParquetWriter(output_path, stac_parquet_schema(items), collection=collection,
+                               row_group_size=row_group_size or ROW_GROUP_SIZE) as writer:
+            for item in items:
+                writer.append(item)
+    print(f"stac-geoparquet with {writer.count} items saved to {output_path}")
+    return {"items": writer.count}
 
 if __name__ == "__main__":
-    # Example usage
-    with open("croissant.json", "r") as f:
-        croissant_data = json.load(f)
+    parser = argparse.ArgumentParser(description="Convert GeoCroissant metadata to a STAC Item or a static catalog.")
+    parser.add_argument("input", nargs="?", default="croissant.json", help="GeoCroissant JSON-LD to read")
+    parser.add_argument("output", nargs="?", default="stac_item.json", help="STAC Item to write")
+    parser.add_argument("--catalog", metavar="DIR", default=None,
+                        help="Write a Collection with one Item per record below DIR instead of a single Item")
+    parser.add_argument("--geoparquet", metavar="PATH", default=None,
+                        help="Write one stac-geoparquet row per record to PATH instead of a single Item")
+    parser.add_argument("--asset-root", default=None,
+                        help="Directory or URL the listed image and mask paths are relative to (per-record modes)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Threads writing Items (catalog mode)")
+    args = parser.parse_args()
 
-    stac_item = croissant_to_stac_item(croissant_data, output_path="stac_item.json")
+    croissant_data = load_json(args.input)
+    if args.geoparquet:
+        croissant_to_stac_geoparquet(croissant_data, args.geoparquet, asset_root=args.asset_root)
+    if args.catalog:
+        croissant_to_stac_catalog(croissant_data, args.catalog, workers=args.workers, asset_root=args.asset_root)
+    if not (args.catalog or args.geoparquet):
+        stac_item = croissant_to_stac_item(croissant_data, output_path=args.output)
@@ -1,9 +1,13 @@
 import os
+import sys
 import json
-from glob import glob
 from datasets import Dataset, DatasetDict
 import datasets
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant.pairing import pair_paths
+
 def load_hls_burn_scars_dataset():
     """Load HLS Burn Scars dataset from local files"""
     
@@ -13,18 +17,16 @@ def load_hls_burn_scars_dataset():
     def get_file_pairs(split):
         """Get image and annotation file pairs for a split"""
         split_path = os.path.join(dataset_path, split)
-        image_files = glob(os.path.join(split_path, "*_merged.tif"))
+        # One listing of the directory; masks are joined to images by scene id
+        names = sorted(os.listdir(split_path))
+        image_files = [os.path.join(split_path, name) for name in names if name.endswith("_merged.tif")]
+        mask_files = [os.path.join(split_path, name) for name in names if name.endswith(".mask.tif")]
         
-        pairs = []
-        for img_file in image_files:
-            mask_file = img_file.replace("_merged.tif", ".mask.tif")
-            if os.path.exists(mask_file):
-                pairs.append({
-                    "image": img_file,
-                    "annotation": mask_file
-                })
+        pairing = pair_paths(image_files, mask_files, split)
+        for line in pairing.report():
+            print(f"Unpaired files in {line}")
         
-        return pairs
+        return [{"image": img_file, "annotation": mask_file} for _, img_file, mask_file in pairing]
     
     # Load training and validation data
     train_data = get_file_pairs("training")
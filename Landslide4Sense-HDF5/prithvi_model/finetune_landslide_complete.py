@@ -23,6 +23,9 @@ import random
 
 # Add the current directory to path to import prithvi_mae
 sys.path.append('.')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+
+from geocroissant.pairing import pair_listing
 
 # Import the actual Prithvi model
 from prithvi_mae import PrithviMAE
@@ -88,11 +91,15 @@ class LandslideDataset(Dataset):
         # Get repo path from metadata
         self.repo_path = Path(self.metadata["distribution"][0]["path"])
         
-        # Get file listings from metadata
-        self.image_files = self.metadata["geocr:fileListing"]["images"][split]
-        self.annotation_files = self.metadata["geocr:fileListing"]["annotations"][split]
+        # Get file listings from metadata; images and masks are paired by
+        # sample number (image_12.h5 / mask_12.h5), not by position
+        pairing = pair_listing(self.metadata["geocr:fileListing"], splits=[split])
+        self.image_files = pairing.images
+        self.annotation_files = pairing.annotations
         
-        print(f"Found {len(self.image_files)} images and {len(self.annotation_files)} annotations for {split} split")
+        print(f"Found {len(self.image_files)} image-annotation pairs for {split} split")
+        for line in pairing.report():
+            print(f"Unpaired files in {line}")
     
     def __len__(self):
         return len(self.image_files)
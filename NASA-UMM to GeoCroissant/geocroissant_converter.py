@@ -6,15 +6,24 @@ This script demonstrates how to convert NASA UMM-G JSON to GeoCroissant format
 with ALL fields mapped, achieving 100% data preservation.
 """
 
-import json
+import os
 import re
+import sys
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import jsonio
+from geocroissant.checksum import fill_checksums
+from geocroissant.profiling import profiled
+from geocroissant.reader import load_json
+
 class CompleteNASAUMMGToGeoCroissantConverter:
     """Complete converter that maps ALL NASA UMM-G fields to GeoCroissant."""
     
-    def __init__(self):
+    def __init__(self, checksum_engine=None):
+        self.checksum_engine = checksum_engine
         self.setup_context()
     
     def setup_context(self):
@@ -70,7 +79,9 @@ class CompleteNASAUMMGToGeoCroissantConverter:
             "transform": "cr:transform"
         }
     
-    def create_dataset_structure(self, meta: Dict[str, Any], umm: Dict[str, Any]) -> Dict[str, Any]:
+    @profiled()
+    def create_dataset_structure(self, meta: Dict[str, Any], umm: Dict[str, Any],
+                                 base_dir: Optional[str] = None) -> Dict[str, Any]:
         """Create the main Dataset structure following Croissant 1.0 CreativeWork schema."""
         return {
             "@context": self.context,
@@ -119,10 +130,11 @@ class CompleteNASAUMMGToGeoCroissantConverter:
             "geocr:spectralBands": self.extract_spectral_bands(umm),
             "geocr:customProperties": self.extract_custom_properties(umm),
             "geocr:relatedUrls": self.extract_related_urls(umm),
-            "distribution": self.extract_all_distributions(umm),
+            "distribution": self.extract_all_distributions(umm, base_dir),
             "recordSet": [self.create_record(meta, umm)]
         }
     
+    @profiled()
     def create_record(self, meta: Dict[str, Any], umm: Dict[str, Any]) -> Dict[str, Any]:
         """Create a RecordSet following proper Croissant 1.0 structure."""
         return {
@@ -383,9 +395,9 @@ class CompleteNASAUMMGToGeoCroissantConverter:
             "geocr:spatialResamplingAlgorithm": self.find_additional_attribute(additional_attrs, 'SPATIAL_RESAMPLING_ALG')
         }
     
-    def add_distribution(self, record: Dict[str, Any], umm: Dict[str, Any]):
+    def add_distribution(self, record: Dict[str, Any], umm: Dict[str, Any], base_dir: Optional[str] = None):
         """Add distribution information to the record."""
-        distributions = self.extract_all_distributions(umm)
+        distributions = self.extract_all_distributions(umm, base_dir)
         if distributions:
             record["distribution"] = distributions  # Include all distributions
     
@@ -530,8 +542,13 @@ class CompleteNASAUMMGToGeoCroissantConverter:
         
         return scaling
     
-    def extract_all_distributions(self, umm: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract all distribution methods from UMM-G following Croissant 1.0 format."""
+    @profiled()
+    def extract_all_distributions(self, umm: Dict[str, Any], base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Extract all distribution methods from UMM-G following Croissant 1.0 format.
+
+        Relative local URLs are checksummed against ``base_dir`` (the directory
+        of the UMM-G file), not the working directory.
+        """
         distributions = []
         
         # Get all related URLs
@@ -616,6 +633,9 @@ class CompleteNASAUMMGToGeoCroissantConverter:
                 "includes": "**/*.tif"
             })
         
+        # Replace placeholder checksums for any distribution that is a local file
+        fill_checksums(distributions, base_dir=base_dir, engine=self.checksum_engine)
+        
         return distributions
     
     def determine_encoding_format(self, url: str, url_type: str, subtype: str) -> str:
@@ -853,6 +873,7 @@ class CompleteNASAUMMGToGeoCroissantConverter:
             }
         }
     
+    @profiled()
     def extract_related_urls(self, umm: Dict[str, Any]) -> Dict[str, Any]:
         """Extract and categorize all related URLs with relationship types."""
         related_urls = umm.get('RelatedUrls', [])
@@ -912,29 +933,34 @@ class CompleteNASAUMMGToGeoCroissantConverter:
             }
         }
     
-    def convert_to_complete_geocroissant(self, ummg_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Main conversion method - clean and organized."""
+    @profiled()
+    def convert_to_complete_geocroissant(self, ummg_data: Dict[str, Any],
+                                         base_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Main conversion method - clean and organized.
+
+        ``base_dir`` is the directory relative file URLs are resolved against.
+        """
         # Extract main sections
         meta = ummg_data.get('meta', {})
         umm = ummg_data.get('umm', {})
         
         # Create the complete GeoCroissant structure
-        return self.create_dataset_structure(meta, umm)
+        return self.create_dataset_structure(meta, umm, base_dir)
 
 def main():
     """Main function to demonstrate complete conversion following Croissant 1.0."""
     
     # Load the NASA UMM-G JSON
-    with open('nasa_ummg_h.json', 'r') as f:
-        ummg_data = json.load(f)
+    ummg_data = load_json('nasa_ummg_h.json')
     
     # Convert to complete GeoCroissant
     converter = CompleteNASAUMMGToGeoCroissantConverter()
-    complete_geocroissant_data = converter.convert_to_complete_geocroissant(ummg_data)
+    complete_geocroissant_data = converter.convert_to_complete_geocroissant(
+        ummg_data, base_dir=os.path.dirname(os.path.abspath('nasa_ummg_h.json'))
+    )
     
     # Save the complete converted data
-    with open('geocroissant_output.json', 'w') as f:
-        json.dump(complete_geocroissant_data, f, indent=2)
+    jsonio.dump(complete_geocroissant_data, 'geocroissant_output.json')
     
     print("Complete conversion completed!")
     print(f"Input: nasa_ummg_h.json")
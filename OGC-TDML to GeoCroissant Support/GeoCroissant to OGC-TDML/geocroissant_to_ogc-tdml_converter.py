@@ -5,18 +5,24 @@ import sys
 from datetime import datetime
 from typing import Dict, Any
 
-# Import pytdml library with proper structure
-from pytdml.type import EOTrainingDataset, AI_EOTask, AI_EOTrainingData, AI_SceneLabel, AI_PixelLabel, MD_Band, MD_Identifier, NamedValue, CI_Citation, MD_Scope
-from pytdml.io import write_to_json
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
 
+from geocroissant import jsonio
+from geocroissant.pairing import pair_listing
+from geocroissant.profiling import profiled, stage
+
+@profiled()
 def convert_geocroissant_to_tdml(geocroissant_path, tdml_output_path):
     """
     Convert GeoCroissant JSON to OGC-TDML JSON format using pytdml library.
     """
+    # pytdml is imported on first use so that loading this module stays cheap
+    from pytdml.type import EOTrainingDataset, AI_EOTask, AI_EOTrainingData, AI_SceneLabel, AI_PixelLabel, MD_Band, MD_Identifier, NamedValue, CI_Citation, MD_Scope
+    from pytdml.io import write_to_json
+
     try:
         # Load the GeoCroissant JSON directly
-        with open(geocroissant_path, 'r') as f:
-            croissant_data = json.load(f)
+        croissant_data = jsonio.load(geocroissant_path)
     except FileNotFoundError:
         raise FileNotFoundError(f"GeoCroissant file not found: {geocroissant_path}")
     except json.JSONDecodeError as e:
@@ -199,37 +205,21 @@ def convert_geocroissant_to_tdml(geocroissant_path, tdml_output_path):
         # Create empty data structure
         data = []
     else:
-        images = file_listing.get('images', {})
-        annotations = file_listing.get('annotations', {})
-        
-        # Process training images and annotations
-        train_images = images.get('train', [])
-        train_annotations = annotations.get('train', [])
-        
-        # Process validation images and annotations  
-        val_images = images.get('val', [])
-        val_annotations = annotations.get('val', [])
-        
-        # Combine training and validation data
-        all_images = train_images + val_images
-        all_annotations = train_annotations + val_annotations
-        
-        # Ensure we have matching image and annotation pairs
-        min_pairs = min(len(all_images), len(all_annotations))
-        if min_pairs == 0:
+        # Pair every image with the annotation of the same scene, split by
+        # split, instead of by position in the lists
+        pairing = pair_listing(file_listing)
+        for line in pairing.report():
+            print(f"Warning: unpaired files in {line}")
+
+        if not len(pairing):
             print("Warning: No image-annotation pairs found in file listing")
         else:
             # Create data entries with actual URLs
-            max_samples = min(50, total_samples) if total_samples > 0 else min(50, min_pairs)
+            max_samples = min(50, total_samples) if total_samples > 0 else min(50, len(pairing))
             
-            for i in range(min(max_samples, min_pairs)):
-                img_url = all_images[i]
-                mask_url = all_annotations[i]
-                
-                # Validate URLs
-                if not img_url or not mask_url:
-                    print(f"Warning: Skipping data entry {i} due to missing URL")
-                    continue
+            for i, (split, img_url, mask_url) in enumerate(pairing):
+                if i >= max_samples:
+                    break
                 
                 data_entry = AI_EOTrainingData(
                     id=f"data_{i}",
@@ -271,7 +261,8 @@ def convert_geocroissant_to_tdml(geocroissant_path, tdml_output_path):
     
     # Write the TDML JSON file using pytdml's write_to_json function
     try:
-        write_to_json(tdml_structure, tdml_output_path)
+        with stage("pytdml.write_to_json"):
+            write_to_json(tdml_structure, tdml_output_path)
         
         print(f"TDML file written to {tdml_output_path}")
         print(f"Converted dataset: {name}")
@@ -1,6 +1,12 @@
-import json
+import os
 import re
-import pytdml.io
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+
+from geocroissant import jsonio
+from geocroissant.checksum import fill_checksums
+from geocroissant.profiling import profiled, stage
 
 def safe_str(value, default="Unknown"):
     """Return string if value is not None/empty, else default."""
@@ -8,8 +14,12 @@ def safe_str(value, default="Unknown"):
         return default
     return str(value)
 
+@profiled()
 def tdml_to_geocroissant(tdml_path, output_path):
-    tdml = pytdml.io.read_from_json(tdml_path)
+    import pytdml.io  # imported on first use so that loading this module stays cheap
+
+    with stage("pytdml.read_from_json"):
+        tdml = pytdml.io.read_from_json(tdml_path)
 
     # Build variableMeasured from classes and bands
     variable_measured = []
@@ -60,6 +70,9 @@ def tdml_to_geocroissant(tdml_path, output_path):
         "includes": "**/*.tif"
     })
 
+    # Compute real checksums for FileObjects that point at local files
+    fill_checksums(distribution, base_dir=os.path.dirname(os.path.abspath(tdml_path)))
+
     # Build spatialCoverage - OGC-TDML doesn't have extent, so use description
     spatial_coverage = "Contiguous United States"  # From the description
 
@@ -234,9 +247,9 @@ def tdml_to_geocroissant(tdml_path, output_path):
     if variable_measured:
         geocroissant["variableMeasured"] = variable_measured
 
-    with open(output_path, "w") as f:
-        json.dump(geocroissant, f, indent=2)
+    jsonio.dump(geocroissant, output_path)
     print(f"GeoCroissant file written to {output_path}")
 
 # Example usage:
-tdml_to_geocroissant("ogc-tdml.json", "ogc_croissant.json")
+if __name__ == "__main__":
+    tdml_to_geocroissant("ogc-tdml.json", "ogc_croissant.json")
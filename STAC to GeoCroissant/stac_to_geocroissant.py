@@ -1,7 +1,15 @@
-import json
+import os
+import sys
 from datetime import datetime
 import re
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import jsonio
+from geocroissant.checksum import fill_checksums
+from geocroissant.profiling import profiled
+from geocroissant.reader import load_json
+
 
 def sanitize_name(name):
     return re.sub(r"[^a-zA-Z0-9_\-]", "-", name)
@@ -18,7 +26,8 @@ def ensure_semver(version):
     return ".".join(parts[:3])
 
 
-def stac_to_geocroissant(stac_dict):
+@profiled()
+def stac_to_geocroissant(stac_dict, base_dir=None):
     dataset_id = stac_dict.get("id")
     name = sanitize_name(stac_dict.get("title", dataset_id or "UnnamedDataset"))
     version = ensure_semver(stac_dict.get("version", "1.0.0"))
@@ -195,6 +204,9 @@ def stac_to_geocroissant(stac_dict):
 
         croissant["distribution"].append(file_object)
 
+    # Compute real checksums for assets that are local files
+    fill_checksums(croissant["distribution"], base_dir=base_dir)
+
     # Add item_assets as FileSet for data files
     if "item_assets" in stac_dict:
         # Create a FileSet for the item assets
@@ -303,14 +315,12 @@ def stac_to_geocroissant(stac_dict):
 # === Main Runner ===
 if __name__ == "__main__":
     # Load STAC Collection JSON
-    with open("stac.json") as f:
-        stac_data = json.load(f)
+    stac_data = load_json("stac.json")
 
     # Convert to GeoCroissant
     croissant_json = stac_to_geocroissant(stac_data)
 
     # Save GeoCroissant JSON-LD
-    with open("croissant.json", "w") as f:
-        json.dump(croissant_json, f, indent=2)
+    jsonio.dump(croissant_json, "croissant.json")
 
     print("\nGeoCroissant conversion complete. Output saved to 'croissant.json'")
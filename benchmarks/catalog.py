@@ -0,0 +1,108 @@
+"""
+Static catalog conversion: geocroissant.catalog on a generated catalog tree.
+
+    python benchmarks/catalog.py --catalogs 20 --collections 100 -j 1 8
+
+The tree is a root Catalog with ``--catalogs`` sub-catalogs (nested
+``--depth`` levels deep), each holding ``--collections`` copies of the bundled
+STAC Collection under their own ids, linked with relative ``child``/``parent``
+/``root`` hrefs as in a self-contained static catalog. It is walked and
+converted once per worker count; the number of collections converted, the
+time taken and whether the outputs match the first run are printed.
+"""
+
+import argparse
+import copy
+import filecmp
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.synthetic import load_fixture  # noqa: E402
+from geocroissant.catalog import convert_catalog  # noqa: E402
+
+
+def _write(path, document):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f)
+
+
+def _catalog(catalog_id, links):
+    return {"type": "Catalog", "stac_version": "1.0.0", "id": catalog_id,
+            "description": f"Generated catalog {catalog_id}", "links": links}
+
+
+def write_catalog_tree(directory, catalogs, collections, depth=1):
+    """Write the tree below ``directory`` and return the path of its root ``catalog.json``."""
+    template = load_fixture("stac-collection")
+    kept_links = [link for link in template.get("links", []) if link.get("rel") not in ("root", "parent", "self")]
+
+    def child_link(href):
+        return {"rel": "child", "href": href, "type": "application/json"}
+
+    def up_links(from_dir):
+        root_href = os.path.relpath(os.path.join(directory, "catalog.json"), from_dir)
+        return [{"rel": "root", "href": root_href, "type": "application/json"},
+                {"rel": "parent", "href": "../catalog.json", "type": "application/json"}]
+
+    def write_subtree(catalog_dir, c, level):
+        links = up_links(catalog_dir)
+        if level < depth - 1:
+            write_subtree(os.path.join(catalog_dir, "sub"), c, level + 1)
+            links.append(child_link("./sub/catalog.json"))
+        else:
+            for i in range(collections):
+                collection_dir = os.path.join(catalog_dir, f"collection_{i}")
+                collection = copy.deepcopy(template)
+                collection["id"] = f"{template['id']}-{c}-{i}"
+                collection["links"] = up_links(collection_dir) + kept_links
+                _write(os.path.join(collection_dir, "collection.json"), collection)
+                links.append(child_link(f"./collection_{i}/collection.json"))
+        _write(os.path.join(catalog_dir, "catalog.json"), _catalog(f"catalog-{c}-{level}", links))
+
+    root_links = [{"rel": "root", "href": "./catalog.json", "type": "application/json"}]
+    for c in range(catalogs):
+        write_subtree(os.path.join(directory, f"catalog_{c}"), c, 0)
+        root_links.append(child_link(f"./catalog_{c}/catalog.json"))
+    root_path = os.path.join(directory, "catalog.json")
+    _write(root_path, _catalog("root", root_links))
+    return root_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark static catalog conversion.")
+    parser.add_argument("--catalogs", type=int, default=10, help="Sub-catalogs below the root")
+    parser.add_argument("--collections", type=int, default=100, help="Collections per sub-catalog")
+    parser.add_argument("--depth", type=int, default=1, help="Catalog levels above each group of collections")
+    parser.add_argument("-j", "--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="Worker counts to compare")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_catalog_tree(os.path.join(tmp, "catalog"), args.catalogs, args.collections, args.depth)
+        expected = args.catalogs * args.collections
+        print(f"{expected} collections in {args.catalogs} catalogs, depth {args.depth}")
+        print(f"{'workers':>7} {'converted':>9} {'failed':>6} {'seconds':>8} {'per sec':>8} {'same':>5}")
+        reference = None
+        for workers in args.workers:
+            output_dir = os.path.join(tmp, f"out_{workers}")
+            index, failures, elapsed = convert_catalog(root, output_dir, workers=workers)
+            urls = sorted(entry["url"] for entry in index["dataset"])
+            if reference is None:
+                reference = (output_dir, urls)
+            same = urls == reference[1] and all(
+                filecmp.cmp(os.path.join(reference[0], url), os.path.join(output_dir, url), shallow=False)
+                for url in urls
+            )
+            print(f"{workers:>7} {len(urls):>9} {len(failures):>6} {elapsed:8.2f} "
+                  f"{len(urls) / max(elapsed, 1e-9):8.1f} {str(same):>5}")
+            for path, error in failures[:3]:
+                print(f"  FAILED {path}\n{error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare two benchmark result files.
+
+    python benchmarks/compare.py results/<old>.json results/<new>.json --threshold 0.10
+
+Prints the relative change of wall time, peak RSS and output size for every
+case present in both files and exits with status 1 if any of them grew by
+more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ("wall_seconds", "peak_rss_bytes", "output_bytes")
+
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data, {
+        (r["case"], r["size"]): r for r in data["results"] if "skipped" not in r and "error" not in r
+    }
+
+
+def compare(old, new, threshold, metrics=METRICS):
+    """Yield ``(case, size, metric, old, new, change, regressed)`` for the cases both runs measured."""
+    for key in sorted(old.keys() & new.keys()):
+        for metric in metrics:
+            before, after = old[key][metric], new[key][metric]
+            change = (after - before) / before if before else 0.0
+            yield key[0], key[1], metric, before, after, change, change > threshold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("old", help="Baseline results")
+    parser.add_argument("new", help="Results to check")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative growth (default 0.10)")
+    parser.add_argument("--metrics", nargs="+", default=list(METRICS), choices=METRICS)
+    args = parser.parse_args(argv)
+
+    old_data, old = load_results(args.old)
+    new_data, new = load_results(args.new)
+    print(f"{old_data['commit'][:12]} -> {new_data['commit'][:12]}")
+
+    regressions = 0
+    for case, size, metric, before, after, change, regressed in compare(old, new, args.threshold, args.metrics):
+        regressions += regressed
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{case:<38} {size:>8} {metric:<15} {before:>14.6g} {after:>14.6g} {change:+8.1%}{marker}")
+
+    missing = sorted(old.keys() - new.keys())
+    for case, size in missing:
+        print(f"{case:<38} {size:>8} missing from {args.new}")
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
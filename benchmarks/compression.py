@@ -0,0 +1,99 @@
+"""
+Size and time of gzip and Zstandard levels on the bundled documents.
+
+    python benchmarks/compression.py --levels gz:1,6,9 zst:1,3,9,19 --repeat 5
+
+Every document is written through geocroissant.compression at each level and
+read back: JSON documents are parsed with ``reader.load_json``, Turtle is
+only decompressed. The compressed size, the ratio to the plain file and the
+write and read times (best of ``--repeat``, in milliseconds) are printed, the
+plain file first as the baseline.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import compression, reader  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DOCUMENTS = [
+    "GeoCroissant to GeoDCAT/geodcat.jsonld",
+    "GeoCroissant to GeoDCAT/geodcat.ttl",
+    "Datacube to GeoCroissant/NASA_POWER_2021_07_croissant.json",
+]
+
+DEFAULT_LEVELS = ["gz:1,6,9", "zst:1,3,9,19"]
+
+
+def parse_levels(values):
+    """``["gz:1,6", "zst:3"]`` -> ``[("gz", 1), ("gz", 6), ("zst", 3)]``."""
+    cases = []
+    for value in values:
+        suffix, _, levels = value.partition(":")
+        if f".{suffix}" not in compression.CODECS:
+            raise ValueError(f"Unknown codec suffix {suffix!r}; expected gz or zst")
+        cases.extend((suffix, int(level)) for level in levels.split(",") if level)
+    return cases
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def measure(data, path, level, repeat, parse):
+    def write():
+        with compression.open_file(path, "wb", level=level) as f:
+            f.write(data)
+
+    def read():
+        if parse:
+            reader.load_json(path)
+        else:
+            with compression.open_file(path, "rb") as f:
+                while f.read(1 << 20):
+                    pass
+
+    write_ms = best_of(repeat, write)
+    read_ms = best_of(repeat, read)
+    return os.path.getsize(path), write_ms, read_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark compressed output and input.")
+    parser.add_argument("--levels", nargs="+", default=DEFAULT_LEVELS, metavar="CODEC:L1,L2",
+                        help="Codecs (gz, zst) and levels to compare")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+    cases = parse_levels(args.levels)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for document in DOCUMENTS:
+            with open(os.path.join(REPO_ROOT, document), "rb") as f:
+                data = f.read()
+            name = os.path.basename(document)
+            parse = not name.endswith(".ttl")
+            print(f"\n{name} ({len(data) / 1e6:.2f} MB, read {'parses JSON' if parse else 'decompresses'})")
+            print(f"{'codec':<8} {'level':>5} {'bytes':>10} {'ratio':>6} {'write ms':>9} {'read ms':>8}")
+            plain = os.path.join(tmp, name)
+            size, write_ms, read_ms = measure(data, plain, None, args.repeat, parse)
+            print(f"{'plain':<8} {'-':>5} {size:>10} {1:>6.1f} {write_ms:>9.1f} {read_ms:>8.1f}")
+            for suffix, level in cases:
+                path = f"{plain}.{suffix}"
+                size, write_ms, read_ms = measure(data, path, level, args.repeat, parse)
+                print(f"{compression.CODECS['.' + suffix]:<8} {level:>5} {size:>10} {len(data) / size:>6.1f} "
+                      f"{write_ms:>9.1f} {read_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
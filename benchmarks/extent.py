@@ -0,0 +1,149 @@
+"""
+Extent aggregation: geocroissant.extent against the per-item Python code it replaced.
+
+    python benchmarks/extent.py -n 1000000
+
+Features are built from the bundled Time-Series ItemCollection, with shifted
+bboxes and datetimes spread over several years, either all ``...Z`` or a mix
+of ``Z``, fractional and ``+hh:mm`` forms (``--offsets``). Each function is timed on the same inputs (best of
+``--repeat``) and the results are printed side by side; the legacy time range
+differs whenever the string order and the instant order disagree.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.synthetic import load_fixture  # noqa: E402
+from geocroissant.extent import ExtentAccumulator, bbox_union, time_range  # noqa: E402
+
+# Datetime suffixes cycled through: all UTC as most STAC APIs return them, or
+# mostly UTC with some fractional seconds and explicit offsets
+OFFSETS = {
+    "utc": ["Z"],
+    "mixed": ["Z"] * 6 + [".500000Z", "+02:00", "-07:00", "+00:00"],
+}
+
+
+# The implementations in "GeoCroissant Time-Series Support/convertor.py" before geocroissant.extent
+def legacy_bbox_union(bboxes):
+    minx = min(b[0] for b in bboxes)
+    miny = min(b[1] for b in bboxes)
+    maxx = max(b[2] for b in bboxes)
+    maxy = max(b[3] for b in bboxes)
+    return [minx, miny, maxx, maxy]
+
+
+def legacy_time_range(times):
+    times = [t for t in times if t]
+    if not times:
+        return None, None
+    times = sorted(times)
+    return times[0], times[-1]
+
+
+class LegacyExtentAccumulator:
+    def __init__(self):
+        self.bbox = None
+        self.has_times = False
+        self.start = None
+        self.end = None
+
+    def add(self, feat):
+        bbox = feat.get("bbox")
+        if bbox:
+            if self.bbox is None:
+                self.bbox = [bbox[0], bbox[1], bbox[2], bbox[3]]
+            else:
+                self.bbox = [
+                    min(self.bbox[0], bbox[0]),
+                    min(self.bbox[1], bbox[1]),
+                    max(self.bbox[2], bbox[2]),
+                    max(self.bbox[3], bbox[3])
+                ]
+        props = feat.get("properties", {})
+        if "start_datetime" in props and "end_datetime" in props:
+            times = props["start_datetime"], props["end_datetime"]
+        elif "datetime" in props:
+            times = props["datetime"], props["datetime"]
+        else:
+            return
+        self.has_times = True
+        for t in times:
+            if not t:
+                continue
+            if self.start is None or t < self.start:
+                self.start = t
+            if self.end is None or t > self.end:
+                self.end = t
+
+
+def synthetic_features(n, offsets="mixed"):
+    """``n`` minimal STAC items: a bbox and start/end datetimes each."""
+    suffixes = OFFSETS[offsets]
+    templates = [f["bbox"] for f in load_fixture("stac-itemcollection")["features"]]
+    features = []
+    for i in range(n):
+        west, south, east, north = templates[i % len(templates)]
+        shift = (i % 97) * 0.5 - 24
+        year = 2000 + i % 25
+        day = 1 + i % 28
+        features.append({
+            "bbox": [west + shift, south - shift / 4, east + shift, north - shift / 4],
+            "properties": {
+                "start_datetime": f"{year}-{1 + i % 12:02d}-{day:02d}T{i % 24:02d}:00:00{suffixes[i % len(suffixes)]}",
+                "end_datetime": f"{year}-{1 + i % 12:02d}-{day:02d}T{i % 24:02d}:59:59{suffixes[(i + 3) % len(suffixes)]}",
+            },
+        })
+    return features
+
+
+def best_of(repeat, fn):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def accumulate(accumulator_class, features):
+    extent = accumulator_class()
+    for feat in features:
+        extent.add(feat)
+    return extent.bbox, (extent.start, extent.end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extent aggregation.")
+    parser.add_argument("-n", type=int, default=1_000_000, help="Number of features")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--offsets", choices=sorted(OFFSETS), default="mixed", help="Datetime forms to generate")
+    args = parser.parse_args(argv)
+
+    features = synthetic_features(args.n, args.offsets)
+    bboxes = [f["bbox"] for f in features]
+    times = [f["properties"]["start_datetime"] for f in features] + \
+            [f["properties"]["end_datetime"] for f in features]
+
+    cases = [
+        ("bbox union", lambda: legacy_bbox_union(bboxes), lambda: bbox_union(bboxes)),
+        ("time range", lambda: legacy_time_range(times), lambda: time_range(times)),
+        ("streaming accumulator", lambda: accumulate(LegacyExtentAccumulator, features),
+         lambda: accumulate(ExtentAccumulator, features)),
+    ]
+    print(f"{args.n} features, {args.offsets} datetimes")
+    print(f"{'case':<24} {'legacy s':>9} {'extent s':>9} {'speedup':>8}")
+    for name, legacy, current in cases:
+        legacy_seconds, legacy_result = best_of(args.repeat, legacy)
+        seconds, result = best_of(args.repeat, current)
+        print(f"{name:<24} {legacy_seconds:9.3f} {seconds:9.3f} {legacy_seconds / seconds:7.1f}x")
+        if result != legacy_result:
+            print(f"  legacy: {legacy_result}\n  extent: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Import-time budget for the converter scripts.
+
+    python benchmarks/import_budget.py --budget-ms 150
+
+Loads each converter script in a fresh ``python -X importtime`` interpreter
+and checks that
+
+* no script pulls in a heavy backend (pystac, rdflib, pytdml, xarray, ...)
+  just by being imported; they are imported on first use, and
+* the pure-JSON converters and the ``geocroissant`` CLI import within the
+  budget.
+
+Exits with status 1 if any check fails; tests/test_import_budget.py runs the
+same checks under pytest.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("pystac", "rdflib", "pytdml", "xarray", "pandas", "numpy", "ceda_datapoint")
+
+# Converters that only read and write JSON; these are held to the time budget
+PURE_JSON_SCRIPTS = ("stac_to_geocroissant", "convertor", "geocroissant_converter")
+
+# Scripts outside the converter registry, probed by path
+EXTRA_SCRIPTS = {
+    "DynamicCroissantConverter": "Datacube to GeoCroissant/DynamicCroissantConverter.py",
+    "T2MCroissantConverter": "Datacube to GeoCroissant/T2MCroissantConverter.py",
+    "ceda": "CEDA UK to GeoCroissant Support/ceda.py",
+}
+
+DEFAULT_BUDGET_MS = 150.0
+
+_LOAD_PATH = (
+    "import importlib.util, os; "
+    "spec = importlib.util.spec_from_file_location({name!r}, os.path.join({root!r}, {path!r})); "
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+)
+
+_PROBE = """
+import json, sys
+sys.path.insert(0, {root!r})
+{statement}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def measure(statement):
+    """Run ``statement`` in a fresh interpreter; return ``(import_ms, modules)``.
+
+    ``import_ms`` is the cumulative time of the top-level imports reported by
+    ``-X importtime``; modules imported during interpreter startup are not
+    counted because they are already loaded when the statement runs.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(root=REPO_ROOT, statement=statement)],
+        capture_output=True, text=True, check=True
+    )
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):  # top level, not nested in another import
+            total_us += int(cumulative)
+    return total_us / 1000, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def probes():
+    """``(name, statement)`` importing the CLI and every converter script."""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    from geocroissant.converters import SCRIPTS
+
+    statements = [("geocroissant.cli", "import geocroissant.cli")]
+    statements += [
+        (name, f"from geocroissant.converters import load_script; load_script({name!r})")
+        for name in SCRIPTS
+    ]
+    statements += [
+        (name, _LOAD_PATH.format(name=name, root=REPO_ROOT, path=path))
+        for name, path in EXTRA_SCRIPTS.items()
+    ]
+    return statements
+
+
+def held_to_budget(name):
+    return name in PURE_JSON_SCRIPTS or name == "geocroissant.cli"
+
+
+def heavy_imports(modules):
+    """Heavy backends among the imported ``modules``."""
+    return sorted({m.split(".")[0] for m in modules} & set(HEAVY_MODULES))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the converters' cold-start import cost.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Allowed import time of each pure-JSON converter and of the CLI")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name, statement in probes():
+        try:
+            import_ms, modules = measure(statement)
+        except subprocess.CalledProcessError as e:
+            print(f"FAIL {name:<28} import failed: {e.stderr.strip().splitlines()[-1]}")
+            failures += 1
+            continue
+        heavy = heavy_imports(modules)
+        over_budget = held_to_budget(name) and import_ms > args.budget_ms
+        ok = not heavy and not over_budget
+        failures += not ok
+        detail = f"{import_ms:7.1f} ms"
+        if heavy:
+            detail += f"  imports {', '.join(heavy)} eagerly"
+        if over_budget:
+            detail += f"  over the {args.budget_ms:.0f} ms budget"
+        print(f"{'ok  ' if ok else 'FAIL'} {name:<28} {detail}")
+
+    print(f"{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Load and dump time of every installed JSON backend on the bundled documents.
+
+    python benchmarks/json_backends.py --repeat 20
+
+Each document is parsed with ``jsonio.loads`` and written back with
+``jsonio.dumps`` (pretty and compact) under every backend; the best of
+``--repeat`` runs is reported in milliseconds.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import jsonio  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DOCUMENTS = [
+    "GeoCroissant to GeoDCAT/geodcat.jsonld",
+    "GeoCroissant to GeoDCAT/croissant.json",
+    "Datacube to GeoCroissant/NASA_POWER_2021_07_croissant.json",
+    "GeoCroissant Time-Series Support/stac.json",
+    "NASA-UMM to GeoCroissant/nasa_ummg_h.json",
+    "STAC to GeoCroissant/stac.json",
+]
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the JSON backends on the bundled documents.")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+
+    backends = []
+    for name in jsonio.BACKENDS:
+        try:
+            jsonio.set_backend(name)
+            backends.append(name)
+        except ImportError:
+            pass
+
+    print(f"{'document':<58} {'backend':<8} {'load ms':>9} {'pretty ms':>10} {'compact ms':>11}")
+    for relative in DOCUMENTS:
+        with open(os.path.join(REPO_ROOT, relative), "rb") as f:
+            data = f.read()
+        label = f"{relative} ({len(data) / 1e6:.2f} MB)"
+        for name in backends:
+            jsonio.set_backend(name)
+            document = jsonio.loads(data)
+            load = best_of(args.repeat, lambda: jsonio.loads(data))
+            pretty = best_of(args.repeat, lambda: jsonio.dumps(document))
+            compact = best_of(args.repeat, lambda: jsonio.dumps(document, pretty=False))
+            print(f"{label:<58} {name:<8} {load * 1e3:9.2f} {pretty * 1e3:10.2f} {compact * 1e3:11.2f}")
+    jsonio.set_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Image/annotation pairing of a geocr:fileListing by join key.
+
+    python benchmarks/pairing.py -n 1000000 --repeat 3
+
+First the bundled listings are paired and checked: every pair must be the
+same scene or sample on both sides, and the orphans are printed (the
+Landslide4Sense train split lists 5 annotations twice). Then a synthetic HLS
+listing of ``-n`` images is shuffled, one mask in a hundred is dropped, and
+``pair_listing`` is timed against pairing by list position, the way the TDML
+converter used to; the share of wrong pairs of the latter is reported. Exits
+with status 1 if a bundled pair is wrong.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.synthetic import REPO_ROOT  # noqa: E402
+from geocroissant.pairing import join_keys, pair_listing  # noqa: E402
+from geocroissant.reader import load_json  # noqa: E402
+
+DOCUMENTS = [
+    "GeoCroissant to STAC/croissant.json",
+    "GeoCroissant HuggingFace/ibm-nasa-geospatial-hls_burn_scars.json",
+    "Landslide4Sense-HDF5/Landslide4Sense.json",
+]
+
+
+def synthetic_listing(n, rng):
+    images, masks = [], []
+    for i in range(n):
+        scene = f"HLS.S30.T{10 + i % 10}S{'ABCDEFGH'[i % 8]}H.{2015 + i % 9}{1 + i % 365:03d}.v{i // 3650}.4"
+        images.append(f"training/subsetted_512x512_{scene}_merged.tif")
+        if i % 100 != 99:
+            masks.append(f"training/subsetted_512x512_{scene}.mask.tif")
+    rng.shuffle(images)
+    rng.shuffle(masks)
+    return {"images": {"train": images}, "annotations": {"train": masks}}
+
+
+def pair_by_position(listing):
+    pairs = []
+    for split, images in listing["images"].items():
+        annotations = listing["annotations"].get(split, [])
+        pairs.extend(zip(images, annotations))
+    return pairs
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark image/annotation pairing.")
+    parser.add_argument("-n", type=int, default=1_000_000, help="Images in the synthetic listing")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+
+    wrong = 0
+    for document in DOCUMENTS:
+        listing = load_json(os.path.join(REPO_ROOT, document))["geocr:fileListing"]
+        pairing = pair_listing(listing)
+        mismatched = sum(a != b for a, b in zip(join_keys(pairing.images), join_keys(pairing.annotations)))
+        wrong += mismatched
+        images = sum(len(v) for v in listing["images"].values())
+        print(f"{document}: {len(pairing)}/{images} images paired, {mismatched} wrong")
+        for line in pairing.report():
+            print(f"  {line}")
+
+    listing = synthetic_listing(args.n, random.Random(0))
+    pairing = pair_listing(listing)
+    by_position = pair_by_position(listing)
+    misplaced = sum(a != b for a, b in zip(join_keys([i for i, _ in by_position]),
+                                           join_keys([m for _, m in by_position])))
+    print(f"\nsynthetic: {args.n} images, {len(pairing)} paired by key, "
+          f"{misplaced}/{len(by_position)} wrong by position")
+    print(f"{'method':<14} {'files/s':>12}")
+    files = args.n + len(listing["annotations"]["train"])
+    for name, fn in (("pair_listing", lambda: pair_listing(listing)),
+                     ("by position", lambda: pair_by_position(listing))):
+        print(f"{name:<14} {files / best_of(args.repeat, fn):>12,.0f}")
+
+    if wrong:
+        print(f"\n{wrong} wrong pair(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Benchmark every converter direction on synthetic scale-ups of the bundled fixtures.
+
+    python benchmarks/run.py --sizes 1000 10000 100000
+    python benchmarks/run.py --sizes 1000 --cases umm-g croissant-to-stac
+    python benchmarks/run.py --json-backend json   # stdlib baseline
+
+Each (conversion, fixture, size) case runs in a fresh interpreter so that
+peak RSS belongs to that conversion alone. Wall time, CPU time, peak RSS and
+output size are written as JSON to
+``benchmarks/results/<commit>-<json backend>.json`` for comparison across
+commits (or backends) with ``benchmarks/compare.py``.
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.synthetic import write_fixture  # noqa: E402
+from geocroissant import jsonio  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# (conversion source type, fixture it reads)
+CASES = [
+    ("stac-collection", "stac-collection"),
+    ("stac-itemcollection", "stac-itemcollection"),
+    ("umm-g", "umm-g"),
+    ("ogc-tdml", "ogc-tdml"),
+    ("croissant-to-stac", "hls"),
+    ("croissant-to-stac", "landslide4sense"),
+    ("croissant-to-geodcat", "hls"),
+    ("croissant-to-geodcat", "landslide4sense"),
+    ("croissant-to-tdml", "hls"),
+]
+
+# Conversion source type -> converter script it needs, loaded with its dependencies before timing starts
+CASE_SCRIPTS = {
+    "stac-collection": "stac_to_geocroissant",
+    "stac-itemcollection": "convertor",
+    "umm-g": "geocroissant_converter",
+    "ogc-tdml": "ogc_tdml_to_geocroissant",
+    "croissant-to-stac": "geocroissant_to_stac",
+    "croissant-to-geodcat": "geocroissant_to_geodcat",
+    "croissant-to-tdml": "geocroissant_to_ogc_tdml",
+}
+
+DEFAULT_SIZES = [1000, 10000]
+
+
+def peak_rss_bytes():
+    # ru_maxrss survives fork+exec on Linux, so a child would report the
+    # parent's peak if that was higher; VmHWM belongs to this process image.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+
+def run_child(source_type, input_path, output_dir):
+    """Convert one input inside this process and print the measurements as JSON."""
+    from geocroissant.converters import CONVERSIONS, warm_script
+
+    convert, suffix = CONVERSIONS[source_type]
+    start = time.perf_counter()
+    try:
+        warm_script(CASE_SCRIPTS[source_type])
+    except ImportError as e:
+        print(json.dumps({"skipped": f"{type(e).__name__}: {e}"}))
+        return
+    import_seconds = time.perf_counter() - start
+    rss_before = peak_rss_bytes()
+
+    output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(input_path))[0] + suffix)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        convert(input_path, output_path)
+    cpu_seconds = time.process_time() - cpu_start
+    wall_seconds = time.perf_counter() - wall_start
+
+    print(json.dumps({
+        "import_seconds": import_seconds,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "rss_before_bytes": rss_before,
+        "output_bytes": sum(entry.stat().st_size for entry in os.scandir(output_dir) if entry.is_file()),
+    }))
+
+
+def run_case(source_type, fixture, size, work_dir, timeout=None, env=None):
+    input_path = write_fixture(fixture, size, work_dir)
+    result = {
+        "case": f"{source_type}:{fixture}",
+        "source_type": source_type,
+        "fixture": fixture,
+        "size": size,
+        "input_bytes": os.path.getsize(input_path),
+    }
+    with tempfile.TemporaryDirectory(dir=work_dir) as output_dir:
+        try:
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", source_type, input_path, output_dir],
+                capture_output=True, text=True, timeout=timeout, env=env
+            )
+        except subprocess.TimeoutExpired:
+            result["error"] = f"timed out after {timeout}s"
+            return result
+    if proc.returncode != 0:
+        result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        return result
+    result.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def format_row(result):
+    label = f"{result['case']:<38} {result['size']:>8}"
+    if "skipped" in result:
+        return f"{label}  skipped ({result['skipped']})"
+    if "error" in result:
+        return f"{label}  FAILED ({result['error']})"
+    return (f"{label}  {result['wall_seconds']:8.3f}s  "
+            f"{result['peak_rss_bytes'] / 1e6:8.1f} MB RSS  {result['output_bytes'] / 1e6:8.2f} MB out")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GeoCroissant converters.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Number of repeated entries per synthetic input")
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Only run cases whose conversion or 'conversion:fixture' name is listed")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Results file (default: results/<commit>-<json backend>.json)")
+    parser.add_argument("--work-dir", default=None, help="Keep generated inputs here instead of a temp dir")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-case timeout in seconds")
+    parser.add_argument("--json-backend", choices=jsonio.BACKENDS, default=None,
+                        help="JSON backend for the converters (default: fastest installed)")
+    parser.add_argument("--child", nargs=3, metavar=("SOURCE_TYPE", "INPUT", "OUTPUT_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(*args.child)
+        return 0
+
+    cases = [
+        (source_type, fixture) for source_type, fixture in CASES
+        if args.cases is None or source_type in args.cases or f"{source_type}:{fixture}" in args.cases
+    ]
+    env = dict(os.environ)
+    if args.json_backend:
+        env["GEOCROISSANT_JSON_BACKEND"] = args.json_backend
+    json_backend = jsonio.set_backend(args.json_backend) if args.json_backend else jsonio.BACKEND
+    commit = git_commit()
+    results = []
+    with contextlib.ExitStack() as stack:
+        work_dir = args.work_dir or stack.enter_context(tempfile.TemporaryDirectory(prefix="geocroissant-bench-"))
+        os.makedirs(work_dir, exist_ok=True)
+        for size in args.sizes:
+            for source_type, fixture in cases:
+                result = run_case(source_type, fixture, size, work_dir, args.timeout, env)
+                print(format_row(result), flush=True)
+                results.append(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit[:12]}-{json_backend}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": json_backend,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Scene-name parsing: geocroissant.scenes against splitting each name.
+
+    python benchmarks/scenes.py -n 1000000 --repeat 3
+
+``-n`` synthetic paths are generated per scheme (HLS, Sentinel-2,
+Landslide4Sense), with one in a hundred not matching. Each scheme is parsed
+with ``parse_scenes`` (with NumPy, and with the pure-Python date decoding),
+and HLS and Sentinel-2 also the way converters used to: ``split`` on every
+name and a ``datetime`` per date. The datetimes of both ways are compared
+first and any mismatch makes the script exit with status 1; then paths/sec
+(best of ``--repeat``) are printed.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocroissant import scenes  # noqa: E402
+
+
+def hls_paths(n, rng):
+    paths = []
+    for i in range(n):
+        if i % 100 == 99:
+            paths.append(f"training/README_{i}.txt")
+            continue
+        sensor = "S30" if i % 2 else "L30"
+        tile = f"{rng.randint(10, 19)}{rng.choice('STU')}{rng.choice('ABCDEFG')}{rng.choice('GHJKLMN')}"
+        paths.append(f"training/subsetted_512x512_HLS.{sensor}.T{tile}.{rng.randint(2015, 2024)}"
+                     f"{rng.randint(1, 365):03d}.v1.4_merged.tif")
+    return paths
+
+
+def sentinel2_paths(n, rng):
+    paths = []
+    for i in range(n):
+        if i % 100 == 99:
+            paths.append(f"tiles/manifest_{i}.xml")
+            continue
+        stamp = f"{rng.randint(2016, 2024)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}T" \
+                f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}"
+        paths.append(f"S2B_MSIL2A_{stamp}_N0500_R013_T10SEG_{stamp}.SAFE/B04.jp2")
+    return paths
+
+
+def landslide_paths(n, rng):
+    return [f"images/train/image_{i}.h5" if i % 100 != 99 else f"images/train/notes_{i}.txt" for i in range(n)]
+
+
+def split_hls(paths):
+    # What converters did: split the name on dots, then decode year + day of year
+    values = []
+    for path in paths:
+        parts = path.split("/")[-1].split(".")
+        if len(parts) >= 6 and parts[0].endswith("HLS"):
+            date = parts[3]
+            values.append(datetime(int(date[:4]), 1, 1) + timedelta(days=int(date[4:]) - 1))
+        else:
+            values.append(None)
+    return values
+
+
+def split_sentinel2(paths):
+    values = []
+    for path in paths:
+        parts = path.split("/")[0].split("_")
+        if len(parts) >= 6 and parts[0].startswith("S2"):
+            values.append(datetime.strptime(parts[2], "%Y%m%dT%H%M%S"))
+        else:
+            values.append(None)
+    return values
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_without_numpy(paths, scheme):
+    saved, scenes._np = scenes._np, False
+    try:
+        return scenes.parse_scenes(paths, scheme)
+    finally:
+        scenes._np = saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bulk scene-name parsing.")
+    parser.add_argument("-n", type=int, default=1_000_000, help="Paths per scheme")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+    rng = random.Random(0)
+    cases = [
+        ("hls", hls_paths(args.n, rng), split_hls),
+        ("sentinel2", sentinel2_paths(args.n, rng), split_sentinel2),
+        ("landslide4sense", landslide_paths(args.n, rng), None),
+    ]
+
+    mismatches = 0
+    for scheme, paths, split in cases:
+        if split is None:
+            continue
+        sample = paths[:20000]
+        expected = [value.strftime("%Y-%m-%dT%H:%M:%SZ") if value else None for value in split(sample)]
+        for label, table in (("numpy", scenes.parse_scenes(sample, scheme)),
+                             ("python", parse_without_numpy(sample, scheme))):
+            got = scenes.format_datetimes(table["datetime"])
+            wrong = sum(a != b for a, b in zip(expected, got))
+            if wrong:
+                print(f"{scheme} ({label}): {wrong} datetime(s) differ from splitting the names")
+            mismatches += wrong
+
+    print(f"{'scheme':<16} {'method':<22} {'paths/s':>12}")
+    for scheme, paths, split in cases:
+        methods = [("parse_scenes", lambda: scenes.parse_scenes(paths, scheme)),
+                   ("parse_scenes, no numpy", lambda: parse_without_numpy(paths, scheme))]
+        if split is not None:
+            methods.append(("split per name", lambda: split(paths)))
+        for name, fn in methods:
+            seconds = best_of(args.repeat, fn)
+            print(f"{scheme:<16} {name:<22} {len(paths) / seconds:>12,.0f}")
+
+    if mismatches:
+        print(f"\n{mismatches} mismatch(es)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
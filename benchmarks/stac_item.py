@@ -0,0 +1,138 @@
+"""
+Croissant -> STAC Item: the dict-native emitter against the pystac path.
+
+    python benchmarks/stac_item.py -n 2000
+
+Every bundled GeoCroissant document, plus variants exercising the branches
+the fixtures do not (a DOI with a data collection, file sizes and checksums,
+a null ``dataCollection``, no ``citeAs``), is converted both ways. The
+returned dicts and the written files must be identical byte for byte; any
+mismatch is printed and makes the script exit with status 1 (the same check
+runs under pytest in tests/test_stac_item.py). Then ``-n``
+Items are emitted from light documents (no file listing, ids varying) and
+from the HLS document with its 804 embedded records, and Items/sec of both
+paths are reported.
+"""
+
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.synthetic import REPO_ROOT, load_fixture  # noqa: E402
+from geocroissant.converters import load_script  # noqa: E402
+from geocroissant.reader import load_json  # noqa: E402
+
+DOCUMENTS = [
+    "GeoCroissant to STAC/croissant.json",
+    "GeoCroissant to GeoDCAT/croissant.json",
+    "Landslide4Sense-HDF5/Landslide4Sense.json",
+    "Datacube to GeoCroissant/NASA_POWER_2021_07_croissant.json",
+    "Datacube to GeoCroissant/T2M_2020_croissant.json",
+]
+
+
+def variants():
+    """(name, document) pairs covering the branches of croissant_to_stac_item."""
+    cases = [(os.path.basename(os.path.dirname(path)) + "/" + os.path.basename(path),
+              load_json(os.path.join(REPO_ROOT, path))) for path in DOCUMENTS]
+    hls = load_fixture("hls")
+
+    doi = copy.deepcopy(hls)
+    doi["doi"] = "10.57967/hf/0956"
+    doi["dataCollection"] = {"name": "HLS", "description": "Burn scars.", "collectionMethod": "Chips",
+                             "collectionSites": [{"name": "MTBS"}]}
+    cases.append(("hls+doi+dataCollection", doi))
+
+    files = copy.deepcopy(hls)
+    files["distribution"].append({"@id": "Scene Archive", "contentUrl": "https://example.org/scenes.parquet",
+                                  "fileSize": 1234, "md5": "abc", "description": None})
+    files["distribution"].append({"name": "labels", "contentUrl": "https://example.org/labels.csv"})
+    cases.append(("hls+fileSize+md5", files))
+
+    bare = copy.deepcopy(hls)
+    bare["dataCollection"] = None
+    bare.pop("citeAs", None)
+    bare.pop("url", None)
+    bare["doi"] = "  "
+    cases.append(("hls-no-dataCollection-citeAs-url", bare))
+    return cases
+
+
+def light_documents(n):
+    """``n`` small documents: the HLS metadata without its file listing, one id each."""
+    base = load_fixture("hls")
+    base.pop("geocr:fileListing", None)
+    documents = []
+    for i in range(n):
+        document = dict(base)
+        document["name"] = f"{base['name']}-{i}"
+        documents.append(document)
+    return documents
+
+
+def items_per_second(convert, documents, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in documents:
+            convert(document)
+        best = min(best, time.perf_counter() - start)
+    return len(documents) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dict-native Croissant -> STAC Item emitter.")
+    parser.add_argument("-n", type=int, default=2000, help="Items emitted per throughput measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+    module = load_script("geocroissant_to_stac")
+
+    def quiet(fn, *a, **kw):
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                return fn(*a, **kw)
+            finally:
+                sys.stdout = stdout
+
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'document':<48} {'dict':>5} {'file':>5}")
+        for name, document in variants():
+            reference = module.croissant_to_stac_item(copy.deepcopy(document), use_pystac=True)
+            emitted = module.croissant_to_stac_item(copy.deepcopy(document))
+            same_dict = (module.stac_json_bytes(reference) == module.stac_json_bytes(emitted)
+                         and reference == emitted)
+            pystac_path = os.path.join(tmp, "pystac.json")
+            dict_path = os.path.join(tmp, "dict.json")
+            quiet(module.croissant_to_stac_item, copy.deepcopy(document), output_path=pystac_path, use_pystac=True)
+            quiet(module.croissant_to_stac_item, copy.deepcopy(document), output_path=dict_path)
+            with open(pystac_path, "rb") as a, open(dict_path, "rb") as b:
+                same_file = a.read() == b.read()
+            mismatches += (not same_dict) + (not same_file)
+            print(f"{name:<48} {str(same_dict):>5} {str(same_file):>5}")
+
+    print(f"\n{'case':<36} {'pystac/s':>9} {'dict/s':>9} {'speedup':>8}")
+    cases = [
+        (f"{args.n} light documents", light_documents(args.n)),
+        ("HLS with 804 records, x20", [load_fixture("hls")] * 20),
+    ]
+    for name, documents in cases:
+        pystac_rate = items_per_second(lambda d: module.croissant_to_stac_item(d, use_pystac=True),
+                                       documents, args.repeat)
+        dict_rate = items_per_second(module.croissant_to_stac_item, documents, args.repeat)
+        print(f"{name:<36} {pystac_rate:9.0f} {dict_rate:9.0f} {dict_rate / pystac_rate:7.1f}x")
+
+    if mismatches:
+        print(f"\n{mismatches} mismatch(es) between the pystac and dict-native outputs")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
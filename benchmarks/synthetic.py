@@ -0,0 +1,131 @@
+"""
+Synthetic scale-up of the sample documents bundled with the converters.
+
+Each generator takes one of the real fixtures and replicates its repeating
+part (features, assets, related URLs, file listings, training data) to ``n``
+entries, keeping everything else as in the original document.
+"""
+
+import copy
+import json
+import os
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIXTURES = {
+    "stac-collection": "STAC to GeoCroissant/stac.json",
+    "stac-itemcollection": "GeoCroissant Time-Series Support/stac.json",
+    "umm-g": "NASA-UMM to GeoCroissant/nasa_ummg_h.json",
+    "hls": "GeoCroissant to STAC/croissant.json",
+    "landslide4sense": "Landslide4Sense-HDF5/Landslide4Sense.json",
+    "ogc-tdml": "OGC-TDML to GeoCroissant Support/OGC-TDML to GeoCroissant/ogc-tdml.json",
+}
+
+
+def load_fixture(name):
+    with open(os.path.join(REPO_ROOT, FIXTURES[name])) as f:
+        return json.load(f)
+
+
+def _cycle(items, n):
+    """Yield ``(i, copy of items[i % len(items)])`` for ``i`` in ``range(n)``."""
+    for i in range(n):
+        yield i, copy.deepcopy(items[i % len(items)])
+
+
+def scale_stac_collection(n):
+    """STAC Collection with ``n`` collection assets and ``n`` item_assets."""
+    stac = load_fixture("stac-collection")
+    assets = list(stac.get("assets", {}).values()) or [{"href": "https://example.org/asset.json"}]
+    item_assets = list(stac.get("item_assets", {}).values()) or [{"type": "image/tiff"}]
+    stac["assets"] = {}
+    for i, asset in _cycle(assets, n):
+        asset["href"] = f"{asset.get('href', '')}?copy={i}"
+        stac["assets"][f"asset_{i}"] = asset
+    stac["item_assets"] = {f"band_{i}": asset for i, asset in _cycle(item_assets, n)}
+    return stac
+
+
+def scale_itemcollection(n):
+    """STAC ItemCollection with ``n`` features."""
+    stac = load_fixture("stac-itemcollection")
+    features = stac["features"]
+    stac["features"] = []
+    for i, feat in _cycle(features, n):
+        feat["id"] = f"{feat['id']}_{i}"
+        stac["features"].append(feat)
+    stac["numberReturned"] = n
+    return stac
+
+
+def scale_ummg(n):
+    """UMM-G granule with ``n`` RelatedUrls."""
+    granule = load_fixture("umm-g")
+    urls = granule["umm"].get("RelatedUrls", [])
+    granule["umm"]["RelatedUrls"] = [
+        dict(url, URL=url["URL"].replace(".tif", f".{i}.tif").replace(".jpg", f".{i}.jpg"))
+        for i, url in _cycle(urls, n)
+    ]
+    return granule
+
+
+def scale_file_listing(name, n):
+    """GeoCroissant document (``hls`` or ``landslide4sense``) listing ``n`` image and ``n`` annotation files."""
+    croissant = load_fixture(name)
+    listing = croissant["geocr:fileListing"]
+    for kind in ("images", "annotations"):
+        splits = listing[kind]
+        split_names = list(splits)
+        originals = {split: splits[split] for split in split_names}
+        per_split = [n // len(split_names)] * len(split_names)
+        per_split[0] += n - sum(per_split)
+        for split, count in zip(split_names, per_split):
+            files = originals[split]
+            splits[split] = [_copy_name(files[i % len(files)], i // len(files)) for i in range(count)]
+    return croissant
+
+
+def _copy_name(path, copy_index):
+    """Unique name for the ``copy_index``-th replica of a listed file that still pairs with its annotation."""
+    if copy_index == 0:
+        return path
+    head, sep, tail = path.rpartition("/")
+    numbered = re.fullmatch(r"(.*_)(\d+)(\.[^.]+)", tail)  # Landslide4Sense: image_12.h5 / mask_12.h5
+    if numbered:
+        tail = f"{numbered.group(1)}{int(numbered.group(2)) + copy_index * 1000000}{numbered.group(3)}"
+    else:
+        tail = f"copy{copy_index}_{tail}"
+    return head + sep + tail
+
+
+def scale_tdml(n):
+    """OGC-TDML training dataset with ``n`` training data entries."""
+    tdml = load_fixture("ogc-tdml")
+    data = tdml["data"]
+    tdml["data"] = []
+    for i, entry in _cycle(data, n):
+        entry["id"] = f"{entry.get('id', 'data')}_{i}"
+        tdml["data"].append(entry)
+    tdml["amountOfTrainingData"] = n
+    return tdml
+
+
+# Fixture name -> generator of a document with n repeated entries
+GENERATORS = {
+    "stac-collection": scale_stac_collection,
+    "stac-itemcollection": scale_itemcollection,
+    "umm-g": scale_ummg,
+    "hls": lambda n: scale_file_listing("hls", n),
+    "landslide4sense": lambda n: scale_file_listing("landslide4sense", n),
+    "ogc-tdml": scale_tdml,
+}
+
+
+def write_fixture(name, n, directory):
+    """Write the scaled fixture to ``directory`` once and return its path."""
+    path = os.path.join(directory, f"{name}_{n}.json")
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            json.dump(GENERATORS[name](n), f)
+    return path
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the GeoCroissant converter scripts.
+
+The converters themselves live next to their sample documents in the
+per-format folders; this package holds the pieces they have in common.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from geocroissant.cli import main
+
+sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Constant-time lookup of the FileObjects of each record's assets.
+
+GeoCroissant documents converted from STAC give every asset a FileObject in
+``distribution`` with the ``@id`` ``"{item id}/{asset key}"``, and every record
+an ``assetFiles`` field mapping its asset keys to those ``@id``s:
+
+    index = AssetIndex.load("croissant.json")
+    for record in index.records():
+        url = index.content_url(record["id"], "cog")
+
+The index is built in one pass over ``distribution`` and the records, instead
+of scanning ``distribution`` for every record and asset. Documents written
+before ``assetFiles`` existed are indexed from the ``assets`` field and the
+``@id`` convention, or from the ``@id``s alone when they have no records.
+"""
+
+from geocroissant.reader import load_json
+
+
+class AssetIndex:
+    """Item id -> {asset key -> FileObject} of a GeoCroissant document."""
+
+    def __init__(self, croissant, record_set=0):
+        self.croissant = croissant
+        self.file_objects = {fo.get("@id"): fo for fo in croissant.get("distribution", [])}
+        record_sets = croissant.get("recordSet") or []
+        self.record_set = record_sets[record_set] if record_sets else {}
+        # Field @id -> name, so records read with short keys ("id", "assets", ...)
+        self._names = {f.get("@id"): f.get("name") for f in self.record_set.get("field", [])}
+        self._items = {}
+        for record in self.records():
+            item_id = record.get("id")
+            if item_id is None:
+                continue
+            asset_files = record.get("assetFiles")
+            if asset_files is None:
+                asset_files = {key: f"{item_id}/{key}" for key in record.get("assets") or []}
+            self._items[item_id] = {
+                key: self.file_objects[file_id] for key, file_id in asset_files.items()
+                if file_id in self.file_objects
+            }
+        if not self._items:
+            for file_id, file_object in self.file_objects.items():
+                item_id, sep, key = (file_id or "").rpartition("/")
+                if sep and file_object.get("@type") == "cr:FileObject":
+                    self._items.setdefault(item_id, {})[key] = file_object
+
+    @classmethod
+    def load(cls, path, record_set=0):
+        return cls(load_json(path), record_set)
+
+    def records(self):
+        """Yield the inline records with field names as keys."""
+        names = self._names
+        for row in self.record_set.get("data", []):
+            yield {names.get(k, k): v for k, v in row.items()}
+
+    def assets(self, item_id):
+        """Asset key -> FileObject of an item (empty for an unknown item)."""
+        return self._items.get(item_id, {})
+
+    def get_asset(self, item_id, key):
+        """FileObject of one asset of an item, or ``None``."""
+        return self._items.get(item_id, {}).get(key)
+
+    def content_url(self, item_id, key):
+        """``contentUrl`` of one asset of an item, or ``None``."""
+        file_object = self.get_asset(item_id, key)
+        return file_object.get("contentUrl") if file_object is not None else None
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,210 @@
+"""
+Parallel conversion of a static STAC catalog tree.
+
+    python -m geocroissant catalog catalog/catalog.json -o out/ -j 16
+
+Starting from the root Catalog (or Collection), every ``rel="child"`` link is
+resolved relative to the document that holds it and followed, so nested
+catalogs of any depth are reached. Each document is parsed exactly once, in a
+worker process, which also converts it with ``stac_to_geocroissant`` when it
+is a Collection and returns the hrefs of its children; the walk schedules
+those as soon as they come back, so reading, parsing and converting all run
+in parallel across the tree. Remote (``http(s)://``) children are skipped.
+
+Outputs mirror the catalog layout below the output directory
+(``a/b/collection.json`` -> ``a/b/collection_geocroissant.json``), and
+``catalog_index.json`` lists every converted Collection with its extents, the
+catalog it belongs to and the path of its GeoCroissant document.
+"""
+
+import contextlib
+import hashlib
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from urllib.parse import unquote, urlsplit
+
+from geocroissant import compression, jsonio, profiling, reader
+from geocroissant.converters import configure_cache, convert_stac_collection
+
+INDEX_NAME = "catalog_index.json"
+OUTPUT_SUFFIX = "_geocroissant.json"
+
+# Links followed when walking the tree
+CHILD_RELS = {"child"}
+
+# Batches scheduled per worker at most, so results keep streaming back
+PENDING_PER_WORKER = 4
+
+# Documents handed to a worker at a time, at most
+MAX_BATCH = 64
+
+
+def resolve_href(href, base_path):
+    """Absolute local path of ``href`` as seen from the document at ``base_path``, or ``None`` if remote."""
+    parts = urlsplit(href)
+    if parts.scheme in ("http", "https"):
+        return None
+    if parts.scheme == "file":
+        return os.path.normpath(unquote(parts.path))
+    path = unquote(parts.path) if parts.scheme == "" else href
+    return os.path.normpath(os.path.join(os.path.dirname(base_path), path))
+
+
+def output_path_for(path, root_dir, output_dir, compress=None):
+    """Mirror ``path`` below ``output_dir``; documents outside the root's directory go under ``_external``.
+
+    ``compress`` (``"gz"``, ``"zst"``) is appended to the output name.
+    """
+    relative = os.path.relpath(path, root_dir)
+    if relative.startswith(os.pardir):
+        digest = hashlib.sha256(os.path.dirname(path).encode()).hexdigest()[:12]
+        relative = os.path.join("_external", digest, os.path.basename(path))
+    stem = compression.splitext(relative)[0]
+    name = stem + OUTPUT_SUFFIX + (f".{compress}" if compress else "")
+    return os.path.normpath(os.path.join(output_dir, name))
+
+
+def _visit(task):
+    """Parse one catalog document in a worker and convert it if it is a Collection; never raises."""
+    path, root_dir, output_dir, verbose, compress = task
+    try:
+        document = reader.load_json(path)
+        children = [
+            child for child in (
+                resolve_href(link["href"], path) for link in document.get("links", [])
+                if link.get("rel") in CHILD_RELS and link.get("href")
+            )
+            if child is not None
+        ]
+        node = {"path": path, "id": document.get("id"), "type": document.get("type"),
+                "title": document.get("title"), "children": children}
+        if document.get("type") == "Collection":
+            output_path = output_path_for(path, root_dir, output_dir, compress)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with profiling.stage("conversion", source_type="stac-collection", input=path):
+                if verbose:
+                    hit = convert_stac_collection(path, output_path, stac_dict=document)
+                else:
+                    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                        hit = convert_stac_collection(path, output_path, stac_dict=document)
+            node["output"] = output_path
+            node["cache_hit"] = bool(hit)
+            extent = document.get("extent", {})
+            bbox = extent.get("spatial", {}).get("bbox")
+            interval = extent.get("temporal", {}).get("interval")
+            if bbox:
+                node["bbox"] = bbox[0]
+            if interval and interval[0]:
+                node["interval"] = interval[0]
+        return node, None
+    except Exception:
+        return {"path": path, "children": []}, traceback.format_exc()
+
+
+def _visit_batch(tasks):
+    return [_visit(task) for task in tasks]
+
+
+def build_index(root, nodes, output_dir):
+    """The ``sc:DataCatalog`` listing every converted Collection of the walk."""
+    parents = {}
+    for node in nodes.values():
+        for child in node["children"]:
+            parents.setdefault(child, node)
+    catalogs = []
+    datasets = []
+    for path in sorted(nodes):
+        node = nodes[path]
+        parent = parents.get(path)
+        entry = {"@id": node.get("id"), "name": node.get("title") or node.get("id"),
+                 "source": os.path.relpath(path, os.path.dirname(root))}
+        if parent is not None:
+            entry["isPartOf"] = {"@id": parent.get("id")}
+        if "output" not in node:
+            if path != root and node.get("type") == "Catalog":
+                catalogs.append({"@type": "sc:DataCatalog", **entry})
+            continue
+        entry = {"@type": "sc:Dataset", **entry,
+                 "url": os.path.relpath(node["output"], output_dir),
+                 "encodingFormat": "application/ld+json"}
+        if "bbox" in node:
+            entry["geocr:BoundingBox"] = node["bbox"]
+        if "interval" in node:
+            entry["geocr:temporalExtent"] = {"startDate": node["interval"][0], "endDate": node["interval"][1]}
+        datasets.append(entry)
+
+    root_node = nodes.get(root, {})
+    index = {
+        "@context": {
+            "@vocab": "https://schema.org/",
+            "sc": "https://schema.org/",
+            "geocr": "http://mlcommons.org/croissant/geocr/"
+        },
+        "@type": "sc:DataCatalog",
+        "@id": root_node.get("id"),
+        "name": root_node.get("title") or root_node.get("id"),
+        "dataset": datasets
+    }
+    if catalogs:
+        index["hasPart"] = catalogs
+    return index
+
+
+def convert_catalog(root_path, output_dir, workers=None, verbose=False, cache_dir=None, cache_max_bytes=None,
+                    compress=None):
+    """Walk the catalog at ``root_path``, converting every Collection below ``output_dir``.
+
+    Writes ``catalog_index.json`` to ``output_dir`` and returns
+    ``(index, failures, elapsed_seconds)``, where ``failures`` holds one
+    ``(path, traceback)`` pair per document that could not be read or
+    converted; the rest of the tree is still walked. ``compress`` (``"gz"``,
+    ``"zst"``) compresses the converted documents.
+    """
+    root = os.path.normpath(os.path.abspath(root_path))
+    root_dir = os.path.dirname(root)
+    output_dir = os.path.abspath(output_dir)
+    workers = workers or os.cpu_count() or 1
+    nodes = {}
+    failures = []
+    seen = {root}
+    queued = [root]
+
+    def task(path):
+        return path, root_dir, output_dir, verbose, compress
+
+    def collect(node, error):
+        if error is not None:
+            failures.append((node["path"], error))
+            return
+        nodes[node["path"]] = node
+        for child in node["children"]:
+            if child not in seen:
+                seen.add(child)
+                queued.append(child)
+
+    start = time.perf_counter()
+    if workers == 1:
+        configure_cache(cache_dir, cache_max_bytes)
+        while queued:
+            collect(*_visit(task(queued.pop())))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=configure_cache,
+                                 initargs=(cache_dir, cache_max_bytes)) as pool:
+            running = set()
+            while queued or running:
+                while queued and len(running) < workers * PENDING_PER_WORKER:
+                    # Batches shrink as the queue does, so the last documents still spread over the workers
+                    size = max(1, min(MAX_BATCH, len(queued) // (workers * PENDING_PER_WORKER)))
+                    batch = [task(queued.pop()) for _ in range(size)]
+                    running.add(pool.submit(_visit_batch, batch))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for node, error in future.result():
+                        collect(node, error)
+
+    index = build_index(root, nodes, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    jsonio.dump(index, os.path.join(output_dir, INDEX_NAME))
+    return index, failures, time.perf_counter() - start
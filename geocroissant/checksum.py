@@ -0,0 +1,217 @@
+"""
+Checksums for local files referenced from GeoCroissant ``contentUrl``s.
+
+md5 and sha256 are computed together in one pass over each file with large
+unbuffered reads; many files are hashed concurrently on a thread pool
+(hashlib releases the GIL while hashing). Results are kept in a persistent
+SQLite cache keyed by (path, size, mtime), so unchanged files are never read
+twice. The cache is shared by concurrent conversions (one database in WAL
+mode); when it stays locked past ``CACHE_TIMEOUT`` a lookup counts as a miss
+and the results are not stored, and the conversion goes on.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from geocroissant.profiling import stage
+
+# Values the converters used to emit instead of real checksums
+PLACEHOLDER_CHECKSUMS = {
+    "placeholder_hash",
+    "placeholder_hash_for_directory",
+    "d41d8cd98f00b204e9800998ecf8427e",  # md5 of the empty string
+}
+
+DEFAULT_BUFFER_SIZE = 8 * 1024 * 1024
+DEFAULT_CACHE_PATH = os.environ.get(
+    "GEOCROISSANT_CHECKSUM_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "geocroissant", "checksums.sqlite"),
+)
+# Seconds to wait for another process's write to the cache
+CACHE_TIMEOUT = 30.0
+
+
+def hash_file(path, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Return ``{"md5": ..., "sha256": ...}`` for a file, reading it once."""
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            chunk = view[:n]
+            md5.update(chunk)
+            sha256.update(chunk)
+    return {"md5": md5.hexdigest(), "sha256": sha256.hexdigest()}
+
+
+def local_path(content_url, base_dir=None):
+    """Resolve a ``contentUrl`` to an existing local file, or ``None`` for remote or missing files."""
+    if not content_url:
+        return None
+    parsed = urlparse(content_url)
+    if parsed.scheme == "file":
+        path = url2pathname(parsed.path)
+    elif len(parsed.scheme) > 1:  # http(s), s3, gs, ...; a single letter is a Windows drive
+        return None
+    else:
+        path = content_url
+    if base_dir and not os.path.isabs(path):
+        path = os.path.join(base_dir, path)
+    return path if os.path.isfile(path) else None
+
+
+class ChecksumCache:
+    """Persistent map of (path, size, mtime) to checksums, stored in SQLite.
+
+    The database is opened on first use, so creating a cache costs nothing
+    when no local files are hashed.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, timeout=CACHE_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            try:
+                # Readers and the writer of concurrent conversions do not block each other
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS checksums ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, md5 TEXT, sha256 TEXT)"
+                )
+            except sqlite3.OperationalError:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def get(self, path, size, mtime_ns):
+        """Cached checksums of a file, or ``None`` if unknown or the cache is locked."""
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT md5, sha256 FROM checksums WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    (path, size, mtime_ns),
+                ).fetchone()
+            except sqlite3.OperationalError:  # "database is locked"; hash the file instead
+                return None
+        if row is None:
+            return None
+        return {"md5": row[0], "sha256": row[1]}
+
+    def put_many(self, entries):
+        """Store ``(path, size, mtime_ns, digests)`` tuples in one transaction; skipped if the cache is locked."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?)",
+                        [(p, s, m, d["md5"], d["sha256"]) for p, s, m, d in entries],
+                    )
+            except sqlite3.OperationalError:
+                pass
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ChecksumEngine:
+    """Concurrent, cached md5/sha256 computation for local files."""
+
+    def __init__(self, cache=None, workers=8, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.cache = cache
+        self.workers = workers
+        self.buffer_size = buffer_size
+
+    def hash_files(self, paths):
+        """Return ``{path: {"md5": ..., "sha256": ...}}`` for the given local files."""
+        results = {}
+        pending = []
+        for path in dict.fromkeys(paths):
+            abs_path = os.path.abspath(path)
+            stat = os.stat(abs_path)
+            cached = self.cache.get(abs_path, stat.st_size, stat.st_mtime_ns) if self.cache else None
+            if cached is not None:
+                results[path] = cached
+            else:
+                pending.append((path, abs_path, stat.st_size, stat.st_mtime_ns))
+
+        if pending:
+            if len(pending) == 1 or self.workers <= 1:
+                digests = [hash_file(p[1], self.buffer_size) for p in pending]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                    digests = list(pool.map(lambda p: hash_file(p[1], self.buffer_size), pending))
+            for (path, _, _, _), digest in zip(pending, digests):
+                results[path] = digest
+            if self.cache:
+                self.cache.put_many(
+                    [(abs_path, size, mtime_ns, digest)
+                     for (_, abs_path, size, mtime_ns), digest in zip(pending, digests)]
+                )
+        return results
+
+    def hash_file(self, path):
+        return self.hash_files([path])[path]
+
+    def fill(self, file_objects, base_dir=None, algorithms=("md5", "sha256")):
+        """Set real checksums on FileObjects whose ``contentUrl`` is a local file.
+
+        Existing checksums are kept unless they are one of the known
+        placeholders. Remote and missing files are left untouched. Returns the
+        number of FileObjects updated.
+        """
+        targets = []
+        for file_object in file_objects:
+            if file_object.get("@type") != "cr:FileObject":
+                continue
+            if not any(file_object.get(a) in (None, *PLACEHOLDER_CHECKSUMS) for a in algorithms):
+                continue
+            path = local_path(file_object.get("contentUrl"), base_dir)
+            if path is not None:
+                targets.append((file_object, path))
+        if not targets:
+            return 0
+
+        digests = self.hash_files([path for _, path in targets])
+        for file_object, path in targets:
+            for algorithm in algorithms:
+                if file_object.get(algorithm) in (None, *PLACEHOLDER_CHECKSUMS):
+                    file_object[algorithm] = digests[path][algorithm]
+        return len(targets)
+
+
+_default_engine = None
+
+
+def default_engine():
+    """Process-wide engine backed by the persistent cache at ``DEFAULT_CACHE_PATH``."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = ChecksumEngine(cache=ChecksumCache())
+    return _default_engine
+
+
+def fill_checksums(file_objects, base_dir=None, engine=None):
+    """Replace placeholder checksums of local FileObjects using ``engine`` (or the default one)."""
+    with stage("fill_checksums"):
+        return (engine or default_engine()).fill(file_objects, base_dir=base_dir)
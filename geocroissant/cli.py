@@ -0,0 +1,283 @@
+"""
+Command line entry point: batch conversion and the conversion server.
+
+    python -m geocroissant convert umm-g "granules/*.json" -o out/ -j 16
+    python -m geocroissant convert umm-g granules/ --pattern "*.json.gz" --compress zst -o out/
+    python -m geocroissant serve -j 4          # see geocroissant.server
+    python -m geocroissant harvest URL -o x.json   # see geocroissant.harvester
+    python -m geocroissant catalog catalog.json -o out/ -j 16   # see geocroissant.catalog
+    python -m geocroissant materialize croissant.json /data -o records.parquet   # see geocroissant.fileset
+
+Inputs (files, directories or glob patterns) are expanded and sorted, then
+converted on a process pool. A failing input is reported and skipped without
+affecting the others; results are printed in input order. Inputs and outputs
+ending in ``.gz`` or ``.zst`` are decompressed and compressed transparently
+(see geocroissant.compression).
+"""
+
+import argparse
+import contextlib
+import glob
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from geocroissant import compression, profiling
+from geocroissant.converters import CONVERSIONS, UNCOMPRESSED_OUTPUTS, configure_cache
+
+
+def expand_inputs(inputs, pattern="*.json", recursive=False):
+    """Expand files, directories and glob patterns into a sorted, de-duplicated list of files."""
+    paths = set()
+    for entry in inputs:
+        if os.path.isdir(entry):
+            dir_pattern = os.path.join(entry, "**", pattern) if recursive else os.path.join(entry, pattern)
+            paths.update(glob.glob(dir_pattern, recursive=recursive))
+        elif glob.has_magic(entry):
+            paths.update(glob.glob(entry, recursive=True))
+        else:
+            paths.add(entry)
+    return sorted(p for p in paths if os.path.isfile(p))
+
+
+def output_paths_for(input_paths, output_dir, suffix, compress=None):
+    """Mirror the inputs' directory layout below ``output_dir`` so equal file names cannot collide.
+
+    ``compress`` (``"gz"``, ``"zst"``) is appended to every output name.
+    """
+    if not input_paths:
+        return []
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in input_paths])
+    outputs = []
+    for path in input_paths:
+        relative_dir = os.path.relpath(os.path.dirname(os.path.abspath(path)), base)
+        stem = compression.splitext(os.path.basename(path))[0]
+        name = stem + suffix + (f".{compress}" if compress else "")
+        outputs.append(os.path.normpath(os.path.join(output_dir, relative_dir, name)))
+    return outputs
+
+
+def _convert_one(task):
+    """Run one conversion in a worker; never raises so one bad file cannot stop the batch."""
+    source_type, input_path, output_path, verbose = task
+    convert, _ = CONVERSIONS[source_type]
+    try:
+        size = os.path.getsize(input_path)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with profiling.stage("conversion", source_type=source_type, input=input_path, input_bytes=size):
+            if verbose:
+                cache_hit = convert(input_path, output_path)
+            else:
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    cache_hit = convert(input_path, output_path)
+        return input_path, output_path, size, None, bool(cache_hit)
+    except Exception:
+        error = traceback.format_exc()
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        return input_path, output_path, 0, error, False
+
+
+def run_batch(source_type, input_paths, output_dir, workers=None, chunksize=None, verbose=False,
+              cache_dir=None, cache_max_bytes=None, compress=None):
+    """Convert ``input_paths`` and return ``(results, elapsed_seconds)``.
+
+    ``results`` holds one ``(input, output, input_bytes, error, cache_hit)``
+    tuple per input, in the same order as ``input_paths``.
+    """
+    _, suffix = CONVERSIONS[source_type]
+    outputs = output_paths_for(input_paths, output_dir, suffix, compress)
+    tasks = [
+        (source_type, path, output_path, verbose)
+        for path, output_path in zip(input_paths, outputs)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+
+    start = time.perf_counter()
+    if workers == 1:
+        configure_cache(cache_dir, cache_max_bytes)
+        results = [_convert_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=configure_cache,
+                                 initargs=(cache_dir, cache_max_bytes)) as pool:
+            results = list(pool.map(_convert_one, tasks, chunksize=chunksize))
+    return results, time.perf_counter() - start
+
+
+def print_summary(results, elapsed, cache_enabled=False):
+    failures = [r for r in results if r[3] is not None]
+    converted = len(results) - len(failures)
+    total_mb = sum(r[2] for r in results) / 1e6
+    elapsed = max(elapsed, 1e-9)
+
+    for input_path, _, _, error, _ in failures:
+        print(f"FAILED {input_path}", file=sys.stderr)
+        print(error.rstrip(), file=sys.stderr)
+
+    print(f"Converted {converted}/{len(results)} files ({len(failures)} failed) in {elapsed:.2f}s")
+    print(f"Throughput: {converted / elapsed:.1f} files/sec, {total_mb / elapsed:.2f} MB/sec")
+    if cache_enabled:
+        hits = sum(1 for r in results if r[4])
+        print(f"Conversion cache: {hits} hits, {converted - hits} misses")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="geocroissant", description="GeoCroissant conversion tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="Convert many documents in parallel.")
+    convert.add_argument("source_type", choices=sorted(CONVERSIONS), help="Kind of conversion to run")
+    convert.add_argument("inputs", nargs="+", help="Input files, directories or glob patterns")
+    convert.add_argument("-o", "--output-dir", default=".", help="Directory for converted documents")
+    convert.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    convert.add_argument("--chunksize", type=int, default=None, help="Inputs handed to a worker at a time")
+    convert.add_argument("--pattern", default="*.json", help="File pattern used inside directories")
+    convert.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    convert.add_argument("-v", "--verbose", action="store_true", help="Show the converters' own output")
+    convert.add_argument("--cache-dir", default=None,
+                         help="Reuse results for unchanged inputs from this conversion cache directory")
+    convert.add_argument("--cache-max-mb", type=float, default=None, help="Size bound of the conversion cache")
+    convert.add_argument("--compress", choices=("gz", "zst"), default=None, help="Compress every output (not the TDML conversions)")
+    convert.add_argument("--compression-level", type=int, default=None,
+                         help=f"Level for compressed outputs; same as ${compression.ENV_VAR}")
+    convert.add_argument("--profile", metavar="PATH", default=None,
+                         help=f"Append per-stage timings as JSON lines to PATH ('-' for stderr); same as ${profiling.ENV_VAR}")
+    convert.add_argument("--profile-no-memory", action="store_true",
+                         help="Skip tracemalloc while profiling, for undistorted timings")
+
+    serve = subparsers.add_parser("serve", help="Keep warm converters running and accept jobs over HTTP.")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: localhost only)")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    serve.add_argument("--unix-socket", default=None, help="Listen on this Unix socket instead of TCP")
+    serve.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    serve.add_argument("--max-pending", type=int, default=None,
+                       help="Jobs accepted at once before answering 503 (default: 4 per worker)")
+    serve.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    serve.add_argument("--cache-dir", default=None,
+                       help="Reuse results for unchanged inputs from this conversion cache directory")
+    serve.add_argument("--cache-max-mb", type=float, default=None, help="Size bound of the conversion cache")
+    serve.add_argument("--profile", metavar="PATH", default=None,
+                       help=f"Append per-stage timings as JSON lines to PATH ('-' for stderr); same as ${profiling.ENV_VAR}")
+    serve.add_argument("--profile-no-memory", action="store_true",
+                       help="Skip tracemalloc while profiling, for undistorted timings")
+
+    harvest = subparsers.add_parser("harvest", help="Harvest paginated STAC API searches into one GeoCroissant document.")
+    harvest.add_argument("urls", nargs="+",
+                         help="Item search URLs, or 'POST URL JSON-BODY' for POST searches")
+    harvest.add_argument("-o", "--output", required=True, help="GeoCroissant file to write")
+    harvest.add_argument("--id", default=None, help="Dataset id (default: the items' collection)")
+    harvest.add_argument("--title", default=None, help="Dataset title")
+    harvest.add_argument("--concurrency", type=int, default=4, help="HTTP requests in flight at once")
+    harvest.add_argument("--max-retries", type=int, default=5, help="Retries per page on 429/5xx and connection errors")
+    harvest.add_argument("--max-pages", type=int, default=None, help="Stop each search after this many pages")
+    harvest.add_argument("--base-dir", default=None, help="Directory local asset hrefs are relative to")
+    harvest.add_argument("--compression-level", type=int, default=None,
+                         help=f"Level when the output ends in .gz or .zst; same as ${compression.ENV_VAR}")
+    harvest.add_argument("--profile", metavar="PATH", default=None,
+                         help=f"Append per-stage timings as JSON lines to PATH ('-' for stderr); same as ${profiling.ENV_VAR}")
+    harvest.add_argument("--profile-no-memory", action="store_true",
+                         help="Skip tracemalloc while profiling, for undistorted timings")
+
+    catalog = subparsers.add_parser("catalog", help="Convert every Collection of a static STAC catalog in parallel.")
+    catalog.add_argument("root", help="Root catalog.json (or collection.json) of the tree")
+    catalog.add_argument("-o", "--output-dir", default=".", help="Directory for converted documents and the index")
+    catalog.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    catalog.add_argument("-v", "--verbose", action="store_true", help="Show the converters' own output")
+    catalog.add_argument("--cache-dir", default=None,
+                         help="Reuse results for unchanged inputs from this conversion cache directory")
+    catalog.add_argument("--cache-max-mb", type=float, default=None, help="Size bound of the conversion cache")
+    catalog.add_argument("--compress", choices=("gz", "zst"), default=None, help="Compress every output")
+    catalog.add_argument("--compression-level", type=int, default=None,
+                         help=f"Level for compressed outputs; same as ${compression.ENV_VAR}")
+    catalog.add_argument("--profile", metavar="PATH", default=None,
+                         help=f"Append per-stage timings as JSON lines to PATH ('-' for stderr); same as ${profiling.ENV_VAR}")
+    catalog.add_argument("--profile-no-memory", action="store_true",
+                         help="Skip tracemalloc while profiling, for undistorted timings")
+
+    materialize = subparsers.add_parser("materialize", help="List the records of a FileSet-backed RecordSet.")
+    materialize.add_argument("croissant", help="GeoCroissant document declaring the FileSet")
+    materialize.add_argument("root", help="Directory the FileSet's globs are relative to")
+    materialize.add_argument("-o", "--output", required=True, help="Parquet file to write the records to")
+    materialize.add_argument("--record-set", default=None, help="@id of the RecordSet (default: the first reading a FileSet)")
+    materialize.add_argument("-j", "--workers", type=int, default=16, help="Threads listing directories")
+
+    args = parser.parse_args(argv)
+    cache_max_mb = getattr(args, "cache_max_mb", None)
+    cache_max_bytes = int(cache_max_mb * 1e6) if cache_max_mb is not None else None
+    if getattr(args, "profile", None):
+        profiling.configure(args.profile, memory=not args.profile_no_memory)
+    if getattr(args, "compression_level", None) is not None:
+        # Through the environment so that worker processes pick it up as well
+        os.environ[compression.ENV_VAR] = str(args.compression_level)
+        compression.set_level(args.compression_level)
+
+    if args.command == "serve":
+        from geocroissant.server import serve as run_server
+
+        run_server(
+            host=args.host, port=args.port, unix_socket=args.unix_socket,
+            workers=args.workers, max_pending=args.max_pending,
+            cache_dir=args.cache_dir, cache_max_bytes=cache_max_bytes, verbose=args.verbose
+        )
+        return 0
+
+    if args.command == "harvest":
+        from geocroissant import harvester
+
+        metadata = {k: v for k, v in (("id", args.id), ("title", args.title)) if v is not None}
+        start = time.perf_counter()
+        run = harvester.harvest(
+            [harvester.parse_start(url) for url in args.urls], args.output, metadata=metadata,
+            base_dir=args.base_dir, concurrency=args.concurrency, max_retries=args.max_retries,
+            max_pages=args.max_pages
+        )
+        print(f"Harvested {run.items - run.duplicates} items ({run.duplicates} duplicates skipped) "
+              f"from {run.pages} pages ({run.retries} retries) "
+              f"in {time.perf_counter() - start:.2f}s -> {args.output}")
+        return 0
+
+    if args.command == "materialize":
+        import pyarrow.parquet
+
+        from geocroissant import reader
+        from geocroissant.fileset import materialize as materialize_records
+
+        start = time.perf_counter()
+        table = materialize_records(reader.load_json(args.croissant), args.root,
+                                    record_set=args.record_set, workers=args.workers)
+        pyarrow.parquet.write_table(table, args.output)
+        print(f"Materialized {table.num_rows} records in {time.perf_counter() - start:.2f}s -> {args.output}")
+        return 0
+
+    if args.command == "catalog":
+        from geocroissant.catalog import INDEX_NAME, convert_catalog
+
+        index, failures, elapsed = convert_catalog(
+            args.root, args.output_dir, workers=args.workers, verbose=args.verbose,
+            cache_dir=args.cache_dir, cache_max_bytes=cache_max_bytes, compress=args.compress
+        )
+        for path, error in failures:
+            print(f"FAILED {path}", file=sys.stderr)
+            print(error.rstrip(), file=sys.stderr)
+        print(f"Converted {len(index['dataset'])} collections ({len(failures)} failed) in {elapsed:.2f}s "
+              f"-> {os.path.join(args.output_dir, INDEX_NAME)}")
+        return 1 if failures else 0
+
+    if args.compress and args.source_type in UNCOMPRESSED_OUTPUTS:
+        parser.error(f"--compress is not supported for {args.source_type}: pytdml writes plain files")
+
+    input_paths = expand_inputs(args.inputs, args.pattern, args.recursive)
+    if not input_paths:
+        parser.error("no input files matched")
+
+    results, elapsed = run_batch(
+        args.source_type, input_paths, args.output_dir,
+        workers=args.workers, chunksize=args.chunksize, verbose=args.verbose,
+        cache_dir=args.cache_dir, cache_max_bytes=cache_max_bytes, compress=args.compress
+    )
+    print_summary(results, elapsed, cache_enabled=args.cache_dir is not None)
+    return 1 if any(r[3] is not None for r in results) else 0
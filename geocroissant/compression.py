@@ -0,0 +1,116 @@
+"""
+Transparent gzip and Zstandard compression for the files converters read and write.
+
+    with compression.open_file("croissant.json.zst", "w") as f:
+        f.write(text)
+
+The codec follows the file name: ``.gz`` is gzip, ``.zst`` is Zstandard (the
+``zstandard`` package is required for it) and anything else is a plain file,
+so ``croissant.json.gz``, ``stac.json.zst`` or ``geodcat.ttl.zst`` can be
+passed wherever a converter takes a path. Both codecs stream: data is
+compressed as it is written and decompressed as it is read, one buffer at a
+time, so a streamed document is never held uncompressed in full.
+
+Levels default to 6 for gzip and 3 for Zstandard. They can be changed with
+the ``GEOCROISSANT_COMPRESSION_LEVEL`` environment variable (``19`` for every
+codec, or ``gzip=9,zstd=19``), :func:`set_level`, or the ``level`` argument of
+:func:`open_file`. gzip levels above 9 are written at 9.
+"""
+
+import io
+import os
+
+CODECS = {".gz": "gzip", ".zst": "zstd"}
+
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+ENV_VAR = "GEOCROISSANT_COMPRESSION_LEVEL"
+
+LEVELS = dict(DEFAULT_LEVELS)
+
+
+def set_level(level=None, codec=None):
+    """Set the level of ``codec`` (every codec when ``None``); ``level=None`` restores the default."""
+    for name in ([codec] if codec is not None else list(CODECS.values())):
+        if name not in DEFAULT_LEVELS:
+            raise ValueError(f"Unknown codec {name!r}; expected one of {', '.join(DEFAULT_LEVELS)}")
+        LEVELS[name] = DEFAULT_LEVELS[name] if level is None else int(level)
+    return dict(LEVELS)
+
+
+def _configure_from_env(value):
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        codec, sep, level = part.rpartition("=")
+        set_level(level, codec if sep else None)
+
+
+_configure_from_env(os.environ.get(ENV_VAR, ""))
+
+
+def codec_for(path):
+    """``"gzip"``, ``"zstd"`` or ``None`` for the file name ``path``."""
+    return CODECS.get(os.path.splitext(os.fspath(path))[1].lower())
+
+
+def suffix(path):
+    """The compression suffix of ``path`` (``".gz"``, ``".zst"``) or ``""``."""
+    ext = os.path.splitext(os.fspath(path))[1]
+    return ext if ext.lower() in CODECS else ""
+
+
+def splitext(path):
+    """Like ``os.path.splitext``, keeping a compression suffix with the extension.
+
+    ``"a/b.json.gz"`` -> ``("a/b", ".json.gz")``.
+    """
+    root, ext = os.path.splitext(path)
+    if ext.lower() in CODECS:
+        root, inner = os.path.splitext(root)
+        ext = inner + ext
+    return root, ext
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("Reading or writing .zst files requires zstandard (pip install zstandard)") from e
+    return zstandard
+
+
+def _open_binary(path, codec, writing, level):
+    if codec == "gzip":
+        import gzip
+
+        if not writing:
+            return gzip.GzipFile(path, "rb")
+        # mtime=0 keeps the output byte-identical across runs
+        return gzip.GzipFile(path, "wb", compresslevel=min(level, 9), mtime=0)
+    zstandard = _import_zstandard()
+    raw = open(path, "wb" if writing else "rb")
+    try:
+        if writing:
+            return io.BufferedWriter(zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=True))
+        # Files written by the zstd tool or concatenated may hold several frames
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True,
+                                                                             closefd=True))
+    except BaseException:
+        raw.close()
+        raise
+
+
+def open_file(path, mode="r", level=None, encoding="utf-8"):
+    """Open ``path`` like :func:`open`, compressing or decompressing it according to its suffix.
+
+    ``mode`` is ``"r"``/``"w"`` (text, ``encoding``) or ``"rb"``/``"wb"``;
+    ``level`` overrides the configured level of the codec for this file.
+    """
+    if mode.strip("tb") not in ("r", "w"):
+        raise ValueError(f"Unsupported mode {mode!r}; expected 'r', 'w', 'rb' or 'wb'")
+    binary = "b" in mode
+    codec = codec_for(path)
+    if codec is None:
+        return open(path, mode) if binary else open(path, mode, encoding=encoding)
+    writing = mode.startswith("w")
+    f = _open_binary(path, codec, writing, LEVELS[codec] if level is None else level)
+    return f if binary else io.TextIOWrapper(f, encoding=encoding)
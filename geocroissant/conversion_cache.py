@@ -0,0 +1,165 @@
+"""
+Content-addressed on-disk cache for conversion results.
+
+Entries are keyed by the sha256 of the canonicalized input document (sorted
+keys, compact separators) plus the converter name and version, so an
+unchanged input converted by unchanged code is served from disk without
+running the converter. Converters that checksum local asset files add the
+(path, size, mtime) of each of them to the key (:func:`local_file_stamps`),
+so a changed asset is converted again instead of served with stale checksums. The cache is bounded in bytes and evicts the least
+recently used entries first; recency is the entry file's mtime, which is
+bumped on every hit.
+
+Several processes may share one cache directory. Each keeps its own view of
+the directory, so the size bound is enforced approximately in that case.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+from geocroissant import jsonio
+from geocroissant.checksum import local_path
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def canonical_json(document):
+    """Compact UTF-8 encoding with sorted keys, equal for equal documents."""
+    return jsonio.dumps(document, pretty=False, sort_keys=True)
+
+
+def local_file_stamps(document, base_dir=None, keys=("href",)):
+    """Sorted ``[path, size, mtime_ns]`` of every local file the ``keys`` of ``document`` refer to.
+
+    Values are resolved like checksummed ``contentUrl``s: relative ones
+    against ``base_dir``; remote and missing files are left out.
+    """
+    paths = set()
+    pending = [document]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            for key, child in value.items():
+                if key in keys and isinstance(child, str):
+                    path = local_path(child, base_dir)
+                    if path is not None:
+                        paths.add(os.path.abspath(path))
+                elif isinstance(child, (dict, list)):
+                    pending.append(child)
+        elif isinstance(value, list):
+            pending.extend(child for child in value if isinstance(child, (dict, list)))
+    stamps = []
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stamps.append([path, stat.st_size, stat.st_mtime_ns])
+    return stamps
+
+
+def cache_key(document, converter, version, context=None):
+    """Hash of the canonical input document, the converter name/version and optional extra context."""
+    digest = hashlib.sha256()
+    for part in (converter.encode("utf-8"), version.encode("utf-8"), canonical_json(context)):
+        digest.update(part)
+        digest.update(b"\0")
+    digest.update(canonical_json(document))
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Size-bounded LRU cache of JSON-serializable conversion results."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        found = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime_ns, entry.name[:-5], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key):
+        """Return the cached value for ``key`` or ``None``, updating the counters."""
+        path = self._path(key)
+        try:
+            value = jsonio.load(path)
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(key)
+            self.misses += 1
+            return None
+        if key not in self._entries:
+            self._entries[key] = os.path.getsize(path)
+            self._total_bytes += self._entries[key]
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            jsonio.dump(value, f, pretty=False)
+        os.replace(tmp_path, path)
+
+        self._forget(key)
+        self._entries[key] = os.path.getsize(path)
+        self._total_bytes += self._entries[key]
+        self._evict()
+
+    def get_or_convert(self, document, converter, version, convert, context=None):
+        """Return ``(value, hit)``, calling ``convert()`` and storing its result only on a miss."""
+        key = cache_key(document, converter, version, context)
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = convert()
+        self.put(key, value)
+        return value, False
+
+    def _forget(self, key):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
@@ -0,0 +1,188 @@
+"""
+Registry of the converter scripts and file-to-file wrappers around them.
+
+The converters live in folders whose names are not importable
+("STAC to GeoCroissant/stac_to_geocroissant.py", "ogc-tdml_to_geocroissant.py"),
+so they are loaded by path and cached per process.
+"""
+
+import hashlib
+import importlib.util
+import os
+import sys
+
+from geocroissant import compression, jsonio, profiling, reader
+from geocroissant.conversion_cache import ConversionCache, local_file_stamps
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = {
+    "stac_to_geocroissant": "STAC to GeoCroissant/stac_to_geocroissant.py",
+    "convertor": "GeoCroissant Time-Series Support/convertor.py",
+    "geocroissant_converter": "NASA-UMM to GeoCroissant/geocroissant_converter.py",
+    "ogc_tdml_to_geocroissant": "OGC-TDML to GeoCroissant Support/OGC-TDML to GeoCroissant/ogc-tdml_to_geocroissant.py",
+    "geocroissant_to_stac": "GeoCroissant to STAC/geocroissant_to_stac.py",
+    "geocroissant_to_geodcat": "GeoCroissant to GeoDCAT/geocroissant_to_geodcat.py",
+    "geocroissant_to_ogc_tdml": "OGC-TDML to GeoCroissant Support/GeoCroissant to OGC-TDML/geocroissant_to_ogc-tdml_converter.py",
+}
+
+# Heavy libraries each script imports on first use, for callers that want them loaded up front
+SCRIPT_DEPENDENCIES = {
+    "ogc_tdml_to_geocroissant": ("pytdml.io",),
+    "geocroissant_to_stac": ("pystac", "pystac.extensions.table", "pystac.extensions.scientific"),
+    "geocroissant_to_geodcat": ("rdflib", "rdflib.plugins.serializers.jsonld", "rdflib.plugins.serializers.turtle"),
+    "geocroissant_to_ogc_tdml": ("pytdml.type", "pytdml.io"),
+}
+
+_modules = {}
+_umm_converter = None
+_conversion_cache = None
+
+
+def load_script(name):
+    """Import one of the converter scripts by its registry name."""
+    if name in _modules:
+        return _modules[name]
+    path = os.path.join(REPO_ROOT, SCRIPTS[name])
+    module_name = f"geocroissant_scripts.{name}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    with profiling.stage("load_script", script=name):
+        spec.loader.exec_module(module)
+    _modules[name] = module
+    return module
+
+
+def warm_script(name):
+    """Load a converter script together with the heavy libraries it would otherwise import lazily."""
+    module = load_script(name)
+    for dependency in SCRIPT_DEPENDENCIES.get(name, ()):
+        importlib.import_module(dependency)
+    return module
+
+
+def script_version(name):
+    """Version of a converter for cache keys: a digest of its source file."""
+    with open(os.path.join(REPO_ROOT, SCRIPTS[name]), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def configure_cache(directory, max_bytes=None):
+    """Serve repeated conversions from a ConversionCache in ``directory`` (``None`` disables it)."""
+    global _conversion_cache
+    if directory is None:
+        _conversion_cache = None
+    elif max_bytes is None:
+        _conversion_cache = ConversionCache(directory)
+    else:
+        _conversion_cache = ConversionCache(directory, max_bytes)
+    return _conversion_cache
+
+
+def _cached(name, document, convert, context=None):
+    """Run ``convert()`` through the conversion cache if one is configured; returns ``(value, hit)``.
+
+    ``context`` is extra key material, or a callable returning it (only
+    called when a cache is configured).
+    """
+    if _conversion_cache is None:
+        return convert(), False
+    if callable(context):
+        context = context()
+    with profiling.stage("conversion_cache", converter=name) as cache_stage:
+        value, hit = _conversion_cache.get_or_convert(document, name, script_version(name), convert, context)
+        if profiling.enabled():
+            cache_stage.fields["hit"] = hit
+    return value, hit
+
+
+def convert_stac_collection(input_path, output_path, stac_dict=None):
+    module = load_script("stac_to_geocroissant")
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    # Callers that already parsed the input (the catalog walker) pass it in
+    if stac_dict is None:
+        stac_dict = reader.load_json(input_path)
+    croissant, hit = _cached(
+        "stac_to_geocroissant", stac_dict,
+        lambda: module.stac_to_geocroissant(stac_dict, base_dir=base_dir),
+        context=lambda: {"base_dir": base_dir, "files": local_file_stamps(stac_dict, base_dir)}
+    )
+    jsonio.dump(croissant, output_path)
+    return hit
+
+
+def convert_stac_itemcollection(input_path, output_path):
+    module = load_script("convertor")
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    with compression.open_file(output_path, "w") as f:
+        if reader.ijson is not None:
+            collection = reader.StreamingCollection(input_path)
+            module.write_stac_itemcollection_geocroissant(
+                collection.metadata, f, features=collection, base_dir=base_dir
+            )
+        else:
+            module.write_stac_itemcollection_geocroissant(reader.load_json(input_path), f, base_dir=base_dir)
+
+
+def convert_umm_g(input_path, output_path):
+    global _umm_converter
+    if _umm_converter is None:
+        module = load_script("geocroissant_converter")
+        _umm_converter = module.CompleteNASAUMMGToGeoCroissantConverter()
+    ummg_data = reader.load_json(input_path)
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    croissant, hit = _cached(
+        "geocroissant_converter", ummg_data,
+        lambda: _umm_converter.convert_to_complete_geocroissant(ummg_data, base_dir=base_dir),
+        context=lambda: {"base_dir": base_dir, "files": local_file_stamps(ummg_data, base_dir, keys=("URL",))}
+    )
+    jsonio.dump(croissant, output_path)
+    return hit
+
+
+def convert_ogc_tdml(input_path, output_path):
+    load_script("ogc_tdml_to_geocroissant").tdml_to_geocroissant(input_path, output_path)
+
+
+def convert_croissant_to_stac(input_path, output_path):
+    load_script("geocroissant_to_stac").croissant_to_stac_item(reader.load_json(input_path), output_path=output_path)
+
+
+def convert_croissant_to_geodcat(input_path, output_path):
+    module = load_script("geocroissant_to_geodcat")
+    # x_geodcat.jsonld.zst -> x_geodcat.ttl.zst
+    turtle_file = compression.splitext(output_path)[0] + ".ttl" + compression.suffix(output_path)
+    croissant = reader.load_json(input_path)
+
+    def convert():
+        module.croissant_to_geodcat_jsonld(croissant, output_file=output_path, turtle_file=turtle_file)
+        with compression.open_file(output_path) as jsonld, compression.open_file(turtle_file) as ttl:
+            return {"jsonld": jsonld.read(), "ttl": ttl.read()}
+
+    outputs, hit = _cached("geocroissant_to_geodcat", croissant, convert)
+    if hit:
+        with compression.open_file(output_path, "w") as f:
+            f.write(outputs["jsonld"])
+        with compression.open_file(turtle_file, "w") as f:
+            f.write(outputs["ttl"])
+    return hit
+
+
+def convert_croissant_to_tdml(input_path, output_path):
+    load_script("geocroissant_to_ogc_tdml").convert_geocroissant_to_tdml(input_path, output_path)
+
+
+# Source type -> (conversion function, output file suffix)
+CONVERSIONS = {
+    "stac-collection": (convert_stac_collection, "_geocroissant.json"),
+    "stac-itemcollection": (convert_stac_itemcollection, "_geocroissant.json"),
+    "umm-g": (convert_umm_g, "_geocroissant.json"),
+    "ogc-tdml": (convert_ogc_tdml, "_geocroissant.json"),
+    "croissant-to-stac": (convert_croissant_to_stac, "_stac_item.json"),
+    "croissant-to-geodcat": (convert_croissant_to_geodcat, "_geodcat.jsonld"),
+    "croissant-to-tdml": (convert_croissant_to_tdml, "_tdml.json"),
+}
+
+# Conversions whose outputs are written by pytdml as plain files, which cannot be compressed
+UNCOMPRESSED_OUTPUTS = ("ogc-tdml", "croissant-to-tdml")
@@ -0,0 +1,354 @@
+"""
+Spatial and temporal extent of a set of STAC items.
+
+:class:`ExtentAccumulator` takes items one at a time, buffers their bboxes and
+datetimes, and reduces each full buffer in one pass: with NumPy (bboxes as a
+float array, datetimes parsed once to ``datetime64[us]``) when it is
+installed and the buffer is large enough to pay for the import, with plain
+Python otherwise. Both paths give the same result. Timestamps that all share
+one UTC layout (``...Z`` strings of equal length) are compared as strings
+without parsing.
+
+* Datetimes are compared as instants: ``2020-01-01T01:00:00+02:00`` is earlier
+  than ``2020-01-01T00:00:00Z``, and ``...59.5Z`` is later than ``...59Z``. The
+  extent reports the original strings of the earliest and latest instants;
+  values that do not parse are ignored.
+* A bbox whose west edge is greater than its east edge crosses the
+  antimeridian. When any item crosses it, the longitudes are unioned on the
+  circle and the smallest covering arc is reported, which may itself cross
+  (``west > east``). Otherwise the plain min/max is kept.
+* Six-element (3D) bboxes contribute their horizontal extent.
+
+Reported numbers are the input values themselves, so integer coordinates stay
+integers in the output.
+"""
+
+import warnings
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from operator import itemgetter
+
+CHUNK_SIZE = 65536
+# Buffers shorter than this are reduced in Python, without importing NumPy
+VECTOR_THRESHOLD = 2048
+
+_np = None
+
+
+def _numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:  # optional; the Python reduction is used instead
+            _np = False
+    return _np or None
+
+
+def _split_offset(value):
+    """Split an ISO 8601 string into its local part and UTC offset in minutes."""
+    last = value[-1:]
+    if last in ("Z", "z"):
+        return value[:-1], 0
+    if len(value) > 16 and value[-6] in "+-" and value[-3] == ":":
+        minutes = int(value[-5:-3]) * 60 + int(value[-2:])
+        return value[:-6], -minutes if value[-6] == "-" else minutes
+    if len(value) > 16 and value[-5] in "+-" and value[-4:].isdigit() and value[-8] == ":":
+        minutes = int(value[-4:-2]) * 60 + int(value[-2:])
+        return value[:-5], -minutes if value[-5] == "-" else minutes
+    return value, 0
+
+
+def parse_instant(value):
+    """Naive UTC ``datetime`` of an ISO 8601 string, or ``None`` if it does not parse."""
+    try:
+        local, offset = _split_offset(value)
+        instant = datetime.fromisoformat(local)
+    except (ValueError, TypeError, IndexError):
+        return None
+    if instant.tzinfo is not None:
+        instant = instant.astimezone(timezone.utc).replace(tzinfo=None)
+    return instant - timedelta(minutes=offset)
+
+
+def _reduce_times_python(values):
+    earliest = latest = None
+    for value in values:
+        instant = parse_instant(value)
+        if instant is None:
+            continue
+        if earliest is None or instant < earliest[0]:
+            earliest = (instant, value)
+        if latest is None or instant > latest[0]:
+            latest = (instant, value)
+    return earliest, latest
+
+
+def _reduce_times_uniform(values):
+    """Earliest and latest by string order, or ``None`` unless every value has the same UTC layout.
+
+    Equal-length ``...THH:MM:SS[.f]Z`` strings sort chronologically, which
+    spares parsing the common case of an API returning uniform timestamps.
+    """
+    try:
+        if (len(set(map(len, values))) != 1 or set(map(itemgetter(-1), values)) != {"Z"}
+                or set(map(itemgetter(10), values)) != {"T"}):
+            return None
+    except (TypeError, IndexError):
+        return None
+    first, last = min(values), max(values)
+    earliest, latest = parse_instant(first), parse_instant(last)
+    if earliest is None or latest is None:
+        return None
+    return (earliest, first), (latest, last)
+
+
+def _reduce_times_numpy(np, values):
+    try:
+        # Strip the usual "Z" here; NumPy applies any other UTC offset while parsing
+        local = [v[:-1] if v[-1:] == "Z" else v for v in values]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # "no explicit representation of timezones"
+            instants = np.array(local, dtype="datetime64[us]")
+    except (ValueError, TypeError):
+        # Some value does not parse; fall back to one at a time for this buffer
+        nat = np.datetime64("NaT")
+        instants = np.array(
+            [i if i is not None else nat for i in map(parse_instant, values)], dtype="datetime64[us]"
+        )
+    valid = np.flatnonzero(~np.isnat(instants))
+    if not len(valid):
+        return None, None
+    candidates = instants[valid]
+    first = int(valid[np.argmin(candidates)])
+    last = int(valid[np.argmax(candidates)])
+    return (instants[first].item(), values[first]), (instants[last].item(), values[last])
+
+
+def _arc(west, east):
+    """``(start, unwrapped end, east)`` of the longitude arc from ``west`` eastwards to ``east``."""
+    return (west, east if east >= west else east + 360, east)
+
+
+def _merge_arcs(arcs):
+    """Sort and merge overlapping arcs; the result never holds more arcs than the input."""
+    merged = []
+    for start, end, east in sorted(arcs):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end, east)
+        else:
+            merged.append((start, end, east))
+    return merged
+
+
+def _covering_arc(arcs):
+    """Smallest ``(west, east)`` covering every arc: the complement of the widest gap between them."""
+    merged = _merge_arcs(arcs)
+    # Fold the arcs that the last one reaches across the antimeridian into it
+    while len(merged) > 1 and merged[-1][1] - 360 >= merged[0][0]:
+        start, end, east = merged.pop(0)
+        if end + 360 > merged[-1][1]:
+            merged[-1] = (merged[-1][0], end + 360, east)
+    if any(end - start >= 360 for start, end, _ in merged):
+        return -180, 180
+    widest = None
+    for i, (_, end, east) in enumerate(merged):
+        following = merged[(i + 1) % len(merged)]
+        gap = following[0] + (360 if i == len(merged) - 1 else 0) - end
+        if widest is None or gap > widest[0]:
+            widest = (gap, following[0], east)
+    if widest[0] <= 0:
+        return -180, 180
+    return widest[1], widest[2]
+
+
+class _BBoxUnion:
+    __slots__ = ("south", "north", "arcs", "crossed")
+
+    def __init__(self):
+        self.south = None
+        self.north = None
+        self.arcs = []  # merged longitude arcs of every bbox so far
+        self.crossed = False
+
+    def update(self, south, north, arcs, crossed):
+        if south is not None and (self.south is None or south < self.south):
+            self.south = south
+        if north is not None and (self.north is None or north > self.north):
+            self.north = north
+        self.arcs = _merge_arcs(self.arcs + arcs)
+        self.crossed = self.crossed or crossed
+
+    def result(self):
+        if self.south is None:
+            return None
+        if self.crossed:
+            west, east = _covering_arc(self.arcs)
+        else:
+            # Nothing crosses the antimeridian: the plain min/max
+            west = self.arcs[0][0]
+            east = max(self.arcs, key=itemgetter(1))[2]
+        return [west, self.south, east, self.north]
+
+
+def _horizontal(bbox):
+    if len(bbox) >= 6:
+        return bbox[0], bbox[1], bbox[3], bbox[4]
+    return bbox[0], bbox[1], bbox[2], bbox[3]
+
+
+def _reduce_bboxes_python(bboxes):
+    south = north = None
+    arcs = []
+    crossed = False
+    for bbox in bboxes:
+        west, s, east, n = _horizontal(bbox)
+        if south is None or s < south:
+            south = s
+        if north is None or n > north:
+            north = n
+        crossed = crossed or west > east
+        arcs.append(_arc(west, east))
+    return south, north, _merge_arcs(arcs), crossed
+
+
+def _reduce_bboxes_numpy(np, bboxes):
+    lengths = set(map(len, bboxes))
+    if lengths == {4} or lengths == {6}:
+        width = lengths.pop()
+        values = np.fromiter(chain.from_iterable(bboxes), float, count=width * len(bboxes))
+        values = values.reshape(-1, width)
+        columns = (0, 1, 2, 3) if width == 4 else (0, 1, 3, 4)
+    else:
+        bboxes = [_horizontal(b) for b in bboxes]
+        values = np.array(bboxes, dtype=float)
+        columns = (0, 1, 2, 3)
+    w, s, e, n = columns
+    west, east = values[:, w], values[:, e]
+    crosses = west > east
+
+    # Merge the arcs: sort by west edge, and start a new arc wherever the
+    # next west edge lies beyond every east edge seen so far
+    order = np.argsort(west, kind="stable")
+    starts = west[order]
+    ends = np.where(crosses, east + 360, east)[order]
+    reach = np.maximum.accumulate(ends)
+    first = np.concatenate(([0], np.flatnonzero(starts[1:] > reach[:-1]) + 1))
+    starts_arc = np.zeros(len(order), dtype=np.intp)
+    starts_arc[first] = 1
+    group = np.cumsum(starts_arc) - 1
+    group_end = np.maximum.reduceat(ends, first)
+    # The bbox that reaches furthest in each arc supplies its (original) east edge
+    reaching = np.flatnonzero(ends == group_end[group])
+    _, pick = np.unique(group[reaching], return_index=True)
+    arcs = [
+        (bboxes[order[i]][w], float(end), bboxes[order[j]][e])
+        for i, j, end in zip(first.tolist(), reaching[pick].tolist(), group_end.tolist())
+    ]
+    south = bboxes[int(np.argmin(values[:, s]))][s]
+    north = bboxes[int(np.argmax(values[:, n]))][n]
+    return south, north, arcs, bool(crosses.any())
+
+
+class ExtentAccumulator:
+    """Running bbox union and time range, so features can be consumed one at a time.
+
+    ``bbox``, ``has_times``, ``start`` and ``end`` reflect every feature added
+    so far.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.has_times = False
+        self._bboxes = []
+        self._times = []
+        self._union = _BBoxUnion()
+        self._earliest = None
+        self._latest = None
+
+    def add(self, feat):
+        bbox = feat.get("bbox")
+        if bbox:
+            self._bboxes.append(bbox)
+            # Checked on its own: undated features never fill the time buffer
+            if len(self._bboxes) >= self.chunk_size:
+                self._flush_bboxes()
+        props = feat.get("properties", {})
+        if "start_datetime" in props and "end_datetime" in props:
+            self.has_times = True
+            self._times.append(props["start_datetime"])
+            self._times.append(props["end_datetime"])
+        elif "datetime" in props:
+            self.has_times = True
+            self._times.append(props["datetime"])
+        else:
+            return
+        if len(self._times) >= self.chunk_size:
+            self._flush_times()
+
+    def add_bbox(self, bbox):
+        self._bboxes.append(bbox)
+        if len(self._bboxes) >= self.chunk_size:
+            self._flush_bboxes()
+
+    def add_bboxes(self, bboxes):
+        for start in range(0, len(bboxes), self.chunk_size):
+            self._bboxes.extend(bboxes[start:start + self.chunk_size])
+            self._flush_bboxes()
+
+    def add_times(self, times):
+        for start in range(0, len(times), self.chunk_size):
+            self._times.extend(times[start:start + self.chunk_size])
+            self._flush_times()
+
+    def _flush_bboxes(self):
+        bboxes, self._bboxes = self._bboxes, []
+        if not bboxes:
+            return
+        np = _numpy() if len(bboxes) >= VECTOR_THRESHOLD else None
+        self._union.update(*(_reduce_bboxes_numpy(np, bboxes) if np else _reduce_bboxes_python(bboxes)))
+
+    def _flush_times(self):
+        times, self._times = list(filter(None, self._times)), []
+        if not times:
+            return
+        reduced = _reduce_times_uniform(times)
+        if reduced is None:
+            np = _numpy() if len(times) >= VECTOR_THRESHOLD else None
+            reduced = _reduce_times_numpy(np, times) if np else _reduce_times_python(times)
+        earliest, latest = reduced
+        if earliest is not None and (self._earliest is None or earliest[0] < self._earliest[0]):
+            self._earliest = earliest
+        if latest is not None and (self._latest is None or latest[0] > self._latest[0]):
+            self._latest = latest
+
+    @property
+    def bbox(self):
+        self._flush_bboxes()
+        return self._union.result()
+
+    @property
+    def start(self):
+        self._flush_times()
+        return self._earliest[1] if self._earliest else None
+
+    @property
+    def end(self):
+        self._flush_times()
+        return self._latest[1] if self._latest else None
+
+
+def bbox_union(bboxes):
+    """Union of ``[west, south, east, north]`` (or 3D) bboxes, antimeridian aware."""
+    extent = ExtentAccumulator()
+    extent.add_bboxes(list(bboxes))
+    return extent.bbox
+
+
+def time_range(times):
+    """Earliest and latest of ISO 8601 ``times`` as their original strings, or ``(None, None)``."""
+    extent = ExtentAccumulator()
+    extent.add_times(list(times))
+    return extent.start, extent.end
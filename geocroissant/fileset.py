@@ -0,0 +1,266 @@
+"""
+Materialize the records of a RecordSet whose fields read a ``cr:FileSet``.
+
+    table = materialize(croissant, "/data/hls_burn_scars")
+    table.to_pandas()
+
+A FileSet lists files by ``includes`` (and ``excludes``) globs such as
+``**/*.tif``; each field of the RecordSet takes the ``fullpath`` (or
+``filename``) of a file through a ``transform.regex`` like ``.*_merged\\.tif$``
+or ``(training|validation)/``. Every file matched by the FileSet is a record:
+a field holds the first group its regex captured, the whole path if the
+regex has no groups, and null if it does not match.
+
+The tree is listed by a pool of threads running ``os.scandir`` on one
+directory each, and every path is tested against the globs and all field
+regexes at once: they are compiled into a single pattern of lookaheads, one
+per regex, so a path is scanned by one ``match`` call. Field regexes that
+cannot be combined (inline flags, named groups, backreferences) are matched
+one by one instead. The records are returned as a ``pyarrow.Table`` with one
+string column per field, sorted by path; pyarrow is required.
+"""
+
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Directories listed concurrently by default
+DEFAULT_WORKERS = 16
+
+FILE_PROPERTIES = ("fullpath", "filename")
+
+
+def glob_to_regex(pattern):
+    """Regex source matching the relative ``/``-separated paths selected by a glob (``**`` spans directories)."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Materializing FileSet records requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def scan_tree(root, workers=DEFAULT_WORKERS):
+    """Relative ``/``-separated paths of every file below ``root``, listing directories in parallel."""
+    root = os.path.abspath(root)
+    paths = []
+
+    def scan(directory, prefix):
+        files, subdirs = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, prefix + entry.name + "/"))
+                elif entry.is_file():
+                    files.append(prefix + entry.name)
+        return files, subdirs
+
+    if workers <= 1:
+        pending = [(root, "")]
+        while pending:
+            files, subdirs = scan(*pending.pop())
+            paths.extend(files)
+            pending.extend(subdirs)
+        return paths
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {pool.submit(scan, root, "")}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                paths.extend(files)
+                running.update(pool.submit(scan, *subdir) for subdir in subdirs)
+    return paths
+
+
+def _has_top_level_alternation(pattern):
+    """Whether a regex source has a ``|`` outside any group or character class."""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A "]" right after "[" or "[^" is part of the class
+            if pattern.startswith("]", i + 1):
+                i += 1
+            elif pattern.startswith("^]", i + 1):
+                i += 2
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+# Group references whose numbers or names would change inside the combined pattern
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _combinable(regex):
+    """Whether a field regex keeps its meaning as one lookahead of the combined pattern.
+
+    Inline flags would apply to (or be rejected in) the whole pattern, and
+    named groups and backreferences would clash with or point at the groups
+    of other fields.
+    """
+    return not (regex.flags & ~re.UNICODE or regex.groupindex or _GROUP_REFERENCE.search(regex.pattern))
+
+
+class FileSetMatcher:
+    """The globs of one FileSet and the regexes of the fields reading it, matched together."""
+
+    def __init__(self, fileset, fields):
+        self.fileset = fileset
+        self.names = [field["name"] for field in fields]
+        self.properties = []
+        regexes = []
+        for field in fields:
+            source = field.get("source", {})
+            prop = source.get("extract", {}).get("fileProperty", "fullpath")
+            if prop not in FILE_PROPERTIES:
+                raise ValueError(f"Field {field['name']!r} extracts {prop!r}; only {FILE_PROPERTIES} are supported.")
+            self.properties.append(prop)
+            regexes.append(source.get("transform", {}).get("regex"))
+        self.regexes = [re.compile(r) if r is not None else None for r in regexes]
+
+        includes = _as_list(fileset.get("includes")) or ["**/*"]
+        excludes = _as_list(fileset.get("excludes"))
+        head = "(?=(?:{})\\Z)".format("|".join(glob_to_regex(g) for g in includes))
+        if excludes:
+            head += "(?!(?:{})\\Z)".format("|".join(glob_to_regex(g) for g in excludes))
+
+        # Group number, within the combined pattern, of each fullpath field's
+        # whole match; filename fields are matched on their own
+        self._groups = [None] * len(fields)
+        parts = []
+        group = 0
+        for i, (regex, prop) in enumerate(zip(self.regexes, self.properties)):
+            if regex is None or prop != "fullpath" or not _combinable(regex):
+                continue
+            # A leading ".*" already finds the match from the start of the
+            # path; only other regexes (and alternations, whose later branches
+            # do not start with it) need a search for their start
+            anchored = regex.pattern.startswith((".*", "^")) and not _has_top_level_alternation(regex.pattern)
+            search = "" if anchored else "[\\s\\S]*?"
+            parts.append(f"(?:(?={search}({regex.pattern})))?")
+            self._groups[i] = group + 1
+            group += 1 + regex.groups
+        try:
+            self.pattern = re.compile(head + "".join(parts))
+        except re.error:
+            self.pattern = re.compile(head)
+            self._groups = [None] * len(fields)
+
+    def _search(self, i, path):
+        # Value of a field that is not part of the combined pattern
+        value = path.rsplit("/", 1)[-1] if self.properties[i] == "filename" else path
+        regex = self.regexes[i]
+        if regex is None:
+            return value
+        match = regex.search(value)
+        if match is None:
+            return None
+        return next((g for g in match.groups() if g is not None), value)
+
+    def _column(self, i, paths, groups):
+        group = self._groups[i]
+        if group is None:
+            return [self._search(i, path) for path in paths]
+        rows = zip(paths, groups)
+        k = group - 1  # index into match.groups()
+        inner = self.regexes[i].groups
+        if inner == 0:
+            return [path if groups[k] is not None else None for path, groups in rows]
+        if inner == 1:
+            return [
+                groups[k + 1] if groups[k + 1] is not None else (path if groups[k] is not None else None)
+                for path, groups in rows
+            ]
+        return [
+            next((g for g in groups[k + 1:k + 1 + inner] if g is not None), path) if groups[k] is not None else None
+            for path, groups in rows
+        ]
+
+    def columns(self, paths):
+        """Field name -> values for every path the FileSet includes."""
+        # Only the (untracked) group tuples are kept, not the match objects,
+        # so building a million rows does not keep the garbage collector busy
+        groups = [match.groups() if match is not None else None for match in map(self.pattern.match, paths)]
+        included = [path for path, g in zip(paths, groups) if g is not None]
+        groups = [g for g in groups if g is not None]
+        return {name: self._column(i, included, groups) for i, name in enumerate(self.names)}
+
+
+def fileset_fields(croissant, record_set=None):
+    """``(FileSet, fields)`` of the first RecordSet (or the one with @id ``record_set``) reading a FileSet."""
+    filesets = {d.get("@id"): d for d in croissant.get("distribution", []) if d.get("@type") == "cr:FileSet"}
+    for rs in croissant.get("recordSet", []):
+        if record_set is not None and rs.get("@id") != record_set:
+            continue
+        sourced = [f for f in rs.get("field", []) if f.get("source", {}).get("fileSet", {}).get("@id") in filesets]
+        if not sourced:
+            continue
+        ids = {f["source"]["fileSet"]["@id"] for f in sourced}
+        if len(ids) > 1:
+            raise ValueError(f"RecordSet {rs.get('@id')!r} reads more than one FileSet: {sorted(ids)}")
+        return filesets[ids.pop()], sourced
+    raise ValueError("No RecordSet reads a cr:FileSet" + (f" with @id {record_set!r}" if record_set else ""))
+
+
+def materialize(croissant, root, record_set=None, workers=DEFAULT_WORKERS, paths=None):
+    """Records of the FileSet-backed RecordSet for the files below ``root``, as a ``pyarrow.Table``.
+
+    ``paths`` (relative, ``/``-separated) skips listing ``root``.
+    """
+    pa = _import_pyarrow()
+    fileset, fields = fileset_fields(croissant, record_set)
+    matcher = FileSetMatcher(fileset, fields)
+    if paths is None:
+        paths = scan_tree(root, workers)
+    columns = matcher.columns(sorted(paths))
+    return pa.table({name: pa.array(values, type=pa.string()) for name, values in columns.items()})
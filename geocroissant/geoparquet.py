@@ -0,0 +1,398 @@
+"""
+GeoParquet sidecar for the rows of a GeoCroissant RecordSet.
+
+Instead of inlining one JSON object per STAC item in ``recordSet[0]["data"]``,
+the ItemCollection converter can write the rows to a GeoParquet file with
+the columns
+
+    id          string
+    datetime    timestamp[us, UTC]    (null when the item has none)
+    bbox        list<double>          [west, south, east, north]
+    assets      list<string>          asset keys
+    assetFiles  map<string, string>   FileObject @id of each asset key
+    geometry    binary                WKB, described by the "geo" metadata
+
+and reference it from ``distribution``; each field then reads its column
+through ``source.extract.column``. Consumers load only the columns they need,
+memory-mapped:
+
+    pyarrow.parquet.read_table(path, columns=["id", "datetime"], memory_map=True)
+
+Rows are written in row groups as items arrive, so memory does not grow with
+the number of items. pyarrow is required for this output only.
+
+``StacParquetWriter`` writes whole STAC Items instead, as stac-geoparquet:
+one row per Item with the top-level members as columns (``bbox`` as an
+``xmin/ymin/xmax/ymax`` struct, ``assets`` as a struct per asset key), every
+property as a column of its own and the geometry as WKB:
+
+    duckdb.sql("SELECT id, datetime FROM 'items.parquet' WHERE split = 'train'")
+"""
+
+import json
+import struct
+import sys
+from array import array
+from itertools import chain
+
+from geocroissant.extent import ExtentAccumulator, parse_instant
+
+GEOPARQUET_VERSION = "1.1.0"
+STAC_GEOPARQUET_VERSION = "1.0.0"
+MEDIA_TYPE = "application/vnd.apache.parquet"
+ROW_GROUP_SIZE = 65536
+
+# Column of each RecordSet field in the sidecar
+COLUMNS = ("id", "datetime", "bbox", "assets", "assetFiles", "geometry")
+
+# Top-level Item members of a stac-geoparquet row; properties become the other columns
+STAC_COLUMNS = ("type", "stac_version", "stac_extensions", "id", "geometry", "bbox", "links", "assets", "collection")
+
+# Properties stored as timestamps rather than strings
+STAC_DATETIME_PROPERTIES = {"datetime", "start_datetime", "end_datetime", "created", "updated"}
+
+_WKB_TYPES = {
+    "Point": 1,
+    "LineString": 2,
+    "Polygon": 3,
+    "MultiPoint": 4,
+    "MultiLineString": 5,
+    "MultiPolygon": 6,
+    "GeometryCollection": 7,
+}
+_BYTE_ORDER = b"\x01" if sys.byteorder == "little" else b"\x00"
+_UINT32 = struct.Struct("=I")
+
+
+def _first_position(coordinates):
+    while coordinates and isinstance(coordinates[0], (list, tuple)):
+        coordinates = coordinates[0]
+    return coordinates
+
+
+def _positions(points, dims):
+    return array("d", chain.from_iterable(p[:dims] for p in points)).tobytes()
+
+
+def _write_wkb(geometry, dims, out):
+    kind = geometry["type"]
+    out += _BYTE_ORDER
+    out += _UINT32.pack(_WKB_TYPES[kind] + (1000 if dims == 3 else 0))
+    if kind == "GeometryCollection":
+        members = geometry.get("geometries", [])
+        out += _UINT32.pack(len(members))
+        for member in members:
+            _write_wkb(member, dims, out)
+        return
+    coordinates = geometry.get("coordinates") or []
+    if kind == "Point":
+        out += _positions([coordinates] if coordinates else [[float("nan")] * dims], dims)
+    elif kind == "LineString":
+        out += _UINT32.pack(len(coordinates)) + _positions(coordinates, dims)
+    elif kind == "Polygon":
+        out += _UINT32.pack(len(coordinates))
+        for ring in coordinates:
+            out += _UINT32.pack(len(ring)) + _positions(ring, dims)
+    else:
+        part = kind[len("Multi"):]
+        out += _UINT32.pack(len(coordinates))
+        for coords in coordinates:
+            _write_wkb({"type": part, "coordinates": coords}, dims, out)
+
+
+def geometry_to_wkb(geometry):
+    """ISO WKB of a GeoJSON geometry (``None`` for a null geometry)."""
+    if not geometry:
+        return None
+    position = _first_position(geometry.get("coordinates") or
+                               [g.get("coordinates") for g in geometry.get("geometries", [])])
+    dims = 3 if position and len(position) >= 3 and not isinstance(position[0], (list, tuple)) else 2
+    out = bytearray()
+    _write_wkb(geometry, dims, out)
+    return bytes(out)
+
+
+def _geometry_type(geometry):
+    position = _first_position(geometry.get("coordinates") or [])
+    has_z = bool(position) and len(position) >= 3 and not isinstance(position[0], (list, tuple))
+    return geometry["type"] + (" Z" if has_z else "")
+
+
+def geo_metadata(geometry_types, bbox=None, covering=None):
+    """GeoParquet ``geo`` file metadata for a WKB ``geometry`` column."""
+    column = {"encoding": "WKB", "geometry_types": sorted(geometry_types)}
+    if bbox is not None:
+        column["bbox"] = bbox
+    if covering is not None:
+        column["covering"] = covering
+    return {"version": GEOPARQUET_VERSION, "primary_column": "geometry", "columns": {"geometry": column}}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Writing records to GeoParquet requires pyarrow (pip install pyarrow)") from e
+    return pyarrow, pyarrow.parquet
+
+
+class RecordParquetWriter:
+    """Append STAC items as rows of a GeoParquet file; use as a context manager."""
+
+    def __init__(self, path, row_group_size=ROW_GROUP_SIZE):
+        pa, pq = _import_pyarrow()
+        self._pa = pa
+        self.path = path
+        self.row_group_size = row_group_size
+        self.count = 0
+        self.geometry_types = set()
+        self._extent = ExtentAccumulator()
+        self.schema = pa.schema([
+            ("id", pa.string()),
+            ("datetime", pa.timestamp("us", tz="UTC")),
+            ("bbox", pa.list_(pa.float64())),
+            ("assets", pa.list_(pa.string())),
+            ("assetFiles", pa.map_(pa.string(), pa.string())),
+            ("geometry", pa.binary()),
+        ])
+        # The "geo" metadata is only complete once every row is known; add it
+        # to the footer on close when pyarrow can, else declare it up front
+        self._late_metadata = hasattr(pq.ParquetWriter, "add_key_value_metadata")
+        schema = self.schema
+        if not self._late_metadata:
+            schema = schema.with_metadata({"geo": json.dumps(self._geo_metadata())})
+        self._writer = pq.ParquetWriter(path, schema)
+        self._rows = {name: [] for name in COLUMNS}
+
+    def _geo_metadata(self):
+        return geo_metadata(self.geometry_types, self._extent.bbox)
+
+    def append(self, feat, asset_files=None):
+        rows = self._rows
+        props = feat.get("properties", {})
+        bbox = feat.get("bbox")
+        geometry = feat.get("geometry")
+        rows["id"].append(feat.get("id"))
+        rows["datetime"].append(parse_instant(props["datetime"]) if props.get("datetime") else None)
+        rows["bbox"].append(list(bbox) if bbox else None)
+        rows["assets"].append(list(feat.get("assets", {}).keys()))
+        if asset_files is None:
+            asset_files = {key: f"{feat['id']}/{key}" for key in feat.get("assets", {})}
+        rows["assetFiles"].append(list(asset_files.items()))
+        rows["geometry"].append(geometry_to_wkb(geometry))
+        if geometry:
+            self.geometry_types.add(_geometry_type(geometry))
+        if bbox:
+            self._extent.add_bbox(bbox)
+        self.count += 1
+        if len(rows["id"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows["id"]:
+            return
+        batch = self._pa.record_batch([self._rows[name] for name in COLUMNS], schema=self.schema)
+        self._writer.write_batch(batch, row_group_size=self.row_group_size)
+        self._rows = {name: [] for name in COLUMNS}
+
+    def close(self):
+        if self._writer is None:
+            return
+        self.flush()
+        if self._late_metadata:
+            self._writer.add_key_value_metadata({"geo": json.dumps(self._geo_metadata())})
+        self._writer.close()
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _value_type(pa, name, values):
+    # Arrow type of a property or asset member from its first non-null value
+    if name in STAC_DATETIME_PROPERTIES:
+        return pa.timestamp("us", tz="UTC")
+    value = next((v for v in values if v is not None), None)
+    if isinstance(value, bool):
+        return pa.bool_()
+    if isinstance(value, int):
+        return pa.int64()
+    if isinstance(value, float):
+        return pa.float64()
+    if isinstance(value, (list, tuple)):
+        items = [v for seq in values if seq for v in seq]
+        if items and all(isinstance(v, bool) for v in items):
+            return pa.list_(pa.bool_())
+        if items and all(isinstance(v, int) and not isinstance(v, bool) for v in items):
+            return pa.list_(pa.int64())
+        if items and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in items):
+            return pa.list_(pa.float64())
+        return pa.list_(pa.string())
+    # Strings, and objects written as JSON text
+    return pa.string()
+
+
+def _coercer(pa, type_):
+    # Function fitting a value to type_, writing dicts and lists found in
+    # string slots as JSON text; None when values need no change
+    if pa.types.is_string(type_):
+        return lambda v: v if v is None or isinstance(v, str) else json.dumps(v)
+    if pa.types.is_list(type_):
+        inner = _coercer(pa, type_.value_type)
+        if inner is None:
+            return None
+        return lambda v: None if v is None else [inner(x) for x in v]
+    if pa.types.is_struct(type_):
+        members = [(field.name, _coercer(pa, field.type)) for field in type_]
+        members = [(name, coerce) for name, coerce in members if coerce is not None]
+        if not members:
+            return None
+
+        def coerce_struct(v):
+            if v is None:
+                return None
+            v = dict(v)
+            for name, coerce in members:
+                if name in v:
+                    v[name] = coerce(v[name])
+            return v
+        return coerce_struct
+    return None
+
+
+def stac_parquet_schema(items):
+    """stac-geoparquet schema covering every property and asset of ``items``."""
+    pa, _ = _import_pyarrow()
+    properties = {}
+    assets = {}
+    for item in items:
+        for name, value in item.get("properties", {}).items():
+            properties.setdefault(name, []).append(value)
+        for key, asset in item.get("assets", {}).items():
+            members = assets.setdefault(key, {})
+            for name, value in asset.items():
+                members.setdefault(name, []).append(value)
+    asset_type = pa.struct([
+        (key, pa.struct([(name, _value_type(pa, name, values)) for name, values in members.items()]))
+        for key, members in assets.items()
+    ])
+    link_type = pa.list_(pa.struct([("rel", pa.string()), ("href", pa.string()), ("type", pa.string()),
+                                    ("title", pa.string())]))
+    fields = [
+        ("type", pa.string()),
+        ("stac_version", pa.string()),
+        ("stac_extensions", pa.list_(pa.string())),
+        ("id", pa.string()),
+        ("geometry", pa.binary()),
+        ("bbox", pa.struct([(k, pa.float64()) for k in ("xmin", "ymin", "xmax", "ymax")])),
+        ("links", link_type),
+        ("assets", asset_type),
+        ("collection", pa.string()),
+    ]
+    fields += [(name, _value_type(pa, name, values)) for name, values in properties.items()
+               if name not in STAC_COLUMNS]
+    return pa.schema(fields)
+
+
+class StacParquetWriter:
+    """Append STAC Items as rows of a stac-geoparquet file; use as a context manager.
+
+    ``schema`` comes from :func:`stac_parquet_schema` over the Items (or a
+    representative sample); properties it does not list are dropped. The
+    Collection, when given, is stored in the ``stac-geoparquet`` metadata.
+    """
+
+    def __init__(self, path, schema, collection=None, row_group_size=ROW_GROUP_SIZE):
+        pa, pq = _import_pyarrow()
+        self._pa = pa
+        self.path = path
+        self.schema = schema
+        self.collection = collection
+        self.row_group_size = row_group_size
+        self.count = 0
+        self.geometry_types = set()
+        self._extent = ExtentAccumulator()
+        self._properties = [name for name in schema.names if name not in STAC_COLUMNS]
+        self._timestamps = [name for name in self._properties if name in STAC_DATETIME_PROPERTIES]
+        self._coercers = [
+            (name, coerce) for name, coerce in
+            ((name, _coercer(pa, schema.field(name).type)) for name in ["assets"] + self._properties)
+            if coerce is not None and name not in self._timestamps
+        ]
+        self._late_metadata = hasattr(pq.ParquetWriter, "add_key_value_metadata")
+        if not self._late_metadata:
+            schema = schema.with_metadata(self._metadata())
+        self._writer = pq.ParquetWriter(path, schema)
+        self._rows = []
+
+    def _metadata(self):
+        covering = {"bbox": {k: ["bbox", k] for k in ("xmin", "ymin", "xmax", "ymax")}}
+        stac = {"version": STAC_GEOPARQUET_VERSION}
+        if self.collection is not None:
+            stac["collections"] = {self.collection["id"]: self.collection}
+        return {
+            "geo": json.dumps(geo_metadata(self.geometry_types, self._extent.bbox, covering)),
+            "stac-geoparquet": json.dumps(stac),
+        }
+
+    def append(self, item):
+        props = item.get("properties", {})
+        bbox = item.get("bbox")
+        geometry = item.get("geometry")
+        row = {
+            "type": item.get("type", "Feature"),
+            "stac_version": item.get("stac_version"),
+            "stac_extensions": item.get("stac_extensions", []),
+            "id": item.get("id"),
+            "geometry": geometry_to_wkb(geometry),
+            # 3D bboxes are (xmin, ymin, zmin, xmax, ymax, zmax)
+            "bbox": dict(zip(("xmin", "ymin", "xmax", "ymax"),
+                             (bbox[0], bbox[1], bbox[3], bbox[4]) if len(bbox) == 6 else bbox[:4]))
+            if bbox else None,
+            "links": item.get("links", []),
+            "assets": item.get("assets", {}),
+            "collection": item.get("collection"),
+        }
+        for name in self._properties:
+            row[name] = props.get(name)
+        for name in self._timestamps:
+            if row[name]:
+                row[name] = parse_instant(row[name])
+        for name, coerce in self._coercers:
+            row[name] = coerce(row[name])
+        self._rows.append(row)
+        if geometry:
+            self.geometry_types.add(_geometry_type(geometry))
+        if bbox:
+            self._extent.add_bbox(bbox)
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        table = self._pa.Table.from_pylist(self._rows, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._rows = []
+
+    def close(self):
+        if self._writer is None:
+            return
+        self.flush()
+        if self._late_metadata:
+            self._writer.add_key_value_metadata(self._metadata())
+        self._writer.close()
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
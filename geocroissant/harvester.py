@@ -0,0 +1,374 @@
+"""
+Asynchronous harvester for paginated STAC API item searches.
+
+    python -m geocroissant harvest "https://stac.example.org/collections/x/items?limit=500" -o x.json
+
+Each start URL (a ``/search`` or ``/collections/{id}/items`` request) is paged
+through its ``rel="next"`` links, GET or POST as the link says. Several start
+URLs are harvested concurrently, up to ``concurrency`` requests in flight, and
+each page is retried with exponential backoff on connection errors, ``429`` and
+``5xx`` responses (honouring ``Retry-After``). Starts may overlap (``/search``
+and ``/collections/{id}/items`` of the same collection): an item returned
+again, by its collection and id, is written only once.
+
+Pages are handed to the streaming ItemCollection converter
+(``write_stac_itemcollection_geocroissant``) as they arrive, through a small
+bounded queue, so the next page is fetched while the previous one is being
+written and memory stays flat however many items the API returns. Pagination
+links are not copied into the document's ``references``.
+
+aiohttp is used as the pooled HTTP client when it is installed; otherwise
+keep-alive ``http.client`` connections are pooled per host and driven from a
+thread pool.
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from geocroissant import compression, jsonio
+from geocroissant.converters import load_script
+
+try:
+    import aiohttp
+except ImportError:  # optional; the stdlib transport is used instead
+    aiohttp = None
+
+# Link relations that only describe the paging of one search response
+PAGINATION_RELS = {"next", "prev", "previous", "first", "last", "self"}
+
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 60.0
+QUEUE_PAGES = 4
+
+
+class HarvestError(RuntimeError):
+    """A page could not be fetched after all retries."""
+
+
+class TransientHTTPError(Exception):
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from datetime import datetime, timezone
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _StdlibTransport:
+    """Keep-alive ``http.client`` connections, pooled per host, used from worker threads."""
+
+    def __init__(self, size, timeout):
+        self._size = size
+        self._timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self._timeout)
+
+    def _release(self, scheme, netloc, connection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self._size:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _request(self, method, url, body):
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        headers = {"Accept": "application/geo+json, application/json"}
+        data = None
+        if body is not None:
+            data = jsonio.dumps(body, pretty=False)
+            headers["Content-Type"] = "application/json"
+        connection = self._acquire(parts.scheme, parts.netloc)
+        try:
+            connection.request(method, target, body=data, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(parts.scheme, parts.netloc, connection)
+        if response.status in RETRY_STATUSES:
+            raise TransientHTTPError(response.status, _retry_after_seconds(response.getheader("Retry-After")))
+        if response.status >= 400:
+            raise HarvestError(f"{method} {url} returned HTTP {response.status}: {payload[:200]!r}")
+        return jsonio.loads(payload)
+
+    async def fetch_json(self, method, url, body=None):
+        return await asyncio.to_thread(self._request, method, url, body)
+
+    async def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for connection in idle:
+                    connection.close()
+            self._idle.clear()
+
+
+class _AiohttpTransport:
+    def __init__(self, size, timeout):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=size),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            headers={"Accept": "application/geo+json, application/json"},
+        )
+
+    async def fetch_json(self, method, url, body=None):
+        try:
+            async with self._session.request(method, url, json=body) as response:
+                payload = await response.read()
+                if response.status in RETRY_STATUSES:
+                    raise TransientHTTPError(response.status, _retry_after_seconds(response.headers.get("Retry-After")))
+                if response.status >= 400:
+                    raise HarvestError(f"{method} {url} returned HTTP {response.status}: {payload[:200]!r}")
+        except aiohttp.ClientError as e:
+            raise OSError(str(e)) from e
+        return jsonio.loads(payload)
+
+    async def close(self):
+        await self._session.close()
+
+
+def _next_request(page, url, body):
+    """Return ``(method, url, body)`` of the page after ``page``, or ``None`` on the last page."""
+    for link in page.get("links", []):
+        if link.get("rel") != "next" or not link.get("href"):
+            continue
+        method = link.get("method", "GET").upper()
+        next_url = urljoin(url, link["href"])
+        next_body = link.get("body")
+        if method == "POST" and link.get("merge") and body:
+            next_body = {**body, **(next_body or {})}
+        return method, next_url, next_body if method == "POST" else None
+    return None
+
+
+class STACHarvester:
+    """Fetch every page of one or more STAC API item searches."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT, max_pages=None):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.pages = 0
+        self.items = 0
+        self.retries = 0
+        self.duplicates = 0
+
+    async def _fetch(self, transport, semaphore, method, url, body):
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    return await transport.fetch_json(method, url, body)
+            except (TransientHTTPError, OSError, http.client.HTTPException) as e:
+                if attempt == self.max_retries:
+                    raise HarvestError(f"{method} {url} failed after {attempt + 1} attempts: {e}") from e
+                delay = getattr(e, "retry_after", None)
+                if delay is None:
+                    delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    async def _walk(self, transport, semaphore, start, on_page):
+        method, url, body = start
+        pages = 0
+        while True:
+            page = await self._fetch(transport, semaphore, method, url, body)
+            self.pages += 1
+            self.items += len(page.get("features", []))
+            await on_page(page)
+            pages += 1
+            following = _next_request(page, url, body)
+            if following is None or (self.max_pages is not None and pages >= self.max_pages):
+                return
+            method, url, body = following
+
+    async def harvest(self, starts, on_page):
+        """Page through every start request, awaiting ``on_page(page)`` for each page in order per start.
+
+        ``starts`` are URLs or ``(method, url, body)`` tuples.
+        """
+        starts = [("GET", s, None) if isinstance(s, str) else s for s in starts]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        transport_class = _AiohttpTransport if aiohttp is not None else _StdlibTransport
+        transport = transport_class(self.concurrency, self.timeout)
+        try:
+            await asyncio.gather(*(self._walk(transport, semaphore, start, on_page) for start in starts))
+        finally:
+            await transport.close()
+
+
+def search_url(api_root, collections=None, bbox=None, datetime=None, limit=None):
+    """Build a GET ``/search`` URL for a STAC API."""
+    params = {}
+    if collections:
+        params["collections"] = ",".join(collections)
+    if bbox:
+        params["bbox"] = ",".join(str(v) for v in bbox)
+    if datetime:
+        params["datetime"] = datetime
+    if limit:
+        params["limit"] = limit
+    url = api_root.rstrip("/") + "/search"
+    return url + ("?" + urlencode(params) if params else "")
+
+
+def _page_metadata(page):
+    metadata = {k: v for k, v in page.items() if k not in ("features", "numberReturned", "numberMatched", "context")}
+    metadata["links"] = [link for link in page.get("links", []) if link.get("rel") not in PAGINATION_RELS]
+    return metadata
+
+
+def _drain(pages):
+    while True:
+        page = pages.get()
+        if page is None:
+            return
+        yield from page
+
+
+def _discard(pages):
+    try:
+        while True:
+            pages.get_nowait()
+    except queue.Empty:
+        pass
+
+
+async def harvest_to_geocroissant(starts, fp, metadata=None, base_dir=None, **harvester_options):
+    """Harvest ``starts`` and stream the items into a GeoCroissant document written to ``fp``.
+
+    ``metadata`` adds or overrides ItemCollection members used for the
+    dataset header (``id``, ``title``, ``description``, ``license``, ...); the
+    other members come from the first page. Returns the harvester, whose
+    ``pages``, ``items``, ``duplicates`` and ``retries`` counters describe the
+    run.
+    """
+    convertor = load_script("convertor")
+    harvester = STACHarvester(**harvester_options)
+    stac_dict = {}
+    pages = queue.Queue(maxsize=QUEUE_PAGES)
+    writer = None
+    seen = set()
+
+    def write():
+        return convertor.write_stac_itemcollection_geocroissant(
+            stac_dict, fp, features=_drain(pages), base_dir=base_dir
+        )
+
+    async def stopped():
+        await writer
+        raise HarvestError("The converter stopped before the harvest finished.")
+
+    async def put(features):
+        # Waits while the converter is behind, unless it has stopped with an error
+        if writer.done():
+            await stopped()
+        try:
+            pages.put_nowait(features)
+            return
+        except queue.Full:
+            pass
+        putting = asyncio.ensure_future(asyncio.to_thread(pages.put, features))
+        await asyncio.wait((putting, writer), return_when=asyncio.FIRST_COMPLETED)
+        if putting.done():
+            return
+        # Nothing reads the queue any more: empty it until the blocked put returns
+        while not putting.done():
+            _discard(pages)
+            await asyncio.wait((putting,), timeout=0.01)
+        await stopped()
+
+    def unseen(features):
+        # Items already returned by another start (or page) are skipped
+        kept = []
+        for feature in features:
+            key = (feature.get("collection"), feature.get("id"))
+            if key[1] is not None:
+                if key in seen:
+                    harvester.duplicates += 1
+                    continue
+                seen.add(key)
+            kept.append(feature)
+        return kept
+
+    async def on_page(page):
+        nonlocal writer
+        features = unseen(page.get("features", []))
+        if not features:
+            return
+        if writer is None:
+            # The converter reads the dataset id as soon as the first item arrives
+            stac_dict.update(_page_metadata(page))
+            stac_dict.update(metadata or {})
+            writer = asyncio.ensure_future(asyncio.to_thread(write))
+        await put(features)
+
+    try:
+        await harvester.harvest(starts, on_page)
+    finally:
+        if writer is not None:
+            stac_dict["numberReturned"] = harvester.items - harvester.duplicates
+            await put(None)
+            await writer
+    if writer is None:
+        raise HarvestError("The search returned no items.")
+    return harvester
+
+
+def harvest(starts, output_path, metadata=None, **harvester_options):
+    """Blocking wrapper: harvest ``starts`` into the GeoCroissant file ``output_path``."""
+    try:
+        with compression.open_file(output_path, "w") as f:
+            return asyncio.run(harvest_to_geocroissant(starts, f, metadata=metadata, **harvester_options))
+    except BaseException:
+        # Do not leave a truncated or partial document behind
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+
+
+def parse_start(value):
+    """``URL`` or ``POST URL JSON-BODY`` as given on the command line."""
+    if value.startswith("POST "):
+        _, url, body = value.split(" ", 2)
+        return "POST", url, json.loads(body)
+    return "GET", value, None
@@ -0,0 +1,194 @@
+"""
+JSON serialization layer shared by the converters.
+
+Uses orjson or msgspec when one of them is installed and falls back to the
+standard library otherwise. Whatever the backend, ``dumps`` returns UTF-8
+bytes laid out like ``json.dumps(obj, indent=2)`` with ``pretty=True``, and
+non-ASCII characters are ``\\u`` escaped as by ``json.dumps`` unless
+``ensure_ascii=False`` is passed. The text is not always byte-identical
+across backends: floats in exponent notation are written ``1e-7``/``1e16``
+by the fast backends and ``1e-07``/``1e+16`` by the standard library (they
+parse back to the same values). Documents holding ``NaN`` or infinities,
+which the fast backends would silently write as ``null``, are encoded by the
+standard library so they keep their ``NaN``/``Infinity``, and values the
+standard library cannot encode (``datetime``, dataclasses, sets, ...) raise
+``TypeError`` under every backend rather than only when no fast one is
+installed.
+
+The backend can be forced with the ``GEOCROISSANT_JSON_BACKEND`` environment
+variable (``orjson``, ``msgspec`` or ``json``) or :func:`set_backend`.
+Values a fast backend cannot encode (integers beyond 64 bits, non-string
+keys for msgspec, ...) and documents it rejects on load (``NaN`` literals,
+huge integers) are handed to the standard library instead of failing.
+
+Paths ending in ``.gz`` or ``.zst`` are compressed on ``dump`` and
+decompressed on ``load`` (see :mod:`geocroissant.compression`).
+"""
+
+import json
+import math
+import os
+import re
+
+from geocroissant import compression
+from geocroissant.profiling import profiled
+
+try:
+    import orjson
+except ImportError:  # optional fast backend
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional fast backend
+    msgspec = None
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _available(name):
+    return {"orjson": orjson, "msgspec": msgspec, "json": json}[name] is not None
+
+
+def set_backend(name=None):
+    """Select the backend by name, or the fastest installed one when ``name`` is ``None``."""
+    global BACKEND
+    if name is None:
+        name = next(b for b in BACKENDS if _available(b))
+    elif name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    elif not _available(name):
+        raise ImportError(f"JSON backend {name!r} is not installed")
+    BACKEND = name
+    return BACKEND
+
+
+BACKEND = set_backend(os.environ.get("GEOCROISSANT_JSON_BACKEND") or None)
+
+
+# orjson encodes these natively; passing them through leaves them to the
+# standard library, which rejects them
+_ORJSON_PASSTHROUGH = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+
+_NON_ASCII = re.compile("[^\x00-\x7f]")
+
+
+def _stdlib_dumps(obj, pretty, sort_keys, ensure_ascii):
+    text = json.dumps(
+        obj,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+    )
+    return text.encode("utf-8")
+
+
+def _escape_char(match):
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}"
+
+
+def _escape_non_ascii(data):
+    # Outside strings JSON text is ASCII, so every non-ASCII character is in a
+    # string and gets the escape json.dumps(ensure_ascii=True) would write
+    if data.isascii():
+        return data
+    return _NON_ASCII.sub(_escape_char, data.decode("utf-8")).encode("ascii")
+
+
+def _stdlib_types_only(obj):
+    # Whether the standard library can encode every value; msgspec would also
+    # encode datetimes, UUIDs, sets, ... that json.dumps rejects
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif not isinstance(value, (str, int, float)) and value is not None:
+            return False
+    return True
+
+
+def _has_non_finite(obj):
+    # Any NaN or infinity in a document of dicts, lists and scalars
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def dumps(obj, pretty=True, sort_keys=False, ensure_ascii=True):
+    """Serialize ``obj`` to UTF-8 bytes, indented by two spaces or compact.
+
+    ``ensure_ascii=False`` writes non-ASCII characters as is instead of escaped.
+    """
+    data = None
+    if BACKEND == "orjson":
+        option = orjson.OPT_NON_STR_KEYS | _ORJSON_PASSTHROUGH
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+    elif BACKEND == "msgspec":
+        try:
+            if _stdlib_types_only(obj):
+                data = msgspec.json.encode(obj, order="sorted" if sort_keys else None)
+                data = msgspec.json.format(data, indent=2) if pretty else data
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            pass
+    # Non-finite floats come out of the fast backends as null; only then is
+    # the document searched for them
+    if data is not None and (b"null" not in data or not _has_non_finite(obj)):
+        return _escape_non_ascii(data) if ensure_ascii else data
+    return _stdlib_dumps(obj, pretty, sort_keys, ensure_ascii)
+
+
+def loads(data):
+    """Parse a JSON document from ``str`` or ``bytes``."""
+    try:
+        if BACKEND == "orjson":
+            return orjson.loads(data)
+        if BACKEND == "msgspec":
+            return msgspec.json.decode(data)
+    except ValueError:  # orjson.JSONDecodeError, msgspec.DecodeError
+        pass
+    return json.loads(data)
+
+
+@profiled("jsonio.dump")
+def dump(obj, path, pretty=True, sort_keys=False, ensure_ascii=True, level=None):
+    """Write ``obj`` to a file path or binary file object in one write.
+
+    ``level`` is the compression level used when ``path`` ends in ``.gz`` or ``.zst``.
+    """
+    data = dumps(obj, pretty=pretty, sort_keys=sort_keys, ensure_ascii=ensure_ascii)
+    if hasattr(path, "write"):
+        path.write(data)
+    else:
+        with compression.open_file(path, "wb", level=level) as f:
+            f.write(data)
+
+
+def load(path):
+    """Read a JSON document from a file path or binary file object."""
+    if hasattr(path, "read"):
+        return loads(path.read())
+    with compression.open_file(path, "rb") as f:
+        return loads(f.read())
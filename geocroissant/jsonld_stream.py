@@ -0,0 +1,130 @@
+"""
+Streaming JSON-LD emitter for GeoCroissant documents.
+
+Writes a document piece by piece with exactly the same text that
+``geocroissant.jsonio.dump(document, f)`` would produce, so large
+``distribution`` and ``recordSet.data`` arrays never have to be held in memory
+at once. The output file must be opened with ``encoding="utf-8"``.
+"""
+
+import json
+import shutil
+import tempfile
+
+from geocroissant import jsonio
+
+
+def encode(value, depth, indent=2):
+    """Encode a value as it appears ``depth`` containers deep in an indented dump."""
+    if indent == 2:
+        text = jsonio.dumps(value).decode("utf-8")
+    else:
+        text = json.dumps(value, indent=indent)
+    if depth:
+        text = text.replace("\n", "\n" + " " * (indent * depth))
+    return text
+
+
+class SpooledArray:
+    """Array items encoded to a temporary file until the writer is ready for them.
+
+    ``depth`` is the nesting depth of the array itself once it is written,
+    e.g. 2 for a top-level ``distribution`` list.
+    """
+
+    def __init__(self, depth, indent=2):
+        self.depth = depth
+        self.indent = indent
+        self.count = 0
+        self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+
+    def append(self, value):
+        self._file.write(",\n" if self.count else "\n")
+        self._file.write(" " * (self.indent * self.depth))
+        self._file.write(encode(value, self.depth, self.indent))
+        self.count += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def copy_to(self, fp):
+        self._file.seek(0)
+        shutil.copyfileobj(self._file, fp)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONStreamWriter:
+    """Incremental writer producing ``jsonio.dump(...)`` compatible output."""
+
+    def __init__(self, fp, indent=2):
+        self._fp = fp
+        self._indent = indent
+        self._stack = []  # [closing bracket, number of members written]
+
+    @property
+    def depth(self):
+        return len(self._stack)
+
+    def _begin_member(self, key):
+        if not self._stack:
+            return
+        close, count = self._stack[-1]
+        self._fp.write(",\n" if count else "\n")
+        self._fp.write(" " * (self._indent * len(self._stack)))
+        if close == "}":
+            if key is None:
+                raise ValueError("Object members need a key")
+            self._fp.write(jsonio.dumps(key).decode("utf-8") + ": ")
+        self._stack[-1][1] += 1
+
+    def begin_object(self, key=None):
+        self._begin_member(key)
+        self._fp.write("{")
+        self._stack.append(["}", 0])
+
+    def begin_array(self, key=None):
+        self._begin_member(key)
+        self._fp.write("[")
+        self._stack.append(["]", 0])
+
+    def end(self):
+        close, count = self._stack.pop()
+        if count:
+            self._fp.write("\n" + " " * (self._indent * len(self._stack)))
+        self._fp.write(close)
+
+    def write(self, key, value):
+        """Write one object member (``key``) or array item (``key=None``)."""
+        self._begin_member(key)
+        self._fp.write(encode(value, len(self._stack), self._indent))
+
+    def write_members(self, mapping):
+        for key, value in mapping.items():
+            self.write(key, value)
+
+    def write_spooled(self, key, spool):
+        """Write a :class:`SpooledArray` as the next member of the current container."""
+        if spool.depth != len(self._stack) + 1:
+            raise ValueError(
+                f"Spooled array was encoded for depth {spool.depth}, "
+                f"but would be written at depth {len(self._stack) + 1}"
+            )
+        self._begin_member(key)
+        self._fp.write("[")
+        if spool.count:
+            spool.copy_to(self._fp)
+            self._fp.write("\n" + " " * (self._indent * len(self._stack)))
+        self._fp.write("]")
+
+    def close(self):
+        while self._stack:
+            self.end()
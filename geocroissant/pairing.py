@@ -0,0 +1,159 @@
+"""
+Pair the images of a ``geocr:fileListing`` with their annotations.
+
+    pairing = pair_listing(croissant["geocr:fileListing"])
+    for split, image, annotation in pairing:
+        ...
+    pairing.orphan_images, pairing.orphan_annotations   # {split: [paths]}
+
+Every file gets a join key from its name (the last ``/`` component) by the
+first key rule that matches it; images and annotations of a split with the
+same key are a pair. The default rules key
+
+* HLS scenes by scene id: ``..._HLS.S30.T10SDH.2020248.v1.4_merged.tif`` and
+  ``..._HLS.S30.T10SDH.2020248.v1.4.mask.tif``
+* Sentinel-2 scenes by date, time and tile (``geocroissant.scenes``)
+* numbered samples by number: ``image_12.h5`` and ``mask_12.h5``
+* anything else by the name without its extensions and a role suffix such as
+  ``_merged``, ``_mask`` or ``_label``: ``tile_3_img.png`` and
+  ``tile_3_gt.png``
+
+A rule is a pattern whose ``key`` group (or whole match) is the key, or a
+:class:`~geocroissant.scenes.SceneScheme`, keyed by its scene id; pass
+``rules`` to use others. The annotations of a split are put in a dict by key
+and each image looks its key up, so pairing is linear in the number of files
+however the lists are ordered or sized. Pairs come out in image order; files
+with no counterpart, a key no rule derives, or a key already taken by an
+earlier annotation of the split are reported as orphans instead of being
+paired by position.
+"""
+
+import re
+
+from geocroissant.scenes import SCHEMES, SceneScheme
+
+DEFAULT_KEY_RULES = (
+    SCHEMES["hls"],
+    SCHEMES["sentinel2"],
+    r"^(?:images?|imgs?|masks?|labels?|annotations?)[_-](?P<key>\d+)\.",
+    r"^(?P<key>.+?)(?:[._-](?:merged|image|img|mask|label|labels|annotation|gt))?(?:\.\w+)+$",
+)
+
+
+def compile_rules(rules=DEFAULT_KEY_RULES):
+    """``(regex, group)`` pairs of key rules: patterns, compiled patterns or scene schemes."""
+    compiled = []
+    for rule in rules:
+        if isinstance(rule, SceneScheme):
+            compiled.append((rule.regex, "scene_id"))
+            continue
+        regex = re.compile(rule) if isinstance(rule, str) else rule
+        compiled.append((regex, "key" if "key" in regex.groupindex else 0))
+    return compiled
+
+
+def join_keys(paths, rules=DEFAULT_KEY_RULES):
+    """Join key of every path (``None`` where no rule matches its name)."""
+    compiled = compile_rules(rules)
+    names = [path.rpartition("/")[2] for path in paths]
+    keys = [None] * len(names)
+    pending = range(len(names))
+    # One pass per rule over the names earlier rules left unkeyed
+    for regex, group in compiled:
+        unmatched = []
+        for i, match in zip(pending, map(regex.search, [names[i] for i in pending])):
+            if match is None:
+                unmatched.append(i)
+            else:
+                keys[i] = match.group(group)
+        pending = unmatched
+        if not pending:
+            break
+    return keys
+
+
+class Pairing:
+    """Paired ``images``/``annotations`` (with their ``splits`` and ``keys``) and the orphans of each split."""
+
+    def __init__(self):
+        self.splits = []
+        self.keys = []
+        self.images = []
+        self.annotations = []
+        self.orphan_images = {}
+        self.orphan_annotations = {}
+
+    def __len__(self):
+        return len(self.images)
+
+    def __iter__(self):
+        return zip(self.splits, self.images, self.annotations)
+
+    def annotation_of(self):
+        """Image path -> annotation path of every pair."""
+        return dict(zip(self.images, self.annotations))
+
+    def add(self, split, images, annotations, rules=DEFAULT_KEY_RULES):
+        """Join the ``images`` and ``annotations`` of one split; returns the number of pairs added."""
+        by_key = {}
+        orphan_annotations = []
+        for key, path in zip(join_keys(annotations, rules), annotations):
+            if key is None or key in by_key:
+                orphan_annotations.append(path)
+            else:
+                by_key[key] = path
+        orphan_images = []
+        before = len(self.images)
+        for key, path in zip(join_keys(images, rules), images):
+            annotation = by_key.pop(key, None) if key is not None else None
+            if annotation is None:
+                orphan_images.append(path)
+                continue
+            self.splits.append(split)
+            self.keys.append(key)
+            self.images.append(path)
+            self.annotations.append(annotation)
+        orphan_annotations.extend(by_key.values())
+        if orphan_images:
+            self.orphan_images[split] = orphan_images
+        if orphan_annotations:
+            self.orphan_annotations[split] = orphan_annotations
+        return len(self.images) - before
+
+    def report(self):
+        """One line per split with orphans, e.g. ``train: 3799 pairs, 5 annotations without an image``."""
+        pairs = {}
+        for split in self.splits:
+            pairs[split] = pairs.get(split, 0) + 1
+        lines = []
+        for split in dict.fromkeys(list(self.orphan_images) + list(self.orphan_annotations)):
+            orphans = []
+            if split in self.orphan_images:
+                orphans.append(f"{len(self.orphan_images[split])} images without an annotation")
+            if split in self.orphan_annotations:
+                orphans.append(f"{len(self.orphan_annotations[split])} annotations without an image")
+            lines.append(f"{split}: {pairs.get(split, 0)} pairs, {', '.join(orphans)}")
+        return lines
+
+
+def pair_paths(images, annotations, split=None, rules=DEFAULT_KEY_RULES):
+    """:class:`Pairing` of one list of images with one list of annotations."""
+    pairing = Pairing()
+    pairing.add(split, images, annotations, rules)
+    return pairing
+
+
+def pair_listing(listing, rules=DEFAULT_KEY_RULES, splits=None):
+    """:class:`Pairing` of the ``images`` and ``annotations`` of a ``geocr:fileListing``, split by split.
+
+    ``splits`` restricts (and orders) the splits joined; a split listed on one
+    side only leaves all its files orphans.
+    """
+    images = (listing or {}).get("images") or {}
+    annotations = (listing or {}).get("annotations") or {}
+    if splits is None:
+        splits = list(dict.fromkeys(list(images) + list(annotations)))
+    pairing = Pairing()
+    for split in splits:
+        pairing.add(split, images.get(split) or [], annotations.get(split) or [], rules)
+    return pairing
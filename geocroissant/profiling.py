@@ -0,0 +1,155 @@
+"""
+Opt-in per-stage instrumentation for the converters.
+
+Set ``GEOCROISSANT_PROFILE`` to a file path (or ``-`` for stderr), or pass
+``--profile PATH`` to ``python -m geocroissant``, and every stage wrapped in
+:func:`stage` or :func:`profiled` appends one JSON line such as
+
+    {"stage": "extract_all_distributions",
+     "path": "conversion/convert_to_complete_geocroissant/create_dataset_structure/extract_all_distributions",
+     "wall_seconds": 0.0018, "cpu_seconds": 0.0016, "peak_bytes": 33396, "pid": 4242,
+     "timestamp": 1760000000.0}
+
+``path`` lists the enclosing stages, ``peak_bytes`` is the tracemalloc peak
+above the memory in use when the stage started, and keyword arguments given
+to :func:`stage` are added as extra fields. Without the variable the wrappers
+cost one global lookup. Worker processes inherit the setting through the
+environment.
+
+tracemalloc slows allocation-heavy stages (rdflib graph building in
+particular) several times over; set ``GEOCROISSANT_PROFILE_MEMORY=0`` (or
+``--profile-no-memory``) to record times only, with ``peak_bytes`` null.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+ENV_VAR = "GEOCROISSANT_PROFILE"
+MEMORY_ENV_VAR = "GEOCROISSANT_PROFILE_MEMORY"
+
+_output = os.environ.get(ENV_VAR) or None
+_trace_memory = os.environ.get(MEMORY_ENV_VAR, "1") != "0"
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def configure(output, memory=True):
+    """Write stage records to ``output`` (a path or ``-``), or stop profiling with ``None``.
+
+    The settings are also exported to the environment so that worker
+    processes started afterwards profile to the same place.
+    """
+    global _output, _trace_memory
+    _output = output or None
+    _trace_memory = memory
+    if _output is None:
+        os.environ.pop(ENV_VAR, None)
+    else:
+        os.environ[ENV_VAR] = _output
+    os.environ[MEMORY_ENV_VAR] = "1" if memory else "0"
+
+
+def enabled():
+    return _output is not None
+
+
+def _emit(record):
+    line = json.dumps(record) + "\n"
+    with _lock:
+        if _output == "-":
+            sys.stderr.write(line)
+            sys.stderr.flush()
+        else:
+            with open(_output, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class _Stage:
+    __slots__ = ("name", "fields", "wall", "cpu", "base", "peak_seen")
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        if _trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # The peak so far belongs to the enclosing stage; restart it for this one
+                stack[-1].peak_seen = max(stack[-1].peak_seen, peak)
+            tracemalloc.reset_peak()
+            self.base = current
+            self.peak_seen = current
+        stack.append(self)
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        stack = _local.stack
+        stack.pop()
+        peak_bytes = None
+        if _trace_memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak_seen = max(stack[-1].peak_seen, peak)
+            peak_bytes = max(self.peak_seen, peak) - self.base
+        record = {
+            "stage": self.name,
+            "path": "/".join([s.name for s in stack] + [self.name]),
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "peak_bytes": peak_bytes,
+            "pid": os.getpid(),
+            "timestamp": time.time(),
+        }
+        if exc[0] is not None:
+            record["error"] = exc[0].__name__
+        record.update(self.fields)
+        _emit(record)
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, **fields):
+    """Context manager timing one stage when profiling is enabled."""
+    if _output is None:
+        return _NULL_STAGE
+    return _Stage(name, fields)
+
+
+def profiled(name=None):
+    """Decorator recording every call of the function as a stage (named after the function by default)."""
+    def decorate(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _output is None:
+                return func(*args, **kwargs)
+            with _Stage(stage_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,157 @@
+"""
+Incremental JSON readers for large STAC and GeoCroissant documents.
+
+``StreamingCollection`` walks a FeatureCollection/ItemCollection with ijson
+and yields its features one at a time, collecting the other top-level members
+(``links``, ``numberReturned``, ...) into ``metadata`` during the same pass.
+``load_json`` is the drop-in replacement for ``json.load`` used by the
+converters that need the whole document. ``select_shards`` and
+``iter_shards`` open only the shards of a sharded GeoCroissant document that
+intersect a query. All of them read gzip (``.gz``) and Zstandard (``.zst``)
+files transparently.
+"""
+
+import json
+import os
+
+from geocroissant import compression, jsonio
+from geocroissant.extent import parse_instant
+from geocroissant.profiling import profiled
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; only the streaming mode needs it
+    ijson = None
+
+# Files above this size are parsed incrementally even when a fast backend is available
+INCREMENTAL_THRESHOLD = 256 * 1024 * 1024
+
+# Assumed ratio of a JSON document to its compressed file, for the threshold above
+COMPRESSION_RATIO = 10
+
+
+def _require_ijson():
+    if ijson is None:
+        raise ImportError(
+            "Streaming mode requires ijson. Install it with 'pip install ijson'."
+        )
+
+
+class StreamingCollection:
+    """Iterate over the items of one top-level array member of a JSON file.
+
+    Every iteration re-reads the file. Members that appear before the array
+    are available in ``metadata`` as soon as the first item is yielded; the
+    rest are filled in once iteration finishes.
+    """
+
+    def __init__(self, path, array_key="features"):
+        _require_ijson()
+        self.path = path
+        self.array_key = array_key
+        self.metadata = {}
+
+    def __iter__(self):
+        item_prefix = f"{self.array_key}.item"
+        key = None
+        target = None
+        builder = None
+        depth = 0
+
+        with compression.open_file(self.path, "rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is None:
+                    if prefix == "":
+                        if event == "map_key":
+                            key = value
+                        continue
+                    if prefix == self.array_key and event in ("start_array", "end_array"):
+                        continue
+                    builder = ijson.ObjectBuilder()
+                    target = item_prefix if prefix == item_prefix else key
+
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+
+                if depth == 0:
+                    if target == item_prefix:
+                        yield builder.value
+                    else:
+                        self.metadata[target] = builder.value
+                    builder = None
+
+
+@profiled()
+def load_json(path):
+    """Load a whole JSON document with the fastest parser that suits its size.
+
+    Files up to ``INCREMENTAL_THRESHOLD`` bytes are parsed in one call by the
+    :mod:`geocroissant.jsonio` backend when orjson or msgspec is installed.
+    Larger files, or any file when only the standard library is available, are
+    parsed incrementally with ijson so that the raw file text and the parsed
+    tree are never held in memory at the same time. Compressed files (``.gz``,
+    ``.zst``) count as ``COMPRESSION_RATIO`` times their size and are
+    decompressed as they are parsed.
+    """
+    size = os.path.getsize(path)
+    if compression.codec_for(path) is not None:
+        size *= COMPRESSION_RATIO
+    if jsonio.BACKEND != "json" and (ijson is None or size <= INCREMENTAL_THRESHOLD):
+        return jsonio.load(path)
+    if ijson is None:
+        with compression.open_file(path) as f:
+            return json.load(f)
+    with compression.open_file(path, "rb") as f:
+        return next(ijson.items(f, "", use_float=True))
+
+
+def _longitude_ranges(west, east):
+    # A bbox crossing the antimeridian covers two ranges
+    return [(west, east)] if west <= east else [(west, 180), (-180, east)]
+
+
+def bbox_intersects(a, b):
+    """Whether two ``[west, south, east, north]`` bboxes overlap, either may cross the antimeridian."""
+    if a[1] > b[3] or b[1] > a[3]:
+        return False
+    return any(
+        w1 <= e2 and w2 <= e1
+        for w1, e1 in _longitude_ranges(a[0], a[2])
+        for w2, e2 in _longitude_ranges(b[0], b[2])
+    )
+
+
+def select_shards(root, bbox=None, start=None, end=None):
+    """Entries of a root document's ``geocr:shards`` index that intersect ``bbox`` and ``[start, end]``.
+
+    ``start`` and ``end`` are ISO 8601 strings; either may be omitted for an
+    open interval. Shards without a recorded extent are always selected.
+    """
+    start = parse_instant(start) if start else None
+    end = parse_instant(end) if end else None
+    selected = []
+    for entry in root.get("geocr:shards", []):
+        shard_bbox = entry.get("geocr:BoundingBox")
+        if bbox is not None and shard_bbox is not None and not bbox_intersects(bbox, shard_bbox):
+            continue
+        temporal = entry.get("geocr:temporalExtent")
+        if temporal is not None:
+            shard_start = parse_instant(temporal.get("startDate") or "")
+            shard_end = parse_instant(temporal.get("endDate") or "")
+            if end is not None and shard_start is not None and shard_start > end:
+                continue
+            if start is not None and shard_end is not None and shard_end < start:
+                continue
+        selected.append(entry)
+    return selected
+
+
+def iter_shards(root_path, bbox=None, start=None, end=None):
+    """Load and yield the shard documents of a sharded root document that intersect the query."""
+    root = load_json(root_path)
+    base_dir = os.path.dirname(os.path.abspath(root_path))
+    for entry in select_shards(root, bbox, start, end):
+        yield load_json(os.path.join(base_dir, entry["contentUrl"]))
@@ -0,0 +1,220 @@
+"""
+Scene names of the datasets GeoCroissant describes, parsed in bulk.
+
+    table = parse_scenes(paths, "hls")
+    table["tile"][0]                     # '10SDH'
+    format_datetimes(table["datetime"])  # ['2020-09-04T00:00:00Z', ...]
+
+A scheme is one precompiled pattern searched in every path; its named groups
+become string columns (``None`` where a path does not match) and its date
+and time groups are decoded into a ``datetime`` column:
+
+* ``hls``: ``HLS.S30.T10SDH.2020248.v1.4`` (sensor, tile, year + day of year,
+  optional ``Thhmmss``, version)
+* ``sentinel2``: ``20170430T190351_20170430T190351_T10SEG`` and SAFE names
+  such as ``S2A_MSIL2A_20170430T190351_N0205_R013_T10SEG_...`` (mission,
+  processing level, date and time, tile)
+* ``landslide4sense``: ``image_12.h5`` / ``mask_12.h5`` (kind, index; no date)
+
+The paths are matched in one pass and the dates decoded all at once: with
+NumPy installed the digits of every date are turned into ``datetime64[s]``
+with array arithmetic (``NaT`` where there is none), otherwise the column is
+a list of naive UTC ``datetime`` objects (``None`` where there is none).
+Impossible dates (day 366 of a common year, 31 February) are treated as
+missing.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+
+_np = None
+
+
+def _numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:  # optional; dates are decoded one at a time instead
+            _np = False
+    return _np or None
+
+
+class SceneScheme:
+    """A naming scheme: a pattern with named groups, and how its ``date`` group is written.
+
+    ``date_format`` is ``"yday"`` (``YYYYDDD``), ``"ymd"`` (``YYYYMMDD``) or
+    ``None``; a ``time`` group, if any, is ``hhmmss``. The ``scene_id``
+    group identifies the scene.
+    """
+
+    def __init__(self, name, pattern, date_format=None):
+        if date_format not in (None, "yday", "ymd"):
+            raise ValueError(f"Unknown date format {date_format!r}; expected 'yday', 'ymd' or None")
+        self.name = name
+        self.regex = re.compile(pattern, re.ASCII)
+        if self.regex.groups != len(self.regex.groupindex):
+            raise ValueError(f"Every group of the {name!r} pattern must be named")
+        if "scene_id" not in self.regex.groupindex or (date_format and "date" not in self.regex.groupindex):
+            raise ValueError(f"The {name!r} pattern needs a 'scene_id' group, and a 'date' group for its dates")
+        self.fields = sorted(self.regex.groupindex, key=self.regex.groupindex.get)
+        self.date_format = date_format
+
+    def parse(self, path):
+        """Fields of one path (``datetime`` as a naive UTC ``datetime``), or ``None`` if it does not match."""
+        match = self.regex.search(path)
+        if match is None:
+            return None
+        fields = match.groupdict()
+        if self.date_format is not None:
+            fields["datetime"] = _decode_python([fields["date"]], [fields.get("time") or ""], self.date_format)[0]
+        return fields
+
+    def __repr__(self):
+        return f"SceneScheme({self.name!r}, {self.regex.pattern!r}, {self.date_format!r})"
+
+
+SCHEMES = {
+    "hls": SceneScheme(
+        "hls",
+        r"(?P<scene_id>HLS\.(?P<sensor>[LS]30)\.T(?P<tile>\d{2}[A-Z]{3})\.(?P<date>\d{7})(?:T(?P<time>\d{6}))?"
+        r"\.v(?P<version>\d+\.\d+))",
+        "yday",
+    ),
+    "sentinel2": SceneScheme(
+        "sentinel2",
+        r"(?P<scene_id>(?:(?P<mission>S2[A-D])_MSI(?P<level>L1C|L2A)_)?(?P<date>\d{8})T(?P<time>\d{6})"
+        r"_(?:[^/]*?_)?T(?P<tile>\d{2}[A-Z]{3}))",
+        "ymd",
+    ),
+    "landslide4sense": SceneScheme(
+        "landslide4sense",
+        r"(?P<kind>image|mask)_(?P<scene_id>\d+)\.h5$",
+    ),
+}
+
+
+def get_scheme(scheme):
+    """The :class:`SceneScheme` for a name, or ``scheme`` itself."""
+    if isinstance(scheme, SceneScheme):
+        return scheme
+    try:
+        return SCHEMES[scheme]
+    except KeyError:
+        raise ValueError(f"Unknown scene scheme {scheme!r}; expected one of {', '.join(SCHEMES)}") from None
+
+
+def detect_scheme(paths, sample=256):
+    """Name of the scheme matching most of the first ``sample`` paths, or ``None`` if none matches."""
+    head = list(paths[:sample])
+    best, best_count = None, 0
+    for name, scheme in SCHEMES.items():
+        count = sum(1 for match in map(scheme.regex.search, head) if match is not None)
+        if count > best_count:
+            best, best_count = name, count
+    return best
+
+
+def _digits(np, values, width):
+    # Fixed-width decimal strings as int64, and which of them are all digits
+    raw = np.array(values, dtype=f"S{width}")
+    digits = np.frombuffer(raw.tobytes(), np.uint8).reshape(len(values), width).astype(np.int64) - 48
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    return digits @ (10 ** np.arange(width - 1, -1, -1, dtype=np.int64)), valid
+
+
+def _decode_numpy(np, dates, times, date_format):
+    if date_format == "yday":
+        ints, valid = _digits(np, dates, 7)
+        year, day = np.divmod(ints, 1000)
+        valid &= (day >= 1) & (day <= 366)
+        days = (year - 1970).astype("datetime64[Y]").astype("datetime64[D]") + (day - 1).astype("timedelta64[D]")
+        # Day 366 of a common year rolls into the next one
+        valid &= days.astype("datetime64[Y]").astype(np.int64) == year - 1970
+    else:
+        ints, valid = _digits(np, dates, 8)
+        year, rest = np.divmod(ints, 10000)
+        month, day = np.divmod(rest, 100)
+        valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+        months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+        days = months.astype("datetime64[D]") + (day - 1).astype("timedelta64[D]")
+        valid &= days.astype("datetime64[M]") == months
+    seconds = days.astype("datetime64[s]")
+    if times is not None:
+        clock, clock_valid = _digits(np, times, 6)
+        hours, rest = np.divmod(clock, 10000)
+        minutes, secs = np.divmod(rest, 100)
+        clock_valid &= (hours < 24) & (minutes < 60) & (secs < 60)
+        seconds += np.where(clock_valid, hours * 3600 + minutes * 60 + secs, 0).astype("timedelta64[s]")
+    seconds[~valid] = np.datetime64("NaT")
+    return seconds
+
+
+def _decode_python(dates, times, date_format):
+    values = []
+    for date, clock in zip(dates, times if times is not None else repeat("")):
+        try:
+            if date_format == "yday":
+                value = datetime(int(date[:4]), 1, 1) + timedelta(days=int(date[4:7]) - 1)
+                if not 1 <= int(date[4:7]) <= 366 or value.year != int(date[:4]):
+                    raise ValueError(date)
+            else:
+                value = datetime(int(date[:4]), int(date[4:6]), int(date[6:8]))
+        except ValueError:
+            values.append(None)
+            continue
+        if len(clock) == 6:
+            hours, minutes, secs = int(clock[:2]), int(clock[2:4]), int(clock[4:])
+            if hours < 24 and minutes < 60 and secs < 60:
+                value += timedelta(hours=hours, minutes=minutes, seconds=secs)
+        values.append(value)
+    return values
+
+
+def parse_scenes(paths, scheme):
+    """Columns of the scene fields of every path: field name -> list, plus ``datetime`` for dated schemes.
+
+    ``scheme`` is a name from ``SCHEMES`` or a :class:`SceneScheme`. Columns
+    line up with ``paths``; ``scene_id`` is ``None`` where a path does not
+    match.
+    """
+    scheme = get_scheme(scheme)
+    fields = scheme.fields
+    # groups("") keeps the rows fixed-width strings for the date decoding
+    rows = [match.groups("") if match is not None else None for match in map(scheme.regex.search, paths)]
+    columns = {}
+    for i, name in enumerate(fields):
+        columns[name] = [row[i] if row is not None else "" for row in rows]
+    if scheme.date_format is not None:
+        dates = columns["date"]
+        times = columns.get("time")
+        np = _numpy()
+        if np is not None:
+            columns["datetime"] = _decode_numpy(np, dates, times, scheme.date_format)
+        else:
+            columns["datetime"] = _decode_python(dates, times, scheme.date_format)
+    for name in fields:
+        columns[name] = [value or None for value in columns[name]]
+    return columns
+
+
+def format_datetimes(values):
+    """``YYYY-MM-DDThh:mm:ssZ`` strings (``None`` for missing) of a ``datetime`` column.
+
+    Naive ``datetime`` objects are taken to be UTC.
+    """
+    np = _numpy()
+    if np is not None and isinstance(values, np.ndarray):
+        missing = np.isnat(values)
+        text = np.char.add(np.datetime_as_string(values.astype("datetime64[s]"), unit="s"), "Z").tolist()
+        if missing.any():
+            for i in np.flatnonzero(missing).tolist():
+                text[i] = None
+        return text
+    return [
+        None if value is None
+        else (value.astimezone(timezone.utc) if value.tzinfo else value).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for value in values
+    ]
@@ -0,0 +1,242 @@
+"""
+Long-running conversion server.
+
+    python -m geocroissant serve -j 4 --port 8765
+    python -m geocroissant serve --unix-socket /tmp/geocroissant.sock
+
+Worker processes are started once, load every converter script (and with it
+pystac, rdflib, pytdml, ...) up front and then stay alive, so a job only pays
+for the conversion itself. Jobs are JSON requests over HTTP on localhost or on
+a Unix socket:
+
+    POST /convert      {"source_type": "umm-g", "input": "granule.json", "output": "out.json"}
+    GET  /health       worker count, jobs in flight, loaded converters
+    GET  /conversions  available source types
+
+``output`` is optional and defaults to the input path with the conversion's
+suffix. Paths are resolved by the server. At most ``max_pending`` jobs are
+accepted at a time; further requests get ``503`` until one finishes.
+"""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from geocroissant import compression
+from geocroissant.cli import _convert_one
+from geocroissant.converters import CONVERSIONS, SCRIPTS, configure_cache, warm_script
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+_loaded = []  # converter scripts imported by this worker process
+
+
+def _warm_worker(cache_dir, cache_max_bytes):
+    """Process pool initializer: configure the cache and import every converter that can be imported."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C is handled by the server, which shuts the pool down
+    configure_cache(cache_dir, cache_max_bytes)
+    for name in SCRIPTS:
+        try:
+            warm_script(name)
+            _loaded.append(name)
+        except ImportError:
+            pass  # conversions needing a missing dependency fail per job instead
+
+
+def _loaded_scripts():
+    return list(_loaded)
+
+
+class ConversionService:
+    """Bounded pool of warm worker processes shared by all connections."""
+
+    def __init__(self, workers=None, max_pending=None, cache_dir=None, cache_max_bytes=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_warm_worker, initargs=(cache_dir, cache_max_bytes)
+        )
+        self.loaded = []
+
+    def warm_up(self):
+        """Start all worker processes now rather than on the first jobs."""
+        futures = [self._pool.submit(_loaded_scripts) for _ in range(self.workers)]
+        self.loaded = futures[0].result()
+        for future in futures[1:]:
+            future.result()
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def convert(self, source_type, input_path, output_path=None):
+        """Run one job; returns a result dict, or ``None`` if ``max_pending`` jobs are already running."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self._pending += 1
+        try:
+            if output_path is None:
+                _, suffix = CONVERSIONS[source_type]
+                output_path = compression.splitext(input_path)[0] + suffix
+            start = time.perf_counter()
+            _, output_path, size, error, cache_hit = self._pool.submit(
+                _convert_one, (source_type, input_path, output_path, False)
+            ).result()
+            return {
+                "input": input_path,
+                "output": output_path,
+                "input_bytes": size,
+                "cache_hit": cache_hit,
+                "seconds": time.perf_counter() - start,
+                "error": error,
+            }
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    server_version = "GeoCroissant"
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "workers": service.workers,
+                "pending": service.pending,
+                "max_pending": service.max_pending,
+                "loaded": service.loaded,
+            })
+        elif self.path == "/conversions":
+            self._send_json(200, {"conversions": sorted(CONVERSIONS)})
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/convert":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length) or b"{}")
+            source_type = job["source_type"]
+            input_path = job["input"]
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"Expected a JSON object with source_type and input: {e}"})
+            return
+        if source_type not in CONVERSIONS:
+            self._send_json(400, {"error": f"Unknown source_type {source_type!r}"})
+            return
+        if not os.path.isfile(input_path):
+            self._send_json(404, {"error": f"Input file not found: {input_path}"})
+            return
+
+        result = self.server.service.convert(source_type, input_path, job.get("output"))
+        if result is None:
+            self._send_json(503, {"error": "Too many jobs in flight, retry later"})
+        elif result["error"] is not None:
+            self._send_json(422, result)
+        else:
+            self._send_json(200, result)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None, verbose=False):
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, ConversionRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None, workers=None, max_pending=None,
+          cache_dir=None, cache_max_bytes=None, verbose=False):
+    """Start the workers, then serve jobs until interrupted."""
+    service = ConversionService(workers, max_pending, cache_dir, cache_max_bytes)
+    start = time.perf_counter()
+    service.warm_up()
+    server = make_server(service, host, port, unix_socket, verbose)
+    address = unix_socket or f"http://{host}:{server.server_address[1]}"
+    print(f"Serving on {address} with {service.workers} warm workers "
+          f"({len(service.loaded)} converters loaded in {time.perf_counter() - start:.2f}s)", flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if unix_socket and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+def submit(source_type, input_path, output_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT,
+           unix_socket=None, timeout=None):
+    """Send one job to a running server and return ``(status, result)``."""
+    if unix_socket:
+        connection = _UnixHTTPConnection(unix_socket, timeout=timeout)
+    else:
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    job = {"source_type": source_type, "input": os.path.abspath(input_path)}
+    if output_path is not None:
+        job["output"] = os.path.abspath(output_path)
+    try:
+        connection.request("POST", "/convert", body=json.dumps(job), headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
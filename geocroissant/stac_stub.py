@@ -0,0 +1,185 @@
+"""
+Local stub of a paginated STAC API, for exercising the harvester offline.
+
+    python -m geocroissant.stac_stub --port 8766 --limit 3 --copies 10 --fail-every 4
+
+Serves the items of the bundled ``GeoCroissant Time-Series Support/stac.json``
+(or any ItemCollection given with ``--items``) from
+``/collections/{id}/items`` and ``/search`` (GET and POST), ``limit`` items per
+page, with ``rel="next"`` links carrying a ``token``. ``copies`` repeats the
+items under suffixed ids to get more pages; ``fail_every`` answers every Nth
+request with ``503`` and ``latency`` delays every answer, to test retries and
+concurrency.
+"""
+
+import argparse
+import copy
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from geocroissant import jsonio
+
+BUNDLED_ITEMS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "GeoCroissant Time-Series Support", "stac.json"
+)
+
+
+def load_items(path=BUNDLED_ITEMS, copies=1):
+    """Return ``(metadata, items)`` of an ItemCollection, its items repeated ``copies`` times."""
+    collection = jsonio.load(path)
+    features = collection.get("features", [])
+    items = []
+    for n in range(copies):
+        for feature in features:
+            if n:
+                feature = copy.deepcopy(feature)
+                feature["id"] = f"{feature['id']}_{n}"
+            items.append(feature)
+    metadata = {k: v for k, v in collection.items() if k not in ("features", "links", "numberReturned")}
+    return metadata, items
+
+
+class StubSTACHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, headers=None):
+        data = jsonio.dumps(body, pretty=False)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/geo+json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _should_fail(self):
+        stub = self.server
+        with stub.lock:
+            stub.requests += 1
+            return bool(stub.fail_every) and stub.requests % stub.fail_every == 0
+
+    def _page(self, method, path, params):
+        stub = self.server
+        if self._should_fail():
+            stub.failures += 1
+            self._send(503, {"code": "ServiceUnavailable"}, {"Retry-After": "0"})
+            return
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        parts = path.strip("/").split("/")
+        collection_id = None
+        if len(parts) == 3 and parts[0] == "collections" and parts[2] == "items":
+            collection_id = parts[1]
+        elif parts != ["search"]:
+            self._send(404, {"code": "NotFound", "description": path})
+            return
+        collections = params.get("collections")
+        if isinstance(collections, str):
+            collections = collections.split(",")
+        items = [
+            item for item in stub.items
+            if (collection_id is None or item.get("collection") == collection_id)
+            and (not collections or item.get("collection") in collections)
+        ]
+
+        limit = int(params.get("limit") or stub.limit)
+        offset = int(params.get("token") or 0)
+        page = items[offset:offset + limit]
+        base = f"http://{self.headers.get('Host')}{path}"
+        links = [{"rel": "self", "type": "application/geo+json", "href": base}]
+        if offset + limit < len(items):
+            following = {**params, "token": str(offset + limit)}
+            if method == "POST":
+                links.append({"rel": "next", "type": "application/geo+json", "method": "POST",
+                              "href": base, "body": {"token": following["token"]}, "merge": True})
+            else:
+                links.append({"rel": "next", "type": "application/geo+json", "method": "GET",
+                              "href": f"{base}?{urlencode(following)}"})
+        body = {
+            **stub.metadata,
+            "type": "FeatureCollection",
+            "links": links,
+            "features": page,
+            "numberReturned": len(page),
+            "numberMatched": len(items),
+        }
+        self._send(200, body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self._page("GET", url.path, params)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"code": "BadRequest"})
+            return
+        self._page("POST", urlsplit(self.path).path, params)
+
+
+class StubSTACServer(ThreadingHTTPServer):
+    """Threaded stub server; ``requests`` and ``failures`` count what it answered."""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), items_path=BUNDLED_ITEMS, copies=1, limit=10,
+                 fail_every=0, latency=0.0, verbose=False):
+        super().__init__(address, StubSTACHandler)
+        self.metadata, self.items = load_items(items_path, copies)
+        self.limit = limit
+        self.fail_every = fail_every
+        self.latency = latency
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a daemon thread and return ``self``; stop with ``shutdown()``."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve an ItemCollection as a paginated STAC API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--items", default=BUNDLED_ITEMS, help="ItemCollection to serve")
+    parser.add_argument("--copies", type=int, default=1, help="Repeat the items this many times")
+    parser.add_argument("--limit", type=int, default=10, help="Default items per page")
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with 503")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each answer")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = StubSTACServer((args.host, args.port), args.items, args.copies, args.limit,
+                            args.fail_every, args.latency, args.verbose)
+    print(f"Serving {len(server.items)} items at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
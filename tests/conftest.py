@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import geocroissant and benchmarks from the repository root, as the scripts do
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
@@ -0,0 +1,51 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.catalog import write_catalog_tree
+from geocroissant.catalog import INDEX_NAME, convert_catalog, output_path_for, resolve_href
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = write_catalog_tree(str(tmp_path / "catalog"), catalogs=2, collections=3, depth=2)
+    with open(root) as f:
+        catalog = json.load(f)
+    # A remote child is skipped, a missing one is reported, and a link back up is walked only once
+    catalog["links"] += [
+        {"rel": "child", "href": "https://example.org/catalog.json"},
+        {"rel": "child", "href": "./missing/catalog.json"},
+        {"rel": "child", "href": "./catalog_0/../catalog.json"},
+    ]
+    with open(root, "w") as f:
+        json.dump(catalog, f)
+    return root
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_catalog(tree, tmp_path, workers):
+    output_dir = tmp_path / f"out-{workers}"
+    index, failures, _ = convert_catalog(tree, str(output_dir), workers=workers)
+
+    assert [os.path.relpath(path, os.path.dirname(tree)) for path, _ in failures] == ["missing/catalog.json"]
+    datasets = index["dataset"]
+    assert len(datasets) == 6
+    assert len({d["@id"] for d in datasets}) == 6
+    for dataset in datasets:
+        source = os.path.join(os.path.dirname(tree), dataset["source"])
+        assert dataset["url"] == os.path.relpath(output_path_for(source, os.path.dirname(tree), str(output_dir)),
+                                                 str(output_dir))
+        assert (output_dir / dataset["url"]).is_file()
+        assert dataset["isPartOf"]["@id"].endswith("-1")  # the innermost catalog of its branch
+        assert "geocr:BoundingBox" in dataset
+    assert sorted(c["@id"] for c in index["hasPart"]) == ["catalog-0-0", "catalog-0-1", "catalog-1-0", "catalog-1-1"]
+    with open(output_dir / INDEX_NAME) as f:
+        assert json.load(f) == index
+
+
+def test_resolve_href(tmp_path):
+    base = str(tmp_path / "a" / "catalog.json")
+    assert resolve_href("./b/collection.json", base) == str(tmp_path / "a" / "b" / "collection.json")
+    assert resolve_href("../c%20d/catalog.json", base) == str(tmp_path / "c d" / "catalog.json")
+    assert resolve_href("https://example.org/catalog.json", base) is None
@@ -0,0 +1,53 @@
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from geocroissant.checksum import ChecksumCache, ChecksumEngine
+
+
+def hash_with_cache(args):
+    cache_path, paths = args
+    return ChecksumEngine(cache=ChecksumCache(cache_path), workers=1).hash_files(paths)
+
+
+def _key(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def write_files(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"file_{i}.bin"
+        path.write_bytes(str(i).encode() * 100)
+        paths.append(str(path))
+    return paths
+
+
+def test_locked_cache_is_a_miss(tmp_path):
+    cache_path = str(tmp_path / "checksums.sqlite")
+    (path,) = write_files(tmp_path, 1)
+    expected = hashlib.md5(b"0" * 100).hexdigest()
+    holder = sqlite3.connect(cache_path, isolation_level=None)
+    holder.execute("BEGIN EXCLUSIVE")
+    try:
+        engine = ChecksumEngine(cache=ChecksumCache(cache_path, timeout=0.1))
+        assert engine.hash_file(path)["md5"] == expected
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    # Nothing was stored while locked; the next run hashes and stores it
+    cache = ChecksumCache(cache_path)
+    assert ChecksumEngine(cache=cache).hash_file(path)["md5"] == expected
+    assert cache.get(*_key(path))["md5"] == expected
+
+
+def test_concurrent_processes_share_the_cache(tmp_path):
+    cache_path = str(tmp_path / "checksums.sqlite")
+    paths = write_files(tmp_path, 40)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(hash_with_cache, [(cache_path, paths[i % 4::4]) for i in range(8)]))
+    assert sum(len(r) for r in results) == 80
+    cache = ChecksumCache(cache_path)
+    assert all(cache.get(*_key(path)) is not None for path in paths)
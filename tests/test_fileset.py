@@ -0,0 +1,52 @@
+import re
+
+import pytest
+
+from benchmarks.synthetic import load_fixture
+from geocroissant.fileset import FileSetMatcher, fileset_fields
+
+EXTRA_REGEXES = [
+    r"(\w)\1",  # backreference
+    r"(?P<tile>T\d\d[A-Z]{3})",  # named group
+    r"(?i)MERGED",  # inline flag
+    r".*?T10S|\.mask",  # top-level alternation behind a leading ".*"
+    r"^(training|validation)/",
+    r"v(\d)\.(\d)",
+]
+
+
+def listing_paths(croissant):
+    listing = croissant["geocr:fileListing"]
+    paths = [p for side in ("images", "annotations") for split in listing[side].values() for p in split]
+    return sorted(paths) + ["training/notes.txt"]
+
+
+def expected(regex, path):
+    match = re.search(regex, path)
+    if match is None:
+        return None
+    return next((g for g in match.groups() if g is not None), path)
+
+
+@pytest.mark.parametrize("extra", [[]] + [[r] for r in EXTRA_REGEXES] + [EXTRA_REGEXES])
+def test_columns_match_re_search(extra):
+    croissant = load_fixture("hls")
+    fileset, fields = fileset_fields(croissant)
+    fields = fields + [
+        {"name": f"extra/{i}", "source": {"transform": {"regex": regex}}} for i, regex in enumerate(extra)
+    ]
+    paths = listing_paths(croissant)
+    columns = FileSetMatcher(fileset, fields).columns(paths)
+
+    included = [p for p in paths if p.endswith(".tif")]
+    for field in fields:
+        regex = field["source"]["transform"]["regex"]
+        assert columns[field["name"]] == [expected(regex, p) for p in included], regex
+
+
+def test_filename_property():
+    fileset = {"includes": "**/*.tif"}
+    fields = [{"name": "scene", "source": {"extract": {"fileProperty": "filename"},
+                                           "transform": {"regex": r"^[^/]*?(HLS[^_]*)"}}}]
+    columns = FileSetMatcher(fileset, fields).columns(["training/a_HLS.S30_merged.tif", "HLS.x.tif", "b.json"])
+    assert columns == {"scene": ["HLS.S30", "HLS.x.tif"]}
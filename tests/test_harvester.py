@@ -0,0 +1,61 @@
+import json
+import time
+
+import pytest
+
+from geocroissant.converters import load_script
+from geocroissant.harvester import harvest, search_url
+from geocroissant.stac_stub import StubSTACServer
+
+
+@pytest.fixture
+def server():
+    server = StubSTACServer(copies=20, limit=3).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def convertor(monkeypatch):
+    module = load_script("convertor")
+
+    def wrap(transform):
+        write = module.write_stac_itemcollection_geocroissant
+
+        def wrapped(stac_dict, fp, features, **kwargs):
+            return write(stac_dict, fp, features=transform(features), **kwargs)
+
+        monkeypatch.setattr(module, "write_stac_itemcollection_geocroissant", wrapped)
+
+    return wrap
+
+
+def slowly(features):
+    for feature in features:
+        time.sleep(0.002)
+        yield feature
+
+
+def test_slow_writer_gets_every_item(server, convertor, tmp_path):
+    convertor(slowly)
+    output = tmp_path / "croissant.json"
+    harvester = harvest([("GET", search_url(server.url, limit=3), None)], str(output), concurrency=4)
+    document = json.loads(output.read_text())
+    assert harvester.items == document["numberReturned"] == len(server.items)
+    (record_set,) = document["recordSet"]
+    assert len(record_set["data"]) == len(server.items)
+
+
+def test_writer_error_stops_the_harvest(server, convertor, tmp_path):
+    def failing(features):
+        for i, feature in enumerate(features):
+            if i == 5:
+                raise ValueError("converter failed")
+            yield feature
+
+    convertor(failing)
+    output = tmp_path / "croissant.json"
+    with pytest.raises(ValueError, match="converter failed"):
+        harvest([("GET", search_url(server.url, limit=3), None)], str(output), concurrency=4)
+    assert not output.exists()
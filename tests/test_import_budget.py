@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+from benchmarks.import_budget import DEFAULT_BUDGET_MS, heavy_imports, held_to_budget, measure, probes
+
+# Slow CI machines can raise the budget without editing the test
+BUDGET_MS = float(os.environ.get("GEOCROISSANT_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+
+
+@pytest.mark.parametrize("name,statement", probes(), ids=[name for name, _ in probes()])
+def test_import_budget(name, statement):
+    import_ms, modules = measure(statement)
+    assert heavy_imports(modules) == [], f"{name} imports heavy backends eagerly"
+    if held_to_budget(name):
+        assert import_ms <= BUDGET_MS, f"{name} imports in {import_ms:.1f} ms, over the {BUDGET_MS:.0f} ms budget"
@@ -0,0 +1,43 @@
+import dataclasses
+import datetime
+import json
+
+import pytest
+
+from geocroissant import jsonio
+
+DOCUMENT = {"title": "Zürich ☃ 😀", "values": [1, 2.5, 1e-7, None, True], "nested": {"é": ["x", {}]}}
+
+
+@pytest.fixture(params=[b for b in jsonio.BACKENDS if jsonio._available(b)])
+def backend(request):
+    previous = jsonio.BACKEND
+    jsonio.set_backend(request.param)
+    yield request.param
+    jsonio.set_backend(previous)
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_dumps_matches_stdlib(backend, pretty, ensure_ascii):
+    assert jsonio.loads(jsonio.dumps(DOCUMENT, pretty=pretty, ensure_ascii=ensure_ascii)) == DOCUMENT
+    # Exponent floats are written differently by the fast backends, so compare bytes without them
+    document = {**DOCUMENT, "values": [1, 2.5, None, True]}
+    expected = json.dumps(document, indent=2 if pretty else None, separators=None if pretty else (",", ":"),
+                          ensure_ascii=ensure_ascii)
+    assert jsonio.dumps(document, pretty=pretty, ensure_ascii=ensure_ascii) == expected.encode("utf-8")
+
+
+def test_non_finite_floats_survive(backend):
+    assert jsonio.dumps([float("nan"), float("inf")], pretty=False) == b"[NaN,Infinity]"
+
+
+@dataclasses.dataclass
+class Point:
+    x: int = 1
+
+
+@pytest.mark.parametrize("value", [datetime.datetime(2020, 1, 1), datetime.date(2020, 1, 1), Point(), {1}])
+def test_rejects_what_the_stdlib_rejects(backend, value):
+    with pytest.raises(TypeError):
+        jsonio.dumps({"value": value})
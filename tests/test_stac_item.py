@@ -0,0 +1,28 @@
+import copy
+
+import pytest
+
+from benchmarks.stac_item import variants
+from geocroissant.converters import load_script
+
+pytest.importorskip("pystac")
+
+CASES = variants()
+
+
+@pytest.fixture(scope="module")
+def module():
+    return load_script("geocroissant_to_stac")
+
+
+@pytest.mark.parametrize("name,document", CASES, ids=[name for name, _ in CASES])
+def test_dict_item_matches_pystac(module, name, document, tmp_path):
+    reference = module.croissant_to_stac_item(copy.deepcopy(document), use_pystac=True)
+    emitted = module.croissant_to_stac_item(copy.deepcopy(document))
+    assert emitted == reference
+    assert module.stac_json_bytes(emitted) == module.stac_json_bytes(reference)
+
+    pystac_path, dict_path = tmp_path / "pystac.json", tmp_path / "dict.json"
+    module.croissant_to_stac_item(copy.deepcopy(document), output_path=str(pystac_path), use_pystac=True)
+    module.croissant_to_stac_item(copy.deepcopy(document), output_path=str(dict_path))
+    assert dict_path.read_bytes() == pystac_path.read_bytes()